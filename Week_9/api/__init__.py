@@ -1,5 +1,6 @@
 # Week_6_and_7/api/__init__.py
 import os
+import time
 from dotenv import load_dotenv
 
 # Load .env once from project root
@@ -19,6 +20,7 @@ migrate = Migrate()
 
 def create_app(config_class=Config):
     """Application factory that accepts a config class (default = Config)."""
+    start = time.perf_counter()
     app = Flask(__name__)
     app.config.from_object(config_class)
 
@@ -26,6 +28,9 @@ def create_app(config_class=Config):
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # Product writes are captured in the outbox (session listener)
+    from . import outbox  # noqa: F401
+
     # Register blueprints
     app.register_blueprint(products_bp, url_prefix="/products")
     app.register_blueprint(chat_bp, url_prefix="/chat")
@@ -40,4 +45,27 @@ def create_app(config_class=Config):
 
     app.register_blueprint(auth_bp, url_prefix="/auth")
 
+    # CLI commands + optional background cache sweeper
+    from .commands import llm_cache_cli, embedding_cache_cli, ingestion_cli, outbox_cli
+    from scripts.llm_cache import start_cache_sweeper
+
+    app.cli.add_command(llm_cache_cli)
+    app.cli.add_command(embedding_cache_cli)
+    app.cli.add_command(ingestion_cli)
+    app.cli.add_command(outbox_cli)
+    if app.config.get("LLM_CACHE_SWEEP_INTERVAL") and not app.config.get(
+        "BACKGROUND_TASKS_IN_WORKER"
+    ):
+        start_cache_sweeper(app, app.config["LLM_CACHE_SWEEP_INTERVAL"])
+
+    # Embedding model: loaded on first use unless preloading (shared by forked workers)
+    from scripts.embedding_model import load_report, warmup
+
+    if app.config.get("EMBEDDING_PRELOAD"):
+        warmup()
+    app.logger.info(
+        f"[STARTUP] create_app in {time.perf_counter() - start:.2f}s, "
+        f"embedding model: {load_report()}"
+    )
+
     return app
@@ -1,6 +1,7 @@
 # api/chat_routes.py
-from flask import Blueprint, request, jsonify
-from scripts.rag_chain import answer_question, get_llm
+import json
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from scripts.rag_chain import answer_question, stream_answer, get_llm
 from .security.decorators import jwt_required, roles_required, get_current_user_id
 
 chat_bp = Blueprint("chat", __name__, url_prefix="/chat")
@@ -39,3 +40,57 @@ def chat_inventory() -> tuple:
         ),
         200,
     )
+
+
+def sse_event(data: dict, event: str | None = None) -> str:
+    """Format one Server-Sent Events message."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@chat_bp.route("/inventory/stream", methods=["POST"])
+@jwt_required
+@roles_required("admin", "manager")
+def chat_inventory_stream() -> Response | tuple:
+    """
+    Chat with inventory using RAG, streaming the answer as Server-Sent Events.
+
+    Events:
+        data: {"token": "..."}                        one per streamed chunk
+        event: done / data: {"answer": "...", ...}    full answer when finished
+    """
+    data = request.get_json() or {}
+    question = (data.get("question") or "").strip()
+    if not question:
+        return jsonify({"error": "Missing 'question' in request body"}), 400
+
+    use_ollama = data.get("use_ollama", False)
+
+    try:
+        user_id = get_current_user_id()
+    except Exception as e:
+        return jsonify({"error": "Unauthorized: invalid token", "details": str(e)}), 401
+
+    llm = get_llm(use_ollama=use_ollama)
+    model_used = "ollama-llama3" if use_ollama else "openai-gpt-4o-mini"
+
+    def generate():
+        tokens = []
+        for token in stream_answer(question, llm, user_id=user_id):
+            tokens.append(token)
+            yield sse_event({"token": token})
+        yield sse_event(
+            {
+                "user_id": user_id,
+                "question": question,
+                "answer": "".join(tokens).strip(),
+                "model_used": model_used,
+            },
+            event="done",
+        )
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
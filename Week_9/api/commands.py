@@ -0,0 +1,84 @@
+# api/commands.py
+import click
+from flask.cli import AppGroup
+
+from scripts.cached_embeddings import sweep_stale
+from scripts.constants import EMBEDDING_CACHE_MAX_AGE_DAYS
+from scripts.llm_cache import SQLAlchemyCache
+
+llm_cache_cli = AppGroup("llm-cache", help="Manage the LLM answer cache.")
+embedding_cache_cli = AppGroup("embedding-cache", help="Manage the persistent embedding cache.")
+ingestion_cli = AppGroup("ingestion", help="Process queued document uploads.")
+outbox_cli = AppGroup("outbox", help="Sync product embeddings from the product outbox.")
+
+
+@llm_cache_cli.command("sweep")
+@click.option("--batch-size", default=1000, show_default=True, help="Rows per delete.")
+def sweep(batch_size: int) -> None:
+    """
+    Delete expired llm_cache rows in batches.
+
+    Usage:
+        flask --app api.app llm-cache sweep --batch-size 5000
+    """
+    removed = SQLAlchemyCache.sweep_expired(batch_size=batch_size)
+    click.echo(f"Removed {removed} expired cache entries")
+
+
+@llm_cache_cli.command("stats")
+def stats() -> None:
+    """Show this process's in-memory cache counters."""
+    for key, value in SQLAlchemyCache.stats().items():
+        click.echo(f"{key}: {value}")
+
+
+@embedding_cache_cli.command("sweep")
+@click.option(
+    "--max-age-days",
+    default=EMBEDDING_CACHE_MAX_AGE_DAYS,
+    show_default=True,
+    help="Remove rows stored longer ago than this.",
+)
+@click.option("--batch-size", default=1000, show_default=True, help="Rows per delete.")
+def sweep_embeddings(max_age_days: int, batch_size: int) -> None:
+    """
+    Delete old embedding_cache rows in batches.
+
+    Usage:
+        flask --app api.app embedding-cache sweep --max-age-days 30
+    """
+    removed = sweep_stale(max_age_days=max_age_days, batch_size=batch_size)
+    click.echo(f"Removed {removed} stale embedding cache entries")
+
+
+@ingestion_cli.command("worker")
+@click.option("--poll-interval", default=2.0, show_default=True, help="Seconds between polls.")
+@click.option("--once", is_flag=True, help="Exit once the queue is empty.")
+def worker(poll_interval: float, once: bool) -> None:
+    """
+    Run a document ingestion worker.
+
+    Usage:
+        flask --app api.app ingestion worker
+    """
+    from scripts.ingestion_worker import run_worker
+
+    processed = run_worker(poll_interval=poll_interval, once=once)
+    click.echo(f"Processed {processed} ingestion jobs")
+
+
+@outbox_cli.command("consume")
+@click.option("--poll-interval", default=2.0, show_default=True, help="Seconds between polls.")
+@click.option("--batch-size", default=200, show_default=True, help="Outbox rows per pass.")
+@click.option("--once", is_flag=True, help="Exit once the outbox is empty.")
+def consume(poll_interval: float, batch_size: int, once: bool) -> None:
+    """
+    Re-embed or delete changed products and invalidate their owners' cached answers.
+
+    Usage:
+        flask --app api.app outbox consume
+    """
+    from scripts.outbox_consumer import run_consumer
+
+    processed = run_consumer(poll_interval=poll_interval, once=once, batch_size=batch_size)
+    click.echo(f"Processed {processed} outbox rows")
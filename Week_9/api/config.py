@@ -21,6 +21,29 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
 
+    # Where uploads wait for the ingestion worker
+    UPLOAD_DIR = os.getenv(
+        "UPLOAD_DIR",
+        os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "instance", "uploads")),
+    )
+
+    # Largest accepted request body (document uploads); larger requests get 413
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_UPLOAD_BYTES", 50 * 1024 * 1024))
+
+    # Load the embedding model in create_app (gunicorn preload) instead of on first use
+    EMBEDDING_PRELOAD = os.getenv("EMBEDDING_PRELOAD", "false").lower() == "true"
+
+    # Largest number of items accepted by POST /products/bulk
+    BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 50000))
+
+    # Seconds between background llm_cache sweeps (0 = disabled, use the CLI instead)
+    LLM_CACHE_SWEEP_INTERVAL = int(os.getenv("LLM_CACHE_SWEEP_INTERVAL", 0))
+    # Set by gunicorn.conf.py: with preload_app, create_app runs in the master, so
+    # background threads are started in a worker by post_fork instead
+    BACKGROUND_TASKS_IN_WORKER = (
+        os.getenv("BACKGROUND_TASKS_IN_WORKER", "false").lower() == "true"
+    )
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -36,6 +59,8 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = "test-secret"
+    LLM_CACHE_SWEEP_INTERVAL = 0
+    EMBEDDING_PRELOAD = False
 
 
 class ProductionConfig(Config):
@@ -1,23 +1,43 @@
-from flask import Blueprint, request, jsonify
+import os
+import uuid
+
+from flask import Blueprint, request, jsonify, current_app, url_for
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.utils import secure_filename
+
+from .db import db
+from .models import IngestionJob
+from .schemas.response import IngestionJobResponse
 from .security.decorators import jwt_required, roles_required, get_current_user_id
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores.pgvector import PGVector
-from scripts.constants import (
-    HF_EMBEDDINGS,
-    DATABASE_URL_WEEK8,
-    CHUNK_SIZE,
-    CHUNK_OVERLAP,
-)
+from .security.jwt_utils import get_jwt_identity
 
 
 documents_bp = Blueprint("documents", __name__, url_prefix="/documents")
 
 
+@documents_bp.errorhandler(RequestEntityTooLarge)
+def upload_too_large(e: RequestEntityTooLarge) -> tuple:
+    """Reject uploads above MAX_CONTENT_LENGTH."""
+    limit = current_app.config.get("MAX_CONTENT_LENGTH")
+    return jsonify({"error": "File too large", "max_bytes": limit}), 413
+
+
 @documents_bp.route("/upload", methods=["POST"])
 @jwt_required
 @roles_required("admin", "manager", "user")
 def upload_document() -> tuple:
-    """Upload a text file, chunk, embed, and store vectors with user_id metadata."""
+    """
+    Queue a text file for ingestion (chunk, embed, store with user_id metadata).
+
+    The file is streamed to UPLOAD_DIR (never held in memory, at most
+    MAX_CONTENT_LENGTH bytes) and processed by `flask ingestion worker`;
+    poll GET /documents/jobs/<job_id> for progress.
+
+    Form field `mode`: "append" (default) or "replace", which makes the file the
+    new version of an earlier upload with the same name; only chunks that
+    changed are embedded and chunks that disappeared are removed.
+    """
     if "file" not in request.files:
         return jsonify({"error": "No file provided under 'file'"}), 400
 
@@ -25,65 +45,79 @@ def upload_document() -> tuple:
     if file.filename == "":
         return jsonify({"error": "Empty filename"}), 400
 
+    mode = request.form.get("mode", "append")
+    if mode not in ("append", "replace"):
+        return jsonify({"error": "mode must be 'append' or 'replace'"}), 400
+
     try:
         user_id = get_current_user_id()
     except Exception as e:
         return jsonify({"error": "Unauthorized: invalid token", "details": str(e)}), 401
 
+    upload_dir = current_app.config["UPLOAD_DIR"]
+    os.makedirs(upload_dir, exist_ok=True)
+    path = os.path.join(
+        upload_dir, f"{uuid.uuid4().hex}_{secure_filename(file.filename) or 'upload'}"
+    )
+
     try:
-        # Read and decode file
-        content = file.read().decode("utf-8", errors="ignore")
-        if not content.strip():
+        file.save(path)
+        if os.path.getsize(path) == 0:
+            os.remove(path)
             return jsonify({"error": "File is empty"}), 400
 
-        # Chunk content
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+        job = IngestionJob(
+            user_id=int(user_id),
+            filename=file.filename,
+            file_path=path,
+            status="queued",
+            mode=mode,
         )
-        chunks = splitter.split_text(content)
+        db.session.add(job)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        if os.path.exists(path):
+            os.remove(path)
+        current_app.logger.error(f"Failed to queue ingestion job: {e}")
+        return jsonify({"error": "Failed to queue upload"}), 500
+    except OSError as e:
+        current_app.logger.error(f"Failed to save upload: {e}")
+        return jsonify({"error": "Failed to save upload"}), 500
 
-        # Prepare vector store
-        if not DATABASE_URL_WEEK8:
-            return jsonify({"error": "DATABASE_URL_WEEK8 not configured"}), 500
+    return (
+        jsonify(
+            {
+                "message": "Upload queued",
+                "job_id": job.id,
+                "status": job.status,
+                "mode": job.mode,
+                "user_id": job.user_id,
+                "filename": job.filename,
+                "status_url": url_for("documents.get_job", job_id=job.id),
+            }
+        ),
+        202,
+    )
 
-        vector_store = PGVector(
-            collection_name="product_embedding_hf",
-            connection_string=DATABASE_URL_WEEK8,
-            embedding_function=HF_EMBEDDINGS,
-        )
 
-        # Build documents with metadata
-        from langchain_core.documents import Document
-
-        docs = []
-        for idx, chunk in enumerate(chunks):
-            docs.append(
-                Document(
-                    page_content=chunk,
-                    metadata={
-                        "user_id": str(user_id),
-                        "chunk_index": idx,
-                        "source": file.filename,
-                        "scope": "private",
-                    },
-                )
-            )
-
-        # Store
-        if docs:
-            vector_store.add_documents(docs)
-
-        return (
-            jsonify(
-                {
-                    "message": "Upload successful",
-                    "chunks": len(docs),
-                    "user_id": user_id,
-                    "filename": file.filename,
-                }
-            ),
-            201,
-        )
+@documents_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@jwt_required
+@roles_required("admin", "manager", "user")
+def get_job(job_id: int) -> tuple:
+    """Return an ingestion job's status and progress (owner or admin only)."""
+    job = db.session.get(IngestionJob, job_id)
+    current_user = get_jwt_identity()
+    if not job or (
+        job.user_id != int(current_user["sub"]) and current_user["role"] != "admin"
+    ):
+        return jsonify({"error": "Job not found"}), 404
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    body = IngestionJobResponse.model_validate(job).model_dump(mode="json")
+    # Streamed files are chunked as they are read, so progress is measured in bytes
+    body["progress"] = (
+        round(job.processed_bytes / job.total_bytes, 3) if job.total_bytes else 0.0
+    )
+    if job.status == "done":
+        body["progress"] = 1.0
+    return jsonify(body), 200
@@ -4,6 +4,7 @@ from datetime import date, datetime
 from .db import db
 from werkzeug.security import generate_password_hash, check_password_hash
 from pgvector.sqlalchemy import Vector
+from scripts.constants import EMBEDDING_DIM
 
 
 class Product(db.Model):
@@ -13,6 +14,13 @@ class Product(db.Model):
     """
 
     __tablename__ = "products"
+    # Keyset pagination (ORDER BY product_id) with the list filters
+    __table_args__ = (
+        db.Index("ix_products_owner_id_product_id", "owner_id", "product_id"),
+        db.Index("ix_products_type_product_id", "type", "product_id"),
+        db.Index("ix_products_quantity_product_id", "quantity", "product_id"),
+        db.Index("ix_products_price", "price"),
+    )
 
     product_id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name: str = db.Column(db.String(100), nullable=False)
@@ -21,10 +29,13 @@ class Product(db.Model):
     type: str = db.Column(db.String(50), nullable=False)
     owner_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     owner = db.relationship("User", back_populates="products")
+    # Bumped on every write; ORM updates/deletes check it (optimistic concurrency)
+    version: int = db.Column(db.Integer, nullable=False, default=1, server_default="1")
 
     __mapper_args__ = {
         "polymorphic_identity": "product",
         "polymorphic_on": type,
+        "version_id_col": version,
     }
 
     def get_total_value(self) -> float:
@@ -42,6 +53,10 @@ class FoodProduct(Product):
     __mapper_args__ = {"polymorphic_identity": "food"}
 
 
+# Single-table subclass columns can't be indexed in Product.__table_args__
+db.Index("ix_products_expiry_date", FoodProduct.__table__.c.expiry_date)
+
+
 class ElectronicProduct(Product):
     """Product type: Electronic (with warranty period)."""
 
@@ -97,7 +112,7 @@ class Document(db.Model):
 
     id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
     content: str = db.Column(db.Text, nullable=False)
-    embedding = db.Column(Vector(1536))  # OpenAI text-embedding-3-small
+    embedding = db.Column(Vector(EMBEDDING_DIM))  # constants.EMBEDDING_MODEL
 
     # NEW: Associate each document with a user for multi-tenancy
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -117,7 +132,143 @@ class LLMCache(db.Model):
     id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
     question: str = db.Column(db.Text, nullable=False, unique=True)
     answer: str = db.Column(db.Text, nullable=False)
-    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    expires_at: datetime = db.Column(db.DateTime, nullable=True, index=True)
+
+    # Semantic cache: per-user question embedding (all-MiniLM-L6-v2)
+    user_id: int = db.Column(db.Integer, nullable=True, index=True)
+    question_embedding = db.Column(Vector(EMBEDDING_DIM), nullable=True)
 
     def __repr__(self) -> str:
         return f"<LLMCache id={self.id} question={self.question[:30]}...>"
+
+
+class LLMUsage(db.Model):
+    """
+    Per-user ledger of LLM token usage and estimated cost.
+    """
+
+    __tablename__ = "llm_usage"
+
+    id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id: int = db.Column(db.Integer, nullable=True, index=True)
+    model: str = db.Column(db.String(100), nullable=False)
+    source: str = db.Column(db.String(50), nullable=False, default="chat")
+    prompt_tokens: int = db.Column(db.Integer, nullable=False, default=0)
+    completion_tokens: int = db.Column(db.Integer, nullable=False, default=0)
+    total_tokens: int = db.Column(db.Integer, nullable=False, default=0)
+    cost_usd: float = db.Column(db.Float, nullable=False, default=0.0)
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self) -> str:
+        return f"<LLMUsage id={self.id} user_id={self.user_id} model={self.model} tokens={self.total_tokens}>"
+
+
+class EmbeddingManifest(db.Model):
+    """
+    Content hash of each product's embedded text, per collection and user.
+    Lets the embedding sync re-embed only products that are new or changed.
+    """
+
+    __tablename__ = "embedding_manifest"
+
+    collection: str = db.Column(db.String(100), primary_key=True)
+    user_id: int = db.Column(db.Integer, primary_key=True)
+    product_id: int = db.Column(db.Integer, primary_key=True)
+    content_hash: str = db.Column(db.String(64), nullable=False)
+    chunk_count: int = db.Column(db.Integer, nullable=False, default=0)
+    updated_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<EmbeddingManifest user_id={self.user_id} product_id={self.product_id} hash={self.content_hash[:8]}>"
+
+
+class EmbeddingCache(db.Model):
+    """
+    Persistent embedding cache keyed by model and SHA-256 of the embedded text
+    (see scripts/cached_embeddings.py).
+    """
+
+    __tablename__ = "embedding_cache"
+
+    model: str = db.Column(db.String(200), primary_key=True)
+    text_hash: str = db.Column(db.String(64), primary_key=True)
+    embedding = db.Column(Vector(EMBEDDING_DIM), nullable=False)
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self) -> str:
+        return f"<EmbeddingCache model={self.model} hash={self.text_hash[:8]}>"
+
+
+class DocumentChunkSource(db.Model):
+    """
+    Links a stored document chunk (by content hash) to each uploaded file that
+    contains it, so identical chunks are embedded once per user and collection.
+    """
+
+    __tablename__ = "document_chunk_sources"
+    __table_args__ = (
+        db.Index("ix_document_chunk_sources_source", "collection", "user_id", "source"),
+    )
+
+    collection: str = db.Column(db.String(100), primary_key=True)
+    user_id: int = db.Column(db.Integer, primary_key=True)
+    chunk_hash: str = db.Column(db.String(64), primary_key=True)
+    source: str = db.Column(db.String(255), primary_key=True)
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return f"<DocumentChunkSource user_id={self.user_id} source={self.source} hash={self.chunk_hash[:8]}>"
+
+
+class IngestionJob(db.Model):
+    """
+    Queued document ingestion (chunk, embed, store) processed by a background worker.
+    """
+
+    __tablename__ = "ingestion_jobs"
+    __table_args__ = (db.Index("ix_ingestion_jobs_status_id", "status", "id"),)
+
+    id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id: int = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    filename: str = db.Column(db.String(255), nullable=False)
+    file_path: str = db.Column(db.String(500), nullable=False)
+    status: str = db.Column(db.String(20), nullable=False, default="queued")
+    # "append" adds the file; "replace" makes it the new version of `filename`
+    mode: str = db.Column(db.String(20), nullable=False, default="append")
+    total_chunks: int = db.Column(db.Integer, nullable=True)
+    embedded_chunks: int = db.Column(db.Integer, nullable=False, default=0)
+    reused_chunks: int = db.Column(db.Integer, nullable=False, default=0)
+    total_bytes: int = db.Column(db.BigInteger, nullable=True)
+    processed_bytes: int = db.Column(db.BigInteger, nullable=False, default=0)
+    error: str = db.Column(db.Text, nullable=True)
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at: datetime = db.Column(db.DateTime, nullable=True)
+    updated_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at: datetime = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<IngestionJob id={self.id} user_id={self.user_id} status={self.status}>"
+
+
+class ProductOutbox(db.Model):
+    """
+    Pending product change (transactional outbox), written in the same transaction
+    as the product write and consumed by `flask outbox consume` to keep product
+    embeddings and cached answers in sync.
+    """
+
+    __tablename__ = "product_outbox"
+    __table_args__ = (db.Index("ix_product_outbox_pending", "processed_at", "id"),)
+
+    id: int = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    product_id: int = db.Column(db.Integer, nullable=False)
+    owner_id: int = db.Column(db.Integer, nullable=False)
+    op: str = db.Column(db.String(10), nullable=False)  # "upsert" or "delete"
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+    processed_at: datetime = db.Column(db.DateTime, nullable=True)
+    attempts: int = db.Column(db.Integer, nullable=False, default=0)
+    error: str = db.Column(db.Text, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ProductOutbox id={self.id} product_id={self.product_id} op={self.op}>"
@@ -0,0 +1,60 @@
+# api/outbox.py
+"""
+Product change capture (transactional outbox).
+
+ORM writes to Product are recorded in `product_outbox` by a session `after_flush`
+listener, inside the same transaction as the write. Core statements (bulk
+insert/update/delete) bypass ORM events and must call `enqueue_product_changes`
+themselves.
+"""
+
+from datetime import datetime
+from typing import Iterable, Tuple
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .models import Product, ProductOutbox
+
+# (product_id, owner_id, op) with op "upsert" or "delete"
+Change = Tuple[int, int, str]
+
+
+def enqueue_product_changes(connection: Connection, changes: Iterable[Change]) -> int:
+    """
+    Insert outbox rows on `connection` (use the write's own connection/transaction).
+
+    Returns:
+        int: Number of rows enqueued.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"product_id": pid, "owner_id": owner_id, "op": op, "created_at": now}
+        for pid, owner_id, op in dict.fromkeys(changes)
+    ]
+    if rows:
+        connection.execute(insert(ProductOutbox.__table__), rows)
+    return len(rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_product_changes(session: Session, flush_context) -> None:
+    """Record flushed Product inserts/updates/deletes in the outbox."""
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, Product):
+            changes.append((obj.product_id, obj.owner_id, "upsert"))
+    for obj in session.dirty:
+        if isinstance(obj, Product) and session.is_modified(obj, include_collections=False):
+            changes.append((obj.product_id, obj.owner_id, "upsert"))
+            # Moved to another owner: the previous owner's chunks must go
+            previous = inspect(obj).attrs.owner_id.history.deleted
+            if previous and previous[0] is not None and previous[0] != obj.owner_id:
+                changes.append((obj.product_id, previous[0], "delete"))
+    for obj in session.deleted:
+        if isinstance(obj, Product):
+            changes.append((obj.product_id, obj.owner_id, "delete"))
+
+    if changes:
+        enqueue_product_changes(session.connection(), changes)
@@ -1,5 +1,14 @@
-from flask import Blueprint, request, jsonify, current_app
+import csv
+import io
+import json
+import zlib
+from typing import Iterator
+
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from flask.typing import ResponseReturnValue
+from sqlalchemy import Integer, cast, column, delete, insert, select, update, values
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.orm.session import Session
 from pydantic import ValidationError
 
@@ -11,8 +20,15 @@ from .schemas.request import (
     FoodProductUpdate,
     ElectronicProductUpdate,
     BookProductUpdate,
+    ProductListQuery,
+    ProductBulkRequest,
+    StockAdjustment,
+    StockAdjustmentBatch,
+    PRODUCT_FIELDS,
+    product_create_adapter,
 )
 from .schemas.response import ProductResponse
+from .outbox import enqueue_product_changes
 from .security.decorators import jwt_required, roles_required
 from .security.jwt_utils import get_jwt_identity  # fetch logged-in user
 
@@ -42,31 +58,202 @@ def get_update_schema(type_: str):
     return None
 
 
+def product_etag(product: Product) -> str:
+    """ETag of a product's representation; changes whenever its version does."""
+    return f"{product.product_id}-{product.version}"
+
+
+def if_match_failed(product: Product) -> bool:
+    """True if the client sent If-Match and it does not name the current version."""
+    return bool(request.if_match) and not request.if_match.contains(product_etag(product))
+
+
+def precondition_failed(product: Product | None = None) -> Response:
+    """412 for a stale If-Match (or a concurrent write), with the current ETag if known."""
+    response = jsonify({"error": "Product was modified by someone else; fetch it again"})
+    response.status_code = 412
+    if product is not None:
+        response.set_etag(product_etag(product))
+    return response
+
+
+def product_filters(query: ProductListQuery) -> list:
+    """SQL conditions for the list filters (all optional, combined with AND)."""
+    table = Product.__table__
+    conditions = []
+    if query.after is not None:
+        conditions.append(table.c.product_id > query.after)
+    if query.type is not None:
+        conditions.append(table.c.type == query.type)
+    if query.owner_id is not None:
+        conditions.append(table.c.owner_id == query.owner_id)
+    if query.min_price is not None:
+        conditions.append(table.c.price >= query.min_price)
+    if query.max_price is not None:
+        conditions.append(table.c.price <= query.max_price)
+    if query.min_quantity is not None:
+        conditions.append(table.c.quantity >= query.min_quantity)
+    if query.max_quantity is not None:
+        conditions.append(table.c.quantity <= query.max_quantity)
+    if query.low_stock is not None:
+        conditions.append(table.c.quantity <= query.low_stock)
+    if query.expiring_before is not None:
+        conditions.append(table.c.expiry_date < query.expiring_before)
+    return conditions
+
+
 # ----------------------
 # GET all products
 # ----------------------
 @products_bp.route("/", methods=["GET"])
-def get_all_products() -> tuple:
-    """Retrieve all products from the database."""
+def get_all_products() -> ResponseReturnValue:
+    """
+    Retrieve one page of products, ordered by product_id.
+
+    Query params: limit, after (cursor), type, owner_id, min_price, max_price,
+    min_quantity, max_quantity, low_stock, expiring_before, fields.
+
+    Returns:
+        {"items": [...], "next_cursor": <product_id or null>, "limit": n}, with an
+        ETag of the page (304 Not Modified if it matches If-None-Match).
+    """
+    try:
+        query = ProductListQuery(**request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"validation_error": e.errors(include_context=False)}), 400
+
+    # Only the requested columns are selected; product_id is the cursor
+    names = query.fields or list(PRODUCT_FIELDS)
+    if "product_id" not in names:
+        names = ["product_id", *names]
+    table = Product.__table__
+    stmt = (
+        select(*[table.c[name] for name in names])
+        .where(*product_filters(query))
+        .order_by(table.c.product_id)
+        .limit(query.limit + 1)  # one extra row tells whether another page exists
+    )
+
     try:
-        products = Product.query.all()
-        result = [ProductResponse.model_validate(p).model_dump() for p in products]
-        return jsonify(result), 200
+        rows = db.session.execute(stmt).all()
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error: {e}")
         return jsonify({"error": "Failed to fetch products"}), 500
 
+    has_more = len(rows) > query.limit
+    items = [dict(row._mapping) for row in rows[: query.limit]]
+    next_cursor = items[-1]["product_id"] if has_more else None
+    response = jsonify({"items": items, "next_cursor": next_cursor, "limit": query.limit})
+    # The page's ETag is a hash of its body, so any change to a listed row alters it
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+# Columns (and names) used by Inventory.save_to_csv
+EXPORT_COLUMNS = (
+    ("product_id", "product_id"),
+    ("product_name", "name"),
+    ("price", "price"),
+    ("quantity", "quantity"),
+    ("type", "type"),
+    ("expiry_date", "expiry_date"),
+    ("warranty_period", "warranty_period"),
+    ("author", "author"),
+    ("pages", "pages"),
+)
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_lines(stmt, fmt: str) -> Iterator[str]:
+    """Yield the export body in batches, streaming rows from a server-side cursor."""
+    header = [name for name, _ in EXPORT_COLUMNS]
+    with db.engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=EXPORT_BATCH_SIZE
+        ).execute(stmt)
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(header)
+            for rows in result.partitions():
+                writer.writerows(rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            for rows in result.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(header, row)), default=str) + "\n"
+                    for row in rows
+                )
+
+
+def gzip_stream(chunks: Iterator[str]) -> Iterator[bytes]:
+    """Gzip a text stream incrementally."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# ----------------------
+# GET export products
+# ----------------------
+@products_bp.route("/export", methods=["GET"])
+@jwt_required
+@roles_required("manager", "admin")
+def export_products() -> Response:
+    """
+    Stream all products (optionally filtered like GET /products/) as NDJSON or CSV.
+
+    Query params: format ("ndjson" default, or "csv"), gzip ("true" to compress),
+    and the GET /products/ filters; `after` resumes an interrupted export
+    (`limit` and `fields` are ignored).
+    """
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in ("ndjson", "csv"):
+        return jsonify({"error": "format must be 'ndjson' or 'csv'"}), 400
+    compress = request.args.get("gzip", "false").lower() in ("1", "true", "yes")
+
+    try:
+        filters = ProductListQuery(**request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"validation_error": e.errors(include_context=False)}), 400
+
+    table = Product.__table__
+    stmt = (
+        select(*[table.c[column] for _, column in EXPORT_COLUMNS])
+        .where(*product_filters(filters))
+        .order_by(table.c.product_id)
+    )
+
+    body = export_lines(stmt, fmt)
+    headers = {
+        "Content-Disposition": f"attachment; filename=products.{fmt}",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if compress:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
 
 # ----------------------
 # GET single product
 # ----------------------
 @products_bp.route("/<int:product_id>", methods=["GET"])
-def get_product(product_id: int) -> tuple:
-    """Retrieve a single product by its ID."""
+def get_product(product_id: int) -> ResponseReturnValue:
+    """Retrieve a single product by its ID (304 if If-None-Match names its version)."""
     product = Product.query.get(product_id)
     if not product:
         return jsonify({"error": "Product not found"}), 404
-    return jsonify(ProductResponse.model_validate(product).model_dump()), 200
+    response = jsonify(ProductResponse.model_validate(product).model_dump())
+    response.set_etag(product_etag(product))
+    return response.make_conditional(request)
 
 
 # ----------------------
@@ -111,8 +298,13 @@ def create_product() -> tuple:
 @products_bp.route("/<int:product_id>", methods=["PUT"])
 @jwt_required
 @roles_required("manager", "admin")
-def update_product(product_id: int) -> tuple:
-    """Update a product if the current user is the owner or admin."""
+def update_product(product_id: int) -> ResponseReturnValue:
+    """
+    Update a product if the current user is the owner or admin.
+
+    With If-Match, the update is applied only if the product is still at that
+    version (412 otherwise); the version is re-checked by the UPDATE itself.
+    """
     product = Product.query.get(product_id)
     if not product:
         return jsonify({"error": "Product not found"}), 404
@@ -127,6 +319,8 @@ def update_product(product_id: int) -> tuple:
 
     if product.owner_id != user_id and user_role != "admin":
         return jsonify({"error": "Not authorized to update this product"}), 403
+    if if_match_failed(product):
+        return precondition_failed(product)
 
     type_ = product.type
     UpdateSchema = get_update_schema(type_)
@@ -143,7 +337,12 @@ def update_product(product_id: int) -> tuple:
     try:
         session: Session = db.session
         session.commit()
-        return jsonify(ProductResponse.model_validate(product).model_dump()), 200
+        response = jsonify(ProductResponse.model_validate(product).model_dump())
+        response.set_etag(product_etag(product))
+        return response
+    except StaleDataError:
+        session.rollback()
+        return precondition_failed()
     except SQLAlchemyError as e:
         session.rollback()
         current_app.logger.error(f"Database error: {e}")
@@ -156,8 +355,8 @@ def update_product(product_id: int) -> tuple:
 @products_bp.route("/<int:product_id>", methods=["DELETE"])
 @jwt_required
 @roles_required("admin")
-def delete_product(product_id: int) -> tuple:
-    """Delete a product if the current user is the owner or admin."""
+def delete_product(product_id: int) -> ResponseReturnValue:
+    """Delete a product if the current user is the owner or admin (If-Match as for PUT)."""
     product = Product.query.get(product_id)
     if not product:
         return jsonify({"error": "Product not found"}), 404
@@ -168,13 +367,413 @@ def delete_product(product_id: int) -> tuple:
 
     if product.owner_id != user_id and user_role != "admin":
         return jsonify({"error": "Not authorized to delete this product"}), 403
+    if if_match_failed(product):
+        return precondition_failed(product)
 
     try:
         session: Session = db.session
         session.delete(product)
         session.commit()
         return jsonify({"message": "Product deleted successfully"}), 200
+    except StaleDataError:
+        session.rollback()
+        return precondition_failed()
     except SQLAlchemyError as e:
         session.rollback()
         current_app.logger.error(f"Database error: {e}")
         return jsonify({"error": "Failed to delete product"}), 500
+
+
+# ----------------------
+# POST bulk create/update/delete
+# ----------------------
+BULK_CHUNK_SIZE = 1000
+
+
+def item_error(index: int, status: str, detail) -> dict:
+    """Per-item result for an item that was not applied."""
+    return {"index": index, "status": status, "error": detail}
+
+
+def existing_products(product_ids: list) -> dict:
+    """Return {product_id: (type, owner_id)} for the given IDs, looked up in chunks."""
+    table = Product.__table__
+    found = {}
+    for start in range(0, len(product_ids), BULK_CHUNK_SIZE):
+        rows = db.session.execute(
+            select(table.c.product_id, table.c.type, table.c.owner_id).where(
+                table.c.product_id.in_(product_ids[start : start + BULK_CHUNK_SIZE])
+            )
+        )
+        found.update({row.product_id: (row.type, row.owner_id) for row in rows})
+    return found
+
+
+def update_products(conn, keys: tuple, rows: dict, user_id: int, is_admin: bool) -> dict:
+    """
+    Apply {product_id: [value per key]} with one UPDATE ... FROM (VALUES ...) per chunk.
+
+    Ownership is checked again in the WHERE clause, so a product deleted or
+    reassigned since it was validated is left out instead of counted.
+
+    Returns:
+        dict: {product_id: owner_id} of the rows actually updated (RETURNING).
+    """
+    table = Product.__table__
+    items = list(rows.items())
+    found = {}
+    for start in range(0, len(items), BULK_CHUNK_SIZE):
+        changes = values(
+            column("b_product_id", Integer),
+            *[column(f"v_{k}", table.c[k].type) for k in keys],
+            name="changes",
+        ).data([(pid, *vals) for pid, vals in items[start : start + BULK_CHUNK_SIZE]])
+        conditions = [table.c.product_id == changes.c.b_product_id]
+        if not is_admin:
+            conditions.append(table.c.owner_id == user_id)
+        stmt = (
+            update(table)
+            .where(*conditions)
+            .values(
+                {
+                    # Cast so an all-NULL VALUES column isn't typed as text
+                    **{k: cast(changes.c[f"v_{k}"], table.c[k].type) for k in keys},
+                    "version": table.c.version + 1,
+                }
+            )
+            .returning(table.c.product_id, table.c.owner_id)
+        )
+        found.update({row.product_id: row.owner_id for row in conn.execute(stmt)})
+    return found
+
+
+@products_bp.route("/bulk", methods=["POST"])
+@jwt_required
+@roles_required("manager", "admin")
+def bulk_products() -> tuple:
+    """
+    Create, update and delete many products in one transaction.
+
+    Body: {"create": [...], "update": [{"product_id": 1, ...}], "delete": [ids]}.
+    Every item is validated and authorised on its own (same rules as the single
+    product routes; deletes need the admin role); valid items are written in a few
+    set-based statements and invalid ones are reported without failing the rest.
+    Updates report only the rows their UPDATE actually changed.
+
+    Returns:
+        {"summary": {...}, "results": {"create": [...], "update": [...], "delete": [...]}}
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "No input data provided"}), 400
+    try:
+        body = ProductBulkRequest(**data)
+    except ValidationError as e:
+        return jsonify({"validation_error": e.errors(include_context=False)}), 400
+
+    max_items = current_app.config["BULK_MAX_ITEMS"]
+    if len(body.create) + len(body.update) + len(body.delete) > max_items:
+        return jsonify({"error": f"At most {max_items} items per request"}), 400
+
+    current_user = get_jwt_identity()
+    user_id = int(current_user["sub"])
+    user_role = current_user["role"]
+    table = Product.__table__
+    results = {"create": [], "update": [], "delete": []}
+
+    # ---- Validate creates (one discriminated-union adapter for every type)
+    create_rows, create_indexes = [], []
+    for i, item in enumerate(body.create):
+        try:
+            product = product_create_adapter.validate_python(item)
+        except ValidationError as e:
+            results["create"].append(
+                item_error(i, "invalid", e.errors(include_context=False))
+            )
+            continue
+        create_rows.append({**product.model_dump(), "owner_id": user_id})
+        create_indexes.append(i)
+
+    # ---- Validate updates against the products' current type and owner
+    update_ids = [
+        item["product_id"] for item in body.update if isinstance(item.get("product_id"), int)
+    ]
+    delete_ids = list(dict.fromkeys(body.delete))
+    existing = existing_products(list(set(update_ids) | set(delete_ids)))
+
+    update_groups: dict = {}  # column set -> {product_id: values}; a repeated ID's last wins
+    updated = []  # (index, product_id, owner_id)
+    for i, item in enumerate(body.update):
+        product_id = item.get("product_id")
+        if not isinstance(product_id, int):
+            results["update"].append(item_error(i, "invalid", "product_id is required"))
+            continue
+        if product_id not in existing:
+            results["update"].append(item_error(i, "not_found", "Product not found"))
+            continue
+        type_, owner_id = existing[product_id]
+        if owner_id != user_id and user_role != "admin":
+            results["update"].append(
+                item_error(i, "forbidden", "Not authorized to update this product")
+            )
+            continue
+        fields = {k: v for k, v in item.items() if k != "product_id"}
+        try:
+            new_values = get_update_schema(type_)(**fields).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            results["update"].append(
+                item_error(i, "invalid", e.errors(include_context=False))
+            )
+            continue
+        if not new_values:
+            results["update"].append(item_error(i, "invalid", "No fields to update"))
+            continue
+        keys = tuple(sorted(new_values))
+        update_groups.setdefault(keys, {})[product_id] = [new_values[k] for k in keys]
+        updated.append((i, product_id, owner_id))
+
+    # ---- Authorise deletes
+    deleted = []  # (index, product_id)
+    for i, product_id in enumerate(body.delete):
+        if user_role != "admin":
+            results["delete"].append(item_error(i, "forbidden", "Admin role required"))
+        elif product_id not in existing:
+            results["delete"].append(item_error(i, "not_found", "Product not found"))
+        else:
+            deleted.append((i, product_id))
+    # A repeated ID is deleted once
+    delete_once = list(dict.fromkeys(pid for _, pid in deleted))
+
+    # ---- Apply everything in one transaction
+    session: Session = db.session
+    try:
+        conn = session.connection()
+        created_ids = []
+        if create_rows:
+            columns = set().union(*create_rows)
+            created_ids = (
+                conn.execute(
+                    insert(table).returning(
+                        table.c.product_id, sort_by_parameter_order=True
+                    ),
+                    [{c: row.get(c) for c in columns} for row in create_rows],
+                )
+                .scalars()
+                .all()
+            )
+        updated_owners = {}
+        for keys, rows in update_groups.items():
+            updated_owners.update(
+                update_products(conn, keys, rows, user_id, user_role == "admin")
+            )
+        # Validated products that were deleted or reassigned meanwhile aren't updated
+        results["update"] += [
+            item_error(i, "not_found", "Product was deleted or changed owner")
+            for i, pid, _ in updated
+            if pid not in updated_owners
+        ]
+        updated = [
+            (i, pid, updated_owners[pid]) for i, pid, _ in updated if pid in updated_owners
+        ]
+        deleted_owners = {}
+        for start in range(0, len(delete_once), BULK_CHUNK_SIZE):
+            rows = conn.execute(
+                delete(table)
+                .where(table.c.product_id.in_(delete_once[start : start + BULK_CHUNK_SIZE]))
+                .returning(table.c.product_id, table.c.owner_id)
+            )
+            deleted_owners.update({row.product_id: row.owner_id for row in rows})
+        # Report from the rows actually removed; a repeated ID counts once, as if the
+        # items ran in order
+        reported = set()
+        for i, pid in deleted:
+            if pid not in deleted_owners:
+                results["delete"].append(item_error(i, "not_found", "Product not found"))
+            elif pid in reported:
+                results["delete"].append(
+                    item_error(i, "not_found", "Product already deleted by an earlier item")
+                )
+            else:
+                reported.add(pid)
+                results["delete"].append({"index": i, "status": "deleted", "product_id": pid})
+
+        # Core statements bypass the ORM outbox listener
+        changes = [(pid, user_id, "upsert") for pid in created_ids]
+        changes += [(pid, owner_id, "upsert") for pid, owner_id in updated_owners.items()]
+        changes += [(pid, owner_id, "delete") for pid, owner_id in deleted_owners.items()]
+        enqueue_product_changes(conn, changes)
+        session.commit()
+    except SQLAlchemyError as e:
+        session.rollback()
+        current_app.logger.error(f"Database error: {e}")
+        return jsonify({"error": "Bulk operation failed; no changes were applied"}), 500
+
+    results["create"] += [
+        {"index": i, "status": "created", "product_id": pid}
+        for i, pid in zip(create_indexes, created_ids)
+    ]
+    results["update"] += [
+        {"index": i, "status": "updated", "product_id": pid} for i, pid, _ in updated
+    ]
+    for key in results:
+        results[key].sort(key=lambda r: r["index"])
+
+    summary = {
+        "created": len(created_ids),
+        "updated": len(updated_owners),
+        "deleted": len(deleted_owners),
+        "failed": sum(
+            1 for items in results.values() for r in items if "error" in r
+        ),
+    }
+    return jsonify({"summary": summary, "results": results}), 200
+
+
+# ----------------------
+# POST stock adjustments
+# ----------------------
+def apply_stock_adjustments(deltas: dict, user_id: int, is_admin: bool):
+    """
+    Add `deltas` ({product_id: delta}) to stock in one UPDATE ... FROM (VALUES ...).
+
+    `quantity = quantity + delta` is computed by the database with a non-negative
+    guard, so concurrent adjustments never overwrite each other. The caller commits.
+
+    Returns:
+        Tuple[dict, dict]: ({product_id: (new quantity, owner_id)} for applied
+        adjustments, {product_id: (status, message)} for the rest).
+    """
+    table = Product.__table__
+    changes = values(
+        column("product_id", Integer), column("delta", Integer), name="changes"
+    ).data(list(deltas.items()))
+    conditions = [
+        table.c.product_id == changes.c.product_id,
+        table.c.quantity + changes.c.delta >= 0,
+    ]
+    if not is_admin:
+        conditions.append(table.c.owner_id == user_id)
+    stmt = (
+        update(table)
+        .where(*conditions)
+        .values(quantity=table.c.quantity + changes.c.delta, version=table.c.version + 1)
+        .returning(table.c.product_id, table.c.quantity, table.c.owner_id)
+    )
+    conn = db.session.connection()
+    applied = {row.product_id: (row.quantity, row.owner_id) for row in conn.execute(stmt)}
+
+    # Explain the rows the guard skipped (only read on the failure path)
+    failed = {}
+    missing = [pid for pid in deltas if pid not in applied]
+    for start in range(0, len(missing), BULK_CHUNK_SIZE):
+        rows = conn.execute(
+            select(table.c.product_id, table.c.quantity, table.c.owner_id).where(
+                table.c.product_id.in_(missing[start : start + BULK_CHUNK_SIZE])
+            )
+        )
+        for row in rows:
+            if not is_admin and row.owner_id != user_id:
+                failed[row.product_id] = ("forbidden", "Not authorized to adjust this product")
+            else:
+                failed[row.product_id] = (
+                    "insufficient_stock",
+                    f"Only {row.quantity} in stock",
+                )
+    for pid in missing:
+        failed.setdefault(pid, ("not_found", "Product not found"))
+
+    # Core UPDATE bypasses the ORM outbox listener; stock is part of the embedded text
+    enqueue_product_changes(
+        conn, [(pid, owner_id, "upsert") for pid, (_, owner_id) in applied.items()]
+    )
+    return applied, failed
+
+
+@products_bp.route("/<int:product_id>/adjust", methods=["POST"])
+@jwt_required
+@roles_required("manager", "admin")
+def adjust_stock(product_id: int) -> tuple:
+    """
+    Atomically add `delta` to a product's quantity (owner or admin).
+
+    Returns 409 if the adjustment would make the quantity negative.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "No input data provided"}), 400
+    try:
+        adjustment = StockAdjustment(**data)
+    except ValidationError as e:
+        return jsonify({"validation_error": e.errors(include_context=False)}), 400
+
+    current_user = get_jwt_identity()
+    user_id = int(current_user["sub"])
+    session: Session = db.session
+    try:
+        applied, failed = apply_stock_adjustments(
+            {product_id: adjustment.delta}, user_id, current_user["role"] == "admin"
+        )
+        session.commit()
+    except SQLAlchemyError as e:
+        session.rollback()
+        current_app.logger.error(f"Database error: {e}")
+        return jsonify({"error": "Failed to adjust stock"}), 500
+
+    if product_id in failed:
+        status, message = failed[product_id]
+        code = {"not_found": 404, "forbidden": 403, "insufficient_stock": 409}[status]
+        return jsonify({"error": message}), code
+
+    quantity, _ = applied[product_id]
+    return jsonify({"product_id": product_id, "quantity": quantity}), 200
+
+
+@products_bp.route("/adjust", methods=["POST"])
+@jwt_required
+@roles_required("manager", "admin")
+def adjust_stock_batch() -> tuple:
+    """
+    Apply many stock adjustments in one statement, with a result per product.
+
+    Deltas for the same product are summed and applied together (or not at all).
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "No input data provided"}), 400
+    try:
+        batch = StockAdjustmentBatch(**data)
+    except ValidationError as e:
+        return jsonify({"validation_error": e.errors(include_context=False)}), 400
+
+    max_items = current_app.config["BULK_MAX_ITEMS"]
+    if len(batch.adjustments) > max_items:
+        return jsonify({"error": f"At most {max_items} items per request"}), 400
+
+    deltas: dict = {}
+    for item in batch.adjustments:
+        deltas[item.product_id] = deltas.get(item.product_id, 0) + item.delta
+
+    current_user = get_jwt_identity()
+    user_id = int(current_user["sub"])
+    session: Session = db.session
+    try:
+        applied, failed = apply_stock_adjustments(
+            deltas, user_id, current_user["role"] == "admin"
+        )
+        session.commit()
+    except SQLAlchemyError as e:
+        session.rollback()
+        current_app.logger.error(f"Database error: {e}")
+        return jsonify({"error": "Failed to adjust stock"}), 500
+
+    results = []
+    for pid, delta in deltas.items():
+        if pid in applied:
+            results.append(
+                {"product_id": pid, "delta": delta, "status": "applied", "quantity": applied[pid][0]}
+            )
+        else:
+            status, message = failed[pid]
+            results.append({"product_id": pid, "delta": delta, "status": status, "error": message})
+    summary = {"applied": len(applied), "failed": len(failed)}
+    return jsonify({"summary": summary, "results": results}), 200
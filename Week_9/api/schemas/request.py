@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from typing import Annotated, Any, Dict, List, Optional, Literal, Union
 from datetime import date
 
 
@@ -31,6 +31,7 @@ class FoodProductCreate(BaseProductCreate):
         expiry_date (date): Expiry date of the food product.
     """
 
+    type: Literal["food"]
     expiry_date: date
 
 
@@ -42,6 +43,7 @@ class ElectronicProductCreate(BaseProductCreate):
         warranty_period (int): Warranty period in months.
     """
 
+    type: Literal["electronic"]
     warranty_period: int
 
 
@@ -54,10 +56,19 @@ class BookProductCreate(BaseProductCreate):
         pages (int): Number of pages in the book.
     """
 
+    type: Literal["book"]
     author: str
     pages: int
 
 
+# Any create payload, dispatched on "type" without trying every schema
+ProductCreate = Annotated[
+    Union[FoodProductCreate, ElectronicProductCreate, BookProductCreate],
+    Field(discriminator="type"),
+]
+product_create_adapter: TypeAdapter = TypeAdapter(ProductCreate)
+
+
 # ----------------------
 # Update schemas
 # ----------------------
@@ -79,6 +90,14 @@ class BaseProductUpdate(BaseModel):
         None, ge=0, description="Updated quantity in stock, must be >= 0"
     )
 
+    @field_validator("name", "price", "quantity")
+    @classmethod
+    def not_null(cls, value):
+        """Fields may be omitted, but not set to null (NOT NULL columns)."""
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 
 class FoodProductUpdate(BaseProductUpdate):
     """Schema for updating a Food product."""
@@ -99,3 +118,117 @@ class BookProductUpdate(BaseProductUpdate):
 
     author: str = Field(..., min_length=3)
     pages: int = Field(..., gt=0, description="Number of pages, must be > 0")
+
+
+# ----------------------
+# Bulk schemas
+# ----------------------
+class ProductBulkRequest(BaseModel):
+    """
+    Body of POST /products/bulk. Items are validated one by one so each gets
+    its own result.
+
+    Attributes:
+        create (List[Dict[str, Any]]): Create payloads (any product type).
+        update (List[Dict[str, Any]]): Partial updates, each with a "product_id".
+        delete (List[int]): Product IDs to delete.
+    """
+
+    create: List[Dict[str, Any]] = []
+    update: List[Dict[str, Any]] = []
+    delete: List[int] = []
+
+
+class StockAdjustment(BaseModel):
+    """
+    Body of POST /products/<id>/adjust.
+
+    Attributes:
+        delta (int): Quantity to add (received) or subtract (picked); not 0.
+    """
+
+    delta: int = Field(..., description="Change in stock; negative to remove")
+
+    @field_validator("delta")
+    @classmethod
+    def non_zero(cls, value: int) -> int:
+        if value == 0:
+            raise ValueError("delta must not be 0")
+        return value
+
+
+class StockAdjustmentItem(StockAdjustment):
+    """One adjustment in a batch: StockAdjustment plus the product it applies to."""
+
+    product_id: int
+
+
+class StockAdjustmentBatch(BaseModel):
+    """
+    Body of POST /products/adjust.
+
+    Attributes:
+        adjustments (List[StockAdjustmentItem]): Adjustments; deltas for the same
+            product are summed and applied together.
+    """
+
+    adjustments: List[StockAdjustmentItem] = Field(..., min_length=1)
+
+
+# ----------------------
+# Query schemas
+# ----------------------
+PRODUCT_FIELDS = (
+    "product_id",
+    "name",
+    "price",
+    "quantity",
+    "type",
+    "expiry_date",
+    "warranty_period",
+    "author",
+    "pages",
+    "version",
+)
+
+
+class ProductListQuery(BaseModel):
+    """
+    Query parameters for listing products (keyset pagination on product_id).
+
+    Attributes:
+        limit (int): Page size (1-500).
+        after (Optional[int]): Cursor; return products with product_id > after.
+        type (Optional[Literal["food", "electronic", "book"]]): Product type filter.
+        owner_id (Optional[int]): Owner filter.
+        min_price / max_price (Optional[float]): Inclusive price range.
+        min_quantity / max_quantity (Optional[int]): Inclusive quantity range.
+        low_stock (Optional[int]): Only products with quantity <= low_stock.
+        expiring_before (Optional[date]): Only products expiring before this date.
+        fields (Optional[List[str]]): Columns to return (comma-separated);
+            product_id is always included.
+    """
+
+    limit: int = Field(50, ge=1, le=500)
+    after: Optional[int] = Field(None, ge=0)
+    type: Optional[Literal["food", "electronic", "book"]] = None
+    owner_id: Optional[int] = None
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+    min_quantity: Optional[int] = Field(None, ge=0)
+    max_quantity: Optional[int] = Field(None, ge=0)
+    low_stock: Optional[int] = Field(None, ge=0)
+    expiring_before: Optional[date] = None
+    fields: Optional[List[str]] = None
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value):
+        """Accept `fields=name,price` and check every name is a product field."""
+        if value is None or isinstance(value, list):
+            return value
+        names = [name.strip() for name in str(value).split(",") if name.strip()]
+        unknown = [name for name in names if name not in PRODUCT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return names
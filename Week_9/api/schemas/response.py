@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 
 
 class ProductResponse(BaseModel):
@@ -17,6 +17,7 @@ class ProductResponse(BaseModel):
         warranty_period (Optional[int]): Warranty period in months for electronic products.
         author (Optional[str]): Author name for book products.
         pages (Optional[int]): Number of pages for book products.
+        version (int): Row version, bumped on every change (also sent as the ETag).
     """
 
     product_id: int
@@ -28,6 +29,7 @@ class ProductResponse(BaseModel):
     warranty_period: Optional[int] = None
     author: Optional[str] = None
     pages: Optional[int] = None
+    version: int
 
     model_config = ConfigDict(from_attributes=True)  # ORM mode
 
@@ -38,3 +40,39 @@ class UserResponse(BaseModel):
     id: int
     username: str
     role: str
+
+
+class IngestionJobResponse(BaseModel):
+    """
+    Schema for returning document ingestion job status.
+
+    Attributes:
+        id (int): Job ID.
+        filename (str): Uploaded file name.
+        status (str): "queued", "running", "done" or "failed".
+        mode (str): "append" or "replace".
+        total_chunks (Optional[int]): Chunks in the document, known once done.
+        embedded_chunks (int): Chunks embedded and stored so far.
+        reused_chunks (int): Chunks already stored for the user, linked instead
+            of embedded again.
+        total_bytes (Optional[int]): Size of the uploaded file.
+        processed_bytes (int): Bytes of the file chunked and stored so far.
+        error (Optional[str]): Failure reason for failed jobs.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: int
+    filename: str
+    status: str
+    mode: str = "append"
+    total_chunks: Optional[int] = None
+    embedded_chunks: int = 0
+    reused_chunks: int = 0
+    total_bytes: Optional[int] = None
+    processed_bytes: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
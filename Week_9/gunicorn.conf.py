@@ -0,0 +1,65 @@
+# gunicorn.conf.py
+"""
+Production server config.
+
+Usage:
+  EMBEDDING_PRELOAD=true gunicorn -c gunicorn.conf.py "api.app:app"
+
+With `preload_app` the app is created once in the master; with EMBEDDING_PRELOAD the
+embedding model is loaded there too, so every forked worker shares its memory pages
+copy-on-write instead of loading its own copy.
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", 2))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+preload_app = True
+
+# create_app runs in the master; its background threads are started by post_fork
+os.environ["BACKGROUND_TASKS_IN_WORKER"] = "true"
+SWEEPER_LOCK = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "instance", "llm-cache-sweeper.lock"
+)
+
+
+def claim_sweeper() -> bool:
+    """
+    Take the cache-sweeper lock for this worker (non-blocking).
+
+    Exactly one worker holds it; the descriptor stays open for the worker's
+    lifetime, so if that worker dies its replacement takes the lock over.
+    """
+    import fcntl
+
+    os.makedirs(os.path.dirname(SWEEPER_LOCK), exist_ok=True)
+    fd = os.open(SWEEPER_LOCK, os.O_CREAT | os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+    return True
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections (pools must not cross a fork)."""
+    from scripts.vector_store import reset_vector_stores
+
+    # close=False: the inherited sockets belong to the master's connections
+    reset_vector_stores(close=False)
+
+    from api.app import app
+    from api.db import db
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    interval = app.config.get("LLM_CACHE_SWEEP_INTERVAL")
+    if interval and claim_sweeper():
+        from scripts.llm_cache import start_cache_sweeper
+
+        start_cache_sweeper(app, interval)
+        server.log.info(f"[STARTUP] llm_cache sweeper running in worker pid={worker.pid}")
@@ -0,0 +1,45 @@
+"""Add ingestion_jobs table
+
+Revision ID: 0c9a8d3e6f15
+Revises: f7b2d94e0c31
+Create Date: 2025-09-24 11:05:48.271940
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0c9a8d3e6f15"
+down_revision = "f7b2d94e0c31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ingestion_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("file_path", sa.String(length=500), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("total_chunks", sa.Integer(), nullable=True),
+        sa.Column("embedded_chunks", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("ingestion_jobs", schema=None) as batch_op:
+        batch_op.create_index(batch_op.f("ix_ingestion_jobs_user_id"), ["user_id"])
+        batch_op.create_index("ix_ingestion_jobs_status_id", ["status", "id"])
+
+
+def downgrade():
+    with op.batch_alter_table("ingestion_jobs", schema=None) as batch_op:
+        batch_op.drop_index("ix_ingestion_jobs_status_id")
+        batch_op.drop_index(batch_op.f("ix_ingestion_jobs_user_id"))
+    op.drop_table("ingestion_jobs")
@@ -0,0 +1,36 @@
+"""Add expires_at and expiry indexes to llm_cache
+
+Revision ID: 1e6f0b2a4c73
+Revises: 8c3d5e7f9a12
+Create Date: 2025-09-19 16:48:02.336571
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "1e6f0b2a4c73"
+down_revision = "8c3d5e7f9a12"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("llm_cache", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("expires_at", sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f("ix_llm_cache_created_at"), ["created_at"])
+        batch_op.create_index(batch_op.f("ix_llm_cache_expires_at"), ["expires_at"])
+
+    # Existing rows keep the previous fixed one-hour TTL
+    op.execute(
+        "UPDATE llm_cache SET expires_at = created_at + interval '3600 seconds' "
+        "WHERE created_at IS NOT NULL"
+    )
+    op.execute("UPDATE llm_cache SET expires_at = now() WHERE expires_at IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table("llm_cache", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_llm_cache_expires_at"))
+        batch_op.drop_index(batch_op.f("ix_llm_cache_created_at"))
+        batch_op.drop_column("expires_at")
@@ -0,0 +1,31 @@
+"""Add embedding_cache table
+
+Revision ID: 3a7e9c2f1b64
+Revises: 9e3b7c1d5a28
+Create Date: 2025-09-29 13:37:02.640519
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+# revision identifiers, used by Alembic.
+revision = "3a7e9c2f1b64"
+down_revision = "9e3b7c1d5a28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model", sa.String(length=200), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=False),
+        sa.Column("embedding", Vector(384), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("model", "text_hash"),
+    )
+
+
+def downgrade():
+    op.drop_table("embedding_cache")
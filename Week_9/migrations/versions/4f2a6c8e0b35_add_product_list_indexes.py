@@ -0,0 +1,36 @@
+"""Add composite indexes for product list pagination and filters
+
+Revision ID: 4f2a6c8e0b35
+Revises: e8c4a2f6b1d9
+Create Date: 2025-10-06 09:51:30.276648
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4f2a6c8e0b35"
+down_revision = "e8c4a2f6b1d9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_products_owner_id_product_id", ["owner_id", "product_id"]
+        )
+        batch_op.create_index("ix_products_type_product_id", ["type", "product_id"])
+        batch_op.create_index(
+            "ix_products_quantity_product_id", ["quantity", "product_id"]
+        )
+        batch_op.create_index("ix_products_price", ["price"])
+        batch_op.create_index("ix_products_expiry_date", ["expiry_date"])
+
+
+def downgrade():
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.drop_index("ix_products_expiry_date")
+        batch_op.drop_index("ix_products_price")
+        batch_op.drop_index("ix_products_quantity_product_id")
+        batch_op.drop_index("ix_products_type_product_id")
+        batch_op.drop_index("ix_products_owner_id_product_id")
@@ -0,0 +1,39 @@
+"""Add metadata expression indexes to langchain embeddings
+
+Revision ID: 5b8e21c04f6a
+Revises: d2a7f3c91e4b
+Create Date: 2025-09-18 15:06:44.870215
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5b8e21c04f6a"
+down_revision = "d2a7f3c91e4b"
+branch_labels = None
+depends_on = None
+
+# Expression indexes on the metadata keys used as filters (works for JSON and JSONB)
+METADATA_INDEXES = {
+    "ix_lpe_collection_user_id": "(collection_id, (cmetadata->>'user_id'))",
+    "ix_lpe_user_id_product_id": "((cmetadata->>'user_id'), (cmetadata->>'product_id'))",
+    "ix_lpe_user_id_source": "((cmetadata->>'user_id'), (cmetadata->>'source'))",
+}
+
+
+def upgrade():
+    # Tables are created by PGVector on first use;
+    # `python scripts/vector_index.py metadata-indexes` covers that case.
+    if not sa.inspect(op.get_bind()).has_table("langchain_pg_embedding"):
+        return
+
+    for name, columns in METADATA_INDEXES.items():
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON langchain_pg_embedding {columns}"
+        )
+
+
+def downgrade():
+    for name in METADATA_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
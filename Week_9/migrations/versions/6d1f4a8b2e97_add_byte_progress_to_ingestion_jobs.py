@@ -0,0 +1,34 @@
+"""Add byte progress to ingestion_jobs
+
+Revision ID: 6d1f4a8b2e97
+Revises: 0c9a8d3e6f15
+Create Date: 2025-09-25 09:42:13.508216
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "6d1f4a8b2e97"
+down_revision = "0c9a8d3e6f15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("ingestion_jobs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("total_bytes", sa.BigInteger(), nullable=True))
+        batch_op.add_column(
+            sa.Column(
+                "processed_bytes",
+                sa.BigInteger(),
+                nullable=False,
+                server_default="0",
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("ingestion_jobs", schema=None) as batch_op:
+        batch_op.drop_column("processed_bytes")
+        batch_op.drop_column("total_bytes")
@@ -0,0 +1,27 @@
+"""Add version column to products for optimistic concurrency
+
+Revision ID: 7c3e1a9d4b26
+Revises: 4f2a6c8e0b35
+Create Date: 2025-10-08 11:17:42.604391
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "7c3e1a9d4b26"
+down_revision = "4f2a6c8e0b35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("products", schema=None) as batch_op:
+        batch_op.drop_column("version")
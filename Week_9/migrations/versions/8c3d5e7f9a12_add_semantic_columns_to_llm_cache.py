@@ -0,0 +1,36 @@
+"""Add semantic cache columns to llm_cache
+
+Revision ID: 8c3d5e7f9a12
+Revises: 5b8e21c04f6a
+Create Date: 2025-09-19 10:21:37.114902
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+# revision identifiers, used by Alembic.
+revision = "8c3d5e7f9a12"
+down_revision = "5b8e21c04f6a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("llm_cache", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("user_id", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("question_embedding", Vector(384), nullable=True))
+        batch_op.create_index(batch_op.f("ix_llm_cache_user_id"), ["user_id"])
+
+    # Backfill user_id from the "<user_id>::<question>" cache keys
+    op.execute(
+        "UPDATE llm_cache SET user_id = split_part(question, '::', 1)::int "
+        "WHERE question ~ '^[0-9]+::'"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("llm_cache", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_llm_cache_user_id"))
+        batch_op.drop_column("question_embedding")
+        batch_op.drop_column("user_id")
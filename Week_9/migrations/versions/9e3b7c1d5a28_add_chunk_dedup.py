@@ -0,0 +1,61 @@
+"""Add document_chunk_sources table, chunk_hash index and ingestion job mode
+
+Revision ID: 9e3b7c1d5a28
+Revises: 6d1f4a8b2e97
+Create Date: 2025-09-26 10:18:57.114302
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "9e3b7c1d5a28"
+down_revision = "6d1f4a8b2e97"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "document_chunk_sources",
+        sa.Column("collection", sa.String(length=100), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("chunk_hash", sa.String(length=64), nullable=False),
+        sa.Column("source", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("collection", "user_id", "chunk_hash", "source"),
+    )
+    with op.batch_alter_table("document_chunk_sources", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_document_chunk_sources_source", ["collection", "user_id", "source"]
+        )
+
+    with op.batch_alter_table("ingestion_jobs", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "mode", sa.String(length=20), nullable=False, server_default="append"
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "reused_chunks", sa.Integer(), nullable=False, server_default="0"
+            )
+        )
+
+    # Dedup lookups filter on (user_id, chunk_hash); the table may not exist yet
+    # (`python scripts/vector_index.py metadata-indexes` covers that case)
+    if sa.inspect(op.get_bind()).has_table("langchain_pg_embedding"):
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_lpe_user_id_chunk_hash ON langchain_pg_embedding "
+            "((cmetadata->>'user_id'), (cmetadata->>'chunk_hash'))"
+        )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_lpe_user_id_chunk_hash")
+    with op.batch_alter_table("ingestion_jobs", schema=None) as batch_op:
+        batch_op.drop_column("reused_chunks")
+        batch_op.drop_column("mode")
+    with op.batch_alter_table("document_chunk_sources", schema=None) as batch_op:
+        batch_op.drop_index("ix_document_chunk_sources_source")
+    op.drop_table("document_chunk_sources")
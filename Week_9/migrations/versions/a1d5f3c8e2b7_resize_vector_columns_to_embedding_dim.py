@@ -0,0 +1,81 @@
+"""Resize vector columns to the embedding model's dimension (384)
+
+Revision ID: a1d5f3c8e2b7
+Revises: 7c3e1a9d4b26
+Create Date: 2025-10-09 14:26:51.873012
+
+Every vector column gets the same fixed size. Switching EMBEDDING_MODEL to a model
+with another dimension needs a new revision like this one with that dimension; its
+upgrade drops the stored vectors, so products must be re-embedded
+(`scripts/embedding.py`) and documents uploaded again.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a1d5f3c8e2b7"
+down_revision = "7c3e1a9d4b26"
+branch_labels = None
+depends_on = None
+
+# all-MiniLM-L6-v2 (the default EMBEDDING_MODEL) output size; fixed for this revision
+EMBEDDING_DIM = 384
+# Size the previous revisions gave these columns
+PREVIOUS_DIM = 384
+
+VECTOR_COLUMNS = [
+    ("documents", "embedding"),
+    ("llm_cache", "question_embedding"),
+    ("embedding_cache", "embedding"),
+    ("langchain_pg_embedding", "embedding"),
+]
+
+
+def column_type(table: str, column: str):
+    """Current SQL type of a column, e.g. "vector(384)" (None if the table is missing)."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(table):
+        return None
+    return bind.execute(
+        sa.text(
+            "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = CAST(:table AS regclass) AND attname = :column"
+        ),
+        {"table": table, "column": column},
+    ).scalar()
+
+
+def resize(table: str, column: str, dim: int) -> None:
+    """Change a vector column's size, dropping vectors that can't be converted."""
+    target = f"vector({dim})"
+    current = column_type(table, column)
+    if current in (None, target):
+        return
+    if current == "vector":
+        # Untyped (PGVector's own DDL): rows already hold vectors of this model
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target}")
+    elif table == "langchain_pg_embedding":
+        # Vectors of another model can't be converted: drop them with the bookkeeping
+        # that marks them as embedded, so the next sync re-embeds every product
+        op.execute("DELETE FROM langchain_pg_embedding")
+        op.execute("DELETE FROM embedding_manifest")
+        op.execute("DELETE FROM document_chunk_sources")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target}")
+    elif table == "embedding_cache":
+        op.execute("DELETE FROM embedding_cache")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target}")
+    else:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {target} USING NULL")
+
+
+def upgrade():
+    for table, column in VECTOR_COLUMNS:
+        resize(table, column, EMBEDDING_DIM)
+
+
+def downgrade():
+    # Restores the previous size; like the upgrade, this drops vectors of the
+    # other size, so a re-embed follows
+    for table, column in VECTOR_COLUMNS:
+        resize(table, column, PREVIOUS_DIM)
@@ -0,0 +1,41 @@
+"""Add llm_usage table
+
+Revision ID: a4c19e6d2b58
+Revises: 1e6f0b2a4c73
+Create Date: 2025-09-22 09:37:51.602418
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a4c19e6d2b58"
+down_revision = "1e6f0b2a4c73"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "llm_usage",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("source", sa.String(length=50), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("total_tokens", sa.Integer(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("llm_usage", schema=None) as batch_op:
+        batch_op.create_index(batch_op.f("ix_llm_usage_user_id"), ["user_id"])
+        batch_op.create_index(batch_op.f("ix_llm_usage_created_at"), ["created_at"])
+
+
+def downgrade():
+    with op.batch_alter_table("llm_usage", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_llm_usage_created_at"))
+        batch_op.drop_index(batch_op.f("ix_llm_usage_user_id"))
+    op.drop_table("llm_usage")
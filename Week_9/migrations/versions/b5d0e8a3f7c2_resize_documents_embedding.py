@@ -0,0 +1,30 @@
+"""Resize documents.embedding to the configured embedding model
+
+Revision ID: b5d0e8a3f7c2
+Revises: 3a7e9c2f1b64
+Create Date: 2025-09-30 16:04:21.395871
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b5d0e8a3f7c2"
+down_revision = "3a7e9c2f1b64"
+branch_labels = None
+depends_on = None
+
+# all-MiniLM-L6-v2 (constants.EMBEDDING_MODEL) output size
+EMBEDDING_DIM = 384
+
+
+def upgrade():
+    # Existing 1536-dim OpenAI vectors can't be cast and aren't comparable with
+    # query embeddings from the configured model; they are cleared for re-embedding.
+    op.execute(
+        f"ALTER TABLE documents ALTER COLUMN embedding TYPE vector({EMBEDDING_DIM}) "
+        "USING NULL"
+    )
+
+
+def downgrade():
+    op.execute("ALTER TABLE documents ALTER COLUMN embedding TYPE vector(1536) USING NULL")
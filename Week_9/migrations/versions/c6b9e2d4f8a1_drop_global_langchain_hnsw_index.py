@@ -0,0 +1,31 @@
+"""Drop the table-wide HNSW index on langchain embeddings
+
+Revision ID: c6b9e2d4f8a1
+Revises: a1d5f3c8e2b7
+Create Date: 2025-10-09 15:02:38.417266
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "c6b9e2d4f8a1"
+down_revision = "a1d5f3c8e2b7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tenant-filtered searches on it returned fewer than k rows for small tenants;
+    # the per-collection and per-tenant indexes of scripts/vector_index.py replace it
+    op.execute("DROP INDEX IF EXISTS ix_langchain_pg_embedding_embedding_hnsw")
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table("langchain_pg_embedding"):
+        return
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_embedding_hnsw "
+        "ON langchain_pg_embedding USING hnsw (embedding vector_cosine_ops) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
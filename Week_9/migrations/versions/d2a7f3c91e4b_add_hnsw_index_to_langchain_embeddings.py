@@ -0,0 +1,44 @@
+"""Add HNSW index to langchain embeddings
+
+Revision ID: d2a7f3c91e4b
+Revises: c4df498b9ca2
+Create Date: 2025-09-18 11:42:10.513207
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d2a7f3c91e4b"
+down_revision = "c4df498b9ca2"
+branch_labels = None
+depends_on = None
+
+# all-MiniLM-L6-v2 output size; HNSW/IVFFlat need a fixed dimension
+EMBEDDING_DIM = 384
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    # PGVector creates its tables on first use; if they do not exist yet,
+    # `python scripts/vector_index.py create` builds the index afterwards.
+    if not sa.inspect(op.get_bind()).has_table("langchain_pg_embedding"):
+        return
+
+    op.execute(
+        f"ALTER TABLE langchain_pg_embedding "
+        f"ALTER COLUMN embedding TYPE vector({EMBEDDING_DIM})"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_embedding_hnsw "
+        "ON langchain_pg_embedding USING hnsw (embedding vector_cosine_ops) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_langchain_pg_embedding_embedding_hnsw")
+    if sa.inspect(op.get_bind()).has_table("langchain_pg_embedding"):
+        # PGVector creates the column without a dimension
+        op.execute("ALTER TABLE langchain_pg_embedding ALTER COLUMN embedding TYPE vector")
@@ -0,0 +1,27 @@
+"""Prune query rows from embedding_cache and index created_at
+
+Revision ID: e4a8c1f7b3d9
+Revises: c6b9e2d4f8a1
+Create Date: 2025-10-10 11:24:51.903318
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e4a8c1f7b3d9"
+down_revision = "c6b9e2d4f8a1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Query embeddings are no longer persisted (scripts/cached_embeddings.py);
+    # drop the ones stored before. They are cache rows and are not restored on downgrade.
+    op.execute("DELETE FROM embedding_cache WHERE model LIKE '%#query'")
+    op.create_index(
+        "ix_embedding_cache_created_at", "embedding_cache", ["created_at"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_embedding_cache_created_at", table_name="embedding_cache")
@@ -0,0 +1,38 @@
+"""Add product_outbox table
+
+Revision ID: e8c4a2f6b1d9
+Revises: b5d0e8a3f7c2
+Create Date: 2025-10-02 11:26:49.803157
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "e8c4a2f6b1d9"
+down_revision = "b5d0e8a3f7c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "product_outbox",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("product_outbox", schema=None) as batch_op:
+        batch_op.create_index("ix_product_outbox_pending", ["processed_at", "id"])
+
+
+def downgrade():
+    with op.batch_alter_table("product_outbox", schema=None) as batch_op:
+        batch_op.drop_index("ix_product_outbox_pending")
+    op.drop_table("product_outbox")
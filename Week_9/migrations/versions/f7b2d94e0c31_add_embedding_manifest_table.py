@@ -0,0 +1,32 @@
+"""Add embedding_manifest table
+
+Revision ID: f7b2d94e0c31
+Revises: a4c19e6d2b58
+Create Date: 2025-09-23 14:12:26.908731
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "f7b2d94e0c31"
+down_revision = "a4c19e6d2b58"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "embedding_manifest",
+        sa.Column("collection", sa.String(length=100), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("chunk_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("collection", "user_id", "product_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("embedding_manifest")
@@ -0,0 +1,217 @@
+# scripts/bulk_embedding.py
+"""
+Bulk catalog ingestion: embed a user's products across a process pool.
+
+Usage:
+  python scripts/bulk_embedding.py --user_id 17 --workers 4 --batch-size 256
+  python scripts/bulk_embedding.py --user_id 17 --restart   # ignore checkpoint
+
+Products are streamed in product_id order and embedded in batches, one MiniLM model per
+worker process. Each finished batch is written to pgvector in one insert, recorded in
+the embedding manifest, and checkpointed, so a crashed run resumes where it stopped.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from dotenv import load_dotenv
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from scripts.constants import CHUNK_SIZE, CHUNK_OVERLAP, COLLECTION_NAME
+from scripts.data_loader import iter_products
+from scripts.embedding import build_documents, product_text
+from scripts.embedding_manifest import content_hash, upsert_entries
+from scripts.vector_store import get_vector_store, delete_chunks
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+CHECKPOINT_DIR = os.path.join(BASE_DIR, "instance")
+
+# Per-worker embeddings model, loaded once by _init_worker
+_worker_embeddings = None
+
+# (texts, metadatas, manifest entries, last product_id) for one batch
+Batch = Tuple[List[str], List[Dict[str, Any]], List[Tuple[int, str, int]], int]
+
+
+def _init_worker(threads: int) -> None:
+    """Process-pool initializer: load the model once and cap torch threads."""
+    global _worker_embeddings
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from scripts.cached_embeddings import get_embeddings
+    from scripts.embedding_model import warmup
+
+    warmup()
+    _worker_embeddings = get_embeddings()
+
+
+def _embed_texts(texts: List[str]) -> List[List[float]]:
+    """Runs in a worker process."""
+    return _worker_embeddings.embed_documents(texts)
+
+
+def checkpoint_path(collection: str, user_id: int) -> str:
+    return os.path.join(CHECKPOINT_DIR, f"bulk_embedding_{collection}_{user_id}.json")
+
+
+def read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Write atomically so a crash never leaves a truncated checkpoint."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def iter_batches(user_id: int, after_id: int, batch_size: int) -> Iterator[Batch]:
+    """Yield chunked product batches (in product_id order) after a checkpoint."""
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+    )
+    texts: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    entries: List[Tuple[int, str, int]] = []
+    # Streamed from a server-side cursor, already ordered and past the checkpoint
+    for product in iter_products(user_id=user_id, after_id=after_id):
+        pid = int(product["product_id"])
+        docs = build_documents(product, user_id, text_splitter)
+        texts.extend(d.page_content for d in docs)
+        metadatas.extend(d.metadata for d in docs)
+        entries.append((pid, content_hash(product_text(product)), len(docs)))
+        if len(texts) >= batch_size:
+            yield texts, metadatas, entries, pid
+            texts, metadatas, entries = [], [], []
+    if entries:
+        yield texts, metadatas, entries, entries[-1][0]
+
+
+def bulk_embed(
+    user_id: int,
+    collection_name: str = COLLECTION_NAME,
+    batch_size: int = 256,
+    workers: int = max(1, (os.cpu_count() or 2) - 1),
+    restart: bool = False,
+) -> Dict[str, Any]:
+    """
+    Embed all of a user's products in parallel and store them in pgvector.
+
+    Returns:
+        Dict[str, Any]: Products/chunks written, elapsed seconds and chunks/sec.
+    """
+    path = checkpoint_path(collection_name, user_id)
+    state = None if restart else read_checkpoint(path)
+    if state:
+        logger.info(
+            "Resuming after product_id=%s (%s chunks already stored)",
+            state["last_product_id"],
+            state["chunks"],
+        )
+    else:
+        state = {"last_product_id": 0, "products": 0, "chunks": 0}
+
+    vector_store = get_vector_store(collection_name)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    start = time.perf_counter()
+    run_chunks = 0
+    # Bounded window of in-flight batches keeps memory flat and preserves order
+    pending: Deque[Tuple[Future, Batch]] = deque()
+
+    def flush_one() -> None:
+        nonlocal run_chunks
+        future, (texts, metadatas, entries, last_id) = pending.popleft()
+        vectors = future.result()
+        # Remove chunks a crashed run may have written for this batch
+        delete_chunks(collection_name, user_id, product_ids=[e[0] for e in entries])
+        vector_store.add_embeddings(texts=texts, embeddings=vectors, metadatas=metadatas)
+        upsert_entries(collection_name, user_id, entries)
+
+        run_chunks += len(texts)
+        state["last_product_id"] = last_id
+        state["products"] += len(entries)
+        state["chunks"] += len(texts)
+        write_checkpoint(path, state)
+        elapsed = time.perf_counter() - start
+        logger.info(
+            "Stored %d chunks (through product_id=%s) - %.1f chunks/sec",
+            state["chunks"],
+            last_id,
+            run_chunks / elapsed if elapsed else 0.0,
+        )
+
+    ctx = multiprocessing.get_context("spawn")  # torch is not fork-safe
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(threads,),
+    ) as pool:
+        for batch in iter_batches(user_id, state["last_product_id"], batch_size):
+            pending.append((pool.submit(_embed_texts, batch[0]), batch))
+            if len(pending) >= workers * 2:
+                flush_one()
+        while pending:
+            flush_one()
+
+    elapsed = time.perf_counter() - start
+    report = {
+        "products": state["products"],
+        "chunks": state["chunks"],
+        "seconds": round(elapsed, 2),
+        "chunks_per_sec": round(run_chunks / elapsed, 1) if elapsed else 0.0,
+    }
+    # Finished: the next run starts from scratch
+    if os.path.exists(path):
+        os.remove(path)
+    logger.info("Bulk embedding finished for user_id=%s: %s", user_id, report)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user_id", type=int, required=True, help="Owner of the products")
+    parser.add_argument("--collection", type=str, default=COLLECTION_NAME)
+    parser.add_argument("--batch-size", type=int, default=256, help="Chunks per batch")
+    parser.add_argument(
+        "--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1)
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore any saved checkpoint"
+    )
+    args = parser.parse_args()
+
+    print(
+        bulk_embed(
+            user_id=args.user_id,
+            collection_name=args.collection,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            restart=args.restart,
+        )
+    )
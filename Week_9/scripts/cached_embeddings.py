@@ -0,0 +1,221 @@
+# scripts/cached_embeddings.py
+"""
+Embeddings with a two-level cache keyed by (model, SHA-256 of the text):
+a per-process LRU in front of the Postgres `embedding_cache` table.
+
+Unchanged product descriptions and re-uploaded chunks are served from the cache
+instead of running the model again; repeated questions are served from the LRU only,
+so free-form query text never reaches the table. Stored rows older than
+EMBEDDING_CACHE_MAX_AGE_DAYS are removed by `sweep_stale()`. Use `get_embeddings()`
+wherever an embeddings object is needed.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from scripts.constants import (
+    EMBEDDING_MODEL,
+    EMBEDDING_CACHE_MAX_AGE_DAYS,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_PERSIST,
+)
+from scripts.embedding_model import get_embedding_model
+from scripts.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Rows per lookup / insert statement
+BATCH_SIZE = 500
+# Embeddings of a given text never change for a model; only evict by size
+MEMORY_TTL_SECONDS = 7 * 24 * 3600
+
+_embeddings: Optional["CachedEmbeddings"] = None
+_lock = threading.Lock()
+
+
+def text_hash(text_: str) -> str:
+    """SHA-256 of the exact text that is embedded."""
+    return hashlib.sha256(text_.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an Embeddings model with an in-memory LRU and an optional Postgres store.
+
+    Query and document embeddings are cached under separate keys, since some
+    models embed queries differently from documents. Only document embeddings
+    are persisted: every distinct question would otherwise add a row. The model
+    is obtained from `loader` only when a text misses the cache.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Embeddings],
+        model_name: str,
+        maxsize: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        persist: bool = EMBEDDING_CACHE_PERSIST,
+    ) -> None:
+        self.loader = loader
+        self.model_name = model_name
+        self.persist = persist
+        self.memory = LRUCache(maxsize=maxsize, ttl_seconds=MEMORY_TTL_SECONDS)
+
+    @property
+    def inner(self) -> Embeddings:
+        """The wrapped model, loaded on first access."""
+        return self.loader()
+
+    # ---------------- Persistent tier ----------------
+    def _load(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """Fetch stored embeddings for `hashes`; an unavailable store is a miss."""
+        from scripts.vector_store import get_engine
+
+        found: Dict[str, List[float]] = {}
+        try:
+            with get_engine().connect() as conn:
+                for start in range(0, len(hashes), BATCH_SIZE):
+                    rows = conn.execute(
+                        text(
+                            "SELECT text_hash, embedding::text AS embedding "
+                            "FROM embedding_cache "
+                            "WHERE model = :model AND text_hash = ANY(:hashes)"
+                        ),
+                        {"model": model, "hashes": hashes[start : start + BATCH_SIZE]},
+                    )
+                    for row in rows:
+                        found[row.text_hash] = json.loads(row.embedding)
+        except SQLAlchemyError as e:
+            logger.warning(f"[EMBED CACHE] lookup failed: {e}")
+        return found
+
+    def _store(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """Persist new embeddings; failures only cost a future recomputation."""
+        from scripts.vector_store import get_engine
+
+        params = [
+            {"model": model, "text_hash": h, "embedding": json.dumps(v)}
+            for h, v in vectors.items()
+        ]
+        try:
+            with get_engine().begin() as conn:
+                for start in range(0, len(params), BATCH_SIZE):
+                    conn.execute(
+                        text(
+                            """
+                            INSERT INTO embedding_cache (model, text_hash, embedding, created_at)
+                            VALUES (:model, :text_hash, CAST(:embedding AS vector),
+                                    (now() AT TIME ZONE 'utc'))
+                            ON CONFLICT (model, text_hash) DO NOTHING
+                            """
+                        ),
+                        params[start : start + BATCH_SIZE],
+                    )
+        except SQLAlchemyError as e:
+            logger.warning(f"[EMBED CACHE] store failed: {e}")
+
+    # ---------------- Lookup ----------------
+    def _embed(self, texts: List[str], query: bool) -> List[List[float]]:
+        model = f"{self.model_name}#query" if query else self.model_name
+        hashes = [text_hash(t) for t in texts]
+        vectors: Dict[str, List[float]] = {}
+
+        for h in set(hashes):
+            cached = self.memory.get((model, h))
+            if cached is not None:
+                vectors[h] = cached
+
+        missing = [h for h in dict.fromkeys(hashes) if h not in vectors]
+        persist = self.persist and not query
+        if missing and persist:
+            stored = self._load(model, missing)
+            for h, v in stored.items():
+                self.memory.set((model, h), v)
+            vectors.update(stored)
+            missing = [h for h in missing if h not in stored]
+
+        if missing:
+            texts_by_hash = dict(zip(hashes, texts))
+            to_embed = [texts_by_hash[h] for h in missing]
+            if query:
+                computed = [self.inner.embed_query(to_embed[0])]
+            else:
+                computed = self.inner.embed_documents(to_embed)
+            fresh = dict(zip(missing, computed))
+            for h, v in fresh.items():
+                self.memory.set((model, h), v)
+            if persist:
+                self._store(model, fresh)
+            vectors.update(fresh)
+
+        logger.debug(
+            f"[EMBED CACHE] {len(texts)} texts, {len(missing)} embedded by the model"
+        )
+        return [vectors[h] for h in hashes]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, computing only texts not found in either cache tier."""
+        if not texts:
+            return []
+        return self._embed(texts, query=False)
+
+    def embed_query(self, text_: str) -> List[float]:
+        """Embed a query, served from this process's LRU when it was asked before."""
+        return self._embed([text_], query=True)[0]
+
+    def stats(self) -> Dict[str, int]:
+        """This process's in-memory hit/miss counters."""
+        return self.memory.stats()
+
+
+def sweep_stale(
+    max_age_days: int = EMBEDDING_CACHE_MAX_AGE_DAYS, batch_size: int = 1000
+) -> int:
+    """
+    Delete embedding_cache rows stored more than `max_age_days` ago, in batches.
+
+    Rows of deleted products and documents are never read again; anything still
+    in use is simply re-embedded and stored on its next miss.
+
+    Returns:
+        int: Number of rows removed.
+    """
+    from scripts.vector_store import get_engine
+
+    total = 0
+    while True:
+        with get_engine().begin() as conn:
+            deleted = conn.execute(
+                text(
+                    """
+                    DELETE FROM embedding_cache
+                    WHERE (model, text_hash) IN (
+                        SELECT model, text_hash FROM embedding_cache
+                        WHERE created_at < (now() AT TIME ZONE 'utc') - make_interval(days => :days)
+                        LIMIT :batch_size
+                    )
+                    """
+                ),
+                {"days": max_age_days, "batch_size": batch_size},
+            ).rowcount
+        total += deleted
+        if deleted < batch_size:
+            break
+    logger.info(f"[EMBED CACHE] Removed {total} stale entries")
+    return total
+
+
+def get_embeddings() -> CachedEmbeddings:
+    """Process-wide cached embeddings for EMBEDDING_MODEL."""
+    global _embeddings
+    if _embeddings is None:
+        with _lock:
+            if _embeddings is None:
+                _embeddings = CachedEmbeddings(get_embedding_model, EMBEDDING_MODEL)
+    return _embeddings
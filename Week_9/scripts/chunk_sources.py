@@ -0,0 +1,180 @@
+# scripts/chunk_sources.py
+"""
+Content-addressed document chunks.
+
+Every uploaded chunk carries `chunk_hash` (SHA-256 of its text) in its metadata and
+is embedded once per (collection, user). The `document_chunk_sources` table links
+each hash to every source file that contains it, so re-uploads only embed chunks
+that are new and a chunk is deleted once no source references it any more.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+from typing import Iterable, Set
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from sqlalchemy import text
+
+from scripts.vector_store import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Hashes per statement
+BATCH_SIZE = 1000
+
+
+def chunk_hash(text_: str) -> str:
+    """SHA-256 of a chunk's exact text."""
+    return hashlib.sha256(text_.encode("utf-8")).hexdigest()
+
+
+def existing_hashes(collection: str, user_id: int, hashes: Iterable[str]) -> Set[str]:
+    """Return the subset of `hashes` already embedded for a user in a collection."""
+    hashes = list(set(hashes))
+    found: Set[str] = set()
+    if not hashes:
+        return found
+    with get_engine().connect() as conn:
+        for start in range(0, len(hashes), BATCH_SIZE):
+            rows = conn.execute(
+                text(
+                    """
+                    SELECT DISTINCT e.cmetadata->>'chunk_hash' AS chunk_hash
+                    FROM langchain_pg_embedding e
+                    JOIN langchain_pg_collection c ON e.collection_id = c.uuid
+                    WHERE c.name = :collection
+                      AND e.cmetadata->>'user_id' = :user_id
+                      AND e.cmetadata->>'chunk_hash' = ANY(:hashes)
+                    """
+                ),
+                {
+                    "collection": collection,
+                    "user_id": str(user_id),
+                    "hashes": hashes[start : start + BATCH_SIZE],
+                },
+            )
+            found.update(row.chunk_hash for row in rows)
+    return found
+
+
+def link_source(collection: str, user_id: int, source: str, hashes: Iterable[str]) -> None:
+    """Record that `source` contains the given chunks (idempotent)."""
+    params = [
+        {"collection": collection, "user_id": user_id, "source": source, "chunk_hash": h}
+        for h in set(hashes)
+    ]
+    if not params:
+        return
+    with get_engine().begin() as conn:
+        for start in range(0, len(params), BATCH_SIZE):
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO document_chunk_sources
+                        (collection, user_id, source, chunk_hash, created_at)
+                    VALUES
+                        (:collection, :user_id, :source, :chunk_hash,
+                         (now() AT TIME ZONE 'utc'))
+                    ON CONFLICT DO NOTHING
+                    """
+                ),
+                params[start : start + BATCH_SIZE],
+            )
+
+
+def source_hashes(collection: str, user_id: int, source: str) -> Set[str]:
+    """Hashes of the chunks currently linked to a source."""
+    with get_engine().connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT chunk_hash FROM document_chunk_sources "
+                "WHERE collection = :collection AND user_id = :user_id AND source = :source"
+            ),
+            {"collection": collection, "user_id": user_id, "source": source},
+        )
+        return {row.chunk_hash for row in rows}
+
+
+def unlink_source(
+    collection: str, user_id: int, source: str, hashes: Iterable[str]
+) -> int:
+    """
+    Remove links from `source` to the given chunks and delete chunks that are
+    no longer referenced by any source.
+
+    Returns:
+        int: Number of chunks deleted from the vector store.
+    """
+    hashes = list(set(hashes))
+    if not hashes:
+        return 0
+    deleted = 0
+    with get_engine().begin() as conn:
+        for start in range(0, len(hashes), BATCH_SIZE):
+            params = {
+                "collection": collection,
+                "user_id": user_id,
+                "source": source,
+                "hashes": hashes[start : start + BATCH_SIZE],
+            }
+            conn.execute(
+                text(
+                    "DELETE FROM document_chunk_sources "
+                    "WHERE collection = :collection AND user_id = :user_id "
+                    "AND source = :source AND chunk_hash = ANY(:hashes)"
+                ),
+                params,
+            )
+            result = conn.execute(
+                text(
+                    """
+                    DELETE FROM langchain_pg_embedding e
+                    USING langchain_pg_collection c
+                    WHERE e.collection_id = c.uuid
+                      AND c.name = :collection
+                      AND e.cmetadata->>'user_id' = CAST(:user_id AS TEXT)
+                      AND e.cmetadata->>'chunk_hash' = ANY(:hashes)
+                      AND NOT EXISTS (
+                          SELECT 1 FROM document_chunk_sources s
+                          WHERE s.collection = :collection
+                            AND s.user_id = :user_id
+                            AND s.chunk_hash = e.cmetadata->>'chunk_hash'
+                      )
+                    """
+                ),
+                params,
+            )
+            deleted += result.rowcount
+    logger.info(
+        "Unlinked %d chunks from '%s' for user_id=%s (%d deleted)",
+        len(hashes),
+        source,
+        user_id,
+        deleted,
+    )
+    return deleted
+
+
+def delete_unhashed_chunks(collection: str, user_id: int, source: str) -> int:
+    """Delete a source's chunks stored before chunk hashing existed."""
+    with get_engine().begin() as conn:
+        result = conn.execute(
+            text(
+                """
+                DELETE FROM langchain_pg_embedding e
+                USING langchain_pg_collection c
+                WHERE e.collection_id = c.uuid
+                  AND c.name = :collection
+                  AND e.cmetadata->>'user_id' = :user_id
+                  AND e.cmetadata->>'source' = :source
+                  AND e.cmetadata->>'chunk_hash' IS NULL
+                """
+            ),
+            {"collection": collection, "user_id": str(user_id), "source": source},
+        )
+        return result.rowcount
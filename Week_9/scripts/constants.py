@@ -12,24 +12,83 @@ load_dotenv(os.path.join(BASE_DIR, ".env"))
 # ---------------- Database ----------------
 DATABASE_URL_WEEK8 = os.getenv("DATABASE_URL_WEEK8")
 
+# Shared connection pool used by every PGVector store in a worker
+VECTOR_POOL_SIZE = int(os.getenv("VECTOR_POOL_SIZE", 5))
+VECTOR_MAX_OVERFLOW = int(os.getenv("VECTOR_MAX_OVERFLOW", 10))
+VECTOR_POOL_TIMEOUT = int(os.getenv("VECTOR_POOL_TIMEOUT", 30))
+VECTOR_POOL_RECYCLE = int(os.getenv("VECTOR_POOL_RECYCLE", 1800))
+
 # ---------------- Models ----------------
 # Default models
-EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # HuggingFace model
+EMBEDDING_MODEL = os.getenv(
+    "EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+)  # HuggingFace model
+# Output size of known embedding models; EMBEDDING_DIM must match the vector columns
+EMBEDDING_DIMENSIONS = {
+    "sentence-transformers/all-MiniLM-L6-v2": 384,
+    "sentence-transformers/all-MiniLM-L12-v2": 384,
+    "sentence-transformers/all-mpnet-base-v2": 768,
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+}
+EMBEDDING_DIM = int(
+    os.getenv("EMBEDDING_DIM") or EMBEDDING_DIMENSIONS.get(EMBEDDING_MODEL, 0)
+)
+if not EMBEDDING_DIM:
+    raise RuntimeError(
+        f"Unknown dimension for EMBEDDING_MODEL={EMBEDDING_MODEL}; set EMBEDDING_DIM"
+    )
 CHAT_MODEL_OPENAI = "gpt-4o-mini"
 CHAT_MODEL_OLLAMA = "llama3"
 CHAT_TEMPERATURE = 0.0
 
 # Cost estimation (tokens → USD) for reference
 TOKEN_COST_PER_1K = 0.002
+MODEL_COST_PER_1K = {
+    CHAT_MODEL_OPENAI: TOKEN_COST_PER_1K,
+    CHAT_MODEL_OLLAMA: 0.0,  # local model
+}
 
 # Database tables
 PRODUCT_TABLE = "products"
 
+# Vector store collections
+COLLECTION_NAME = "product_embedding_hf"
+
+# Retrieval config
+RETRIEVAL_K = 3
+RETRIEVAL_SCORE_THRESHOLD = 0.30
+
+# Approximate nearest neighbour (pgvector) index config
+HNSW_M = int(os.getenv("HNSW_M", 16))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", 64))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", 40))  # Recall vs latency at query time
+IVFFLAT_LISTS = int(os.getenv("IVFFLAT_LISTS", 100))
+IVFFLAT_PROBES = int(os.getenv("IVFFLAT_PROBES", 10))
+# Compact ANN index: "" (full-precision vector), "halfvec" (16-bit, 2x smaller) or
+# "binary" (1 bit per dimension, 32x smaller). Candidates from the compact index are
+# re-ranked on the full-precision vectors.
+VECTOR_COMPACT_MODE = os.getenv("VECTOR_COMPACT_MODE", "")
+VECTOR_RERANK_FACTOR = int(os.getenv("VECTOR_RERANK_FACTOR", 4))  # candidates = k * factor
+# Keep scanning the graph until filtered (per-tenant) results fill k; needs pgvector
+# >= 0.8. "" disables it (older pgvector), which lets small tenants get < k results.
+HNSW_ITERATIVE_SCAN = os.getenv("HNSW_ITERATIVE_SCAN", "relaxed_order")  # or "strict_order"
+
+# LLM answer cache
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 1024))  # per worker
+# Memory-tier entries are kept briefly: other processes invalidate only the DB rows
+LLM_CACHE_MEMORY_TTL_SECONDS = int(os.getenv("LLM_CACHE_MEMORY_TTL_SECONDS", 30))
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.92))  # cosine similarity
+
+# Embedding cache (per-process LRU + Postgres `embedding_cache` table)
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 10000))
+EMBEDDING_CACHE_PERSIST = os.getenv("EMBEDDING_CACHE_PERSIST", "true").lower() == "true"
+EMBEDDING_CACHE_MAX_AGE_DAYS = int(os.getenv("EMBEDDING_CACHE_MAX_AGE_DAYS", 30))
+
 # Text splitting config
 CHUNK_SIZE = 500
 CHUNK_OVERLAP = 50
 
-# ---------------- Embeddings ----------------
-from langchain_community.embeddings import HuggingFaceEmbeddings
-
-HF_EMBEDDINGS = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+# The embedding model itself is loaded lazily: see scripts/embedding_model.py
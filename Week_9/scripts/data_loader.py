@@ -2,13 +2,28 @@
 """
 Load product data from the database.
 Supports multi-tenancy by filtering products per user_id.
+
+Products are streamed from a named (server-side) cursor on a pooled connection
+and yielded in batches, so a full-catalog load runs in constant memory.
 """
 
 import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
 import psycopg2
-from typing import List, Dict
+from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
-from constants import DATABASE_URL_WEEK8, PRODUCT_TABLE
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from scripts.constants import DATABASE_URL_WEEK8, PRODUCT_TABLE
 
 load_dotenv()
 
@@ -18,73 +33,150 @@ logging.basicConfig(
     datefmt="%H:%M:%S",
 )
 
+# Products per batch (also the server-side cursor's itersize)
+LOAD_BATCH_SIZE = 1000
+LOADER_POOL_MAX = int(os.getenv("PRODUCT_LOADER_POOL_MAX", 4))
+
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """Process-wide psycopg2 pool for product loads."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if not DATABASE_URL_WEEK8:
+                    raise ValueError("DATABASE_URL_WEEK8 not found in environment")
+                _pool = ThreadedConnectionPool(1, LOADER_POOL_MAX, DATABASE_URL_WEEK8)
+    return _pool
+
+
+@contextmanager
+def pooled_connection():
+    """Borrow a pooled connection; the transaction is ended before it is returned."""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def describe_product(row: tuple) -> Dict[str, str]:
+    """Turn a product row into the {product_id, name, description} dict that is embedded."""
+    (
+        product_id,
+        name,
+        ptype,
+        price,
+        quantity,
+        expiry_date,
+        warranty_period,
+        author,
+        pages,
+    ) = row
+
+    description_parts = [f"A {ptype} product priced at {price} with quantity {quantity}."]
+    if expiry_date:
+        description_parts.append(f"It expires on {expiry_date}.")
+    if warranty_period:
+        description_parts.append(f"It has a warranty of {warranty_period}.")
+    if author:
+        description_parts.append(f"Written by {author}.")
+    if pages:
+        description_parts.append(f"Contains {pages} pages.")
+
+    return {
+        "product_id": product_id,
+        "name": name,
+        "description": " ".join(description_parts),
+    }
+
+
+def iter_product_batches(
+    user_id: Optional[int] = None,
+    batch_size: int = LOAD_BATCH_SIZE,
+    after_id: int = 0,
+    product_ids: Optional[List[int]] = None,
+) -> Iterator[List[Dict[str, str]]]:
+    """
+    Yield products in product_id order, `batch_size` at a time.
+
+    Args:
+        user_id (Optional[int]): Only this owner's products.
+        batch_size (int): Products per batch and rows per server round-trip.
+        after_id (int): Skip products with product_id <= after_id (resume point).
+        product_ids (Optional[List[int]]): Only these products.
+
+    Yields:
+        List[Dict[str, str]]: Products as {product_id, name, description}.
+    """
+    clauses = [sql.SQL("product_id > %s")]
+    params: list = [after_id]
+    if user_id is not None:
+        clauses.append(sql.SQL("owner_id = %s"))
+        params.append(user_id)
+    if product_ids is not None:
+        clauses.append(sql.SQL("product_id = ANY(%s)"))
+        params.append(list(product_ids))
+
+    query = sql.SQL(
+        """
+        SELECT product_id, name, type, price, quantity,
+               expiry_date, warranty_period, author, pages
+        FROM {table}
+        WHERE {where}
+        ORDER BY product_id
+        """
+    ).format(table=sql.Identifier(PRODUCT_TABLE), where=sql.SQL(" AND ").join(clauses))
+
+    loaded = 0
+    with pooled_connection() as conn:
+        # Named cursor: rows stay on the server and arrive `itersize` at a time
+        with conn.cursor(name="product_loader") as cur:
+            cur.itersize = batch_size
+            cur.execute(query, params)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                loaded += len(rows)
+                yield [describe_product(row) for row in rows]
+
+    logging.info("Streamed %d products from database", loaded)
+
+
+def iter_products(user_id: Optional[int] = None, **kwargs) -> Iterator[Dict[str, str]]:
+    """Yield products one at a time (see iter_product_batches)."""
+    for batch in iter_product_batches(user_id=user_id, **kwargs):
+        yield from batch
+
 
 def load_products(user_id: int = None) -> List[Dict[str, str]]:
     """
-    Load products from Postgres.
+    Load products from Postgres into a list.
     If user_id is provided, only load products belonging to that user.
+
+    Prefer iter_product_batches for large catalogs.
     """
     try:
-        logging.info("Connecting to database: %s", DATABASE_URL_WEEK8)
-        with psycopg2.connect(DATABASE_URL_WEEK8) as conn:
-            with conn.cursor() as cur:
-                query = f"""
-                    SELECT product_id, name, type, price, quantity,
-                           expiry_date, warranty_period, author, pages
-                    FROM {PRODUCT_TABLE}
-                """
-                if user_id is not None:
-                    query += f" WHERE owner_id = {user_id}"
-
-                cur.execute(query)
-                rows = cur.fetchall()
-
-        products = []
-        for row in rows:
-            (
-                product_id,
-                name,
-                ptype,
-                price,
-                quantity,
-                expiry_date,
-                warranty_period,
-                author,
-                pages,
-            ) = row
-
-            description_parts = [
-                f"A {ptype} product priced at {price} with quantity {quantity}."
-            ]
-            if expiry_date:
-                description_parts.append(f"It expires on {expiry_date}.")
-            if warranty_period:
-                description_parts.append(f"It has a warranty of {warranty_period}.")
-            if author:
-                description_parts.append(f"Written by {author}.")
-            if pages:
-                description_parts.append(f"Contains {pages} pages.")
-
-            description = " ".join(description_parts)
-
-            products.append(
-                {
-                    "product_id": product_id,
-                    "name": name,
-                    "description": description,
-                }
-            )
-
+        products = list(iter_products(user_id=user_id))
         logging.info("Loaded %d products from database", len(products))
         return products
-
-    except Exception as e:
+    except (psycopg2.Error, ValueError) as e:
         logging.error("Failed to load products: %s", str(e))
         return []
 
 
 if __name__ == "__main__":
     # Example: load products for user 17
-    products = load_products(user_id=17)
-    for p in products[:5]:
-        print(p)
+    for batch in iter_product_batches(user_id=17, batch_size=5):
+        for p in batch:
+            print(p)
+        break
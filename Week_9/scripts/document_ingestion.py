@@ -0,0 +1,201 @@
+# scripts/document_ingestion.py
+"""
+Document ingestion: chunk an uploaded text file, embed it and store the chunks
+in pgvector with tenant metadata. Used by the ingestion worker.
+
+Files are streamed: text is read and split block by block and chunks are embedded
+and inserted in batches, so memory stays flat regardless of file size. Chunks
+already stored for the user are re-linked instead of re-embedded (see
+scripts/chunk_sources.py).
+"""
+
+import codecs
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from scripts.chunk_sources import (
+    chunk_hash,
+    delete_unhashed_chunks,
+    existing_hashes,
+    link_source,
+    source_hashes,
+    unlink_source,
+)
+from scripts.constants import CHUNK_SIZE, CHUNK_OVERLAP, COLLECTION_NAME
+from scripts.vector_store import get_vector_store
+
+logger = logging.getLogger(__name__)
+
+# Chunks embedded and inserted per batch
+INGEST_BATCH_SIZE = 64
+# Bytes read from the file per block
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def iter_text_blocks(
+    path: str, block_size: int = READ_BLOCK_SIZE
+) -> Iterator[Tuple[str, int]]:
+    """
+    Yield (text, bytes read so far) per block of a UTF-8 file.
+
+    An incremental decoder keeps multi-byte characters split across blocks intact;
+    undecodable bytes are dropped.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    bytes_read = 0
+    with open(path, "rb") as f:
+        while True:
+            raw = f.read(block_size)
+            bytes_read += len(raw)
+            text = decoder.decode(raw, final=not raw)
+            if text or not raw:
+                yield text, bytes_read
+            if not raw:
+                return
+
+
+def iter_chunks(
+    blocks: Iterator[Tuple[str, int]],
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+) -> Iterator[Tuple[str, int]]:
+    """
+    Split streamed text into chunks, yielding (chunk, bytes read so far).
+
+    The buffer is split whenever a block arrives; every chunk but the last is
+    emitted, and the text from the last chunk's start (which already begins with
+    the overlap from its predecessor) is carried into the next block. Only about
+    one block plus one chunk of text is held at a time.
+    """
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap, add_start_index=True
+    )
+    buffer = ""
+    bytes_read = 0
+    for text, bytes_read in blocks:
+        buffer += text
+        if len(buffer) <= chunk_size:
+            continue
+        docs = splitter.create_documents([buffer])
+        if len(docs) < 2:
+            continue
+        for doc in docs[:-1]:
+            yield doc.page_content, bytes_read
+        buffer = buffer[docs[-1].metadata["start_index"] :]
+
+    for chunk in splitter.split_text(buffer):
+        yield chunk, bytes_read
+
+
+def ingest_file(
+    path: str,
+    user_id: int,
+    source: str,
+    collection_name: str = COLLECTION_NAME,
+    replace: bool = False,
+    on_progress: Optional[Callable[[int, int, int, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Stream a text file through chunking, embedding and storage.
+
+    Chunks are content-addressed: a chunk whose hash the user already has in the
+    collection is linked to this source instead of being embedded again. With
+    `replace`, chunks the previous upload of `source` had and this one doesn't
+    are unlinked (and deleted once no other source uses them).
+
+    Embedding of the next batch runs while the previous batch is inserted.
+
+    Args:
+        path (str): File on disk.
+        user_id (int): Owner; stored as chunk metadata for retrieval filters.
+        source (str): Original filename, stored as chunk metadata.
+        collection_name (str): PGVector collection.
+        replace (bool): Treat the file as a new version of `source`.
+        on_progress: Called with (chunks embedded, chunks reused, bytes read,
+            file size) after each batch.
+
+    Returns:
+        Dict[str, int]: Counts of chunks in the file, embedded, reused and removed.
+    """
+    total_bytes = os.path.getsize(path)
+    vector_store = get_vector_store(collection_name)
+    embeddings = vector_store.embeddings
+    previous = source_hashes(collection_name, user_id, source) if replace else set()
+    seen: Set[str] = set()
+    report = {"chunks": 0, "embedded": 0, "reused": 0, "removed": 0}
+
+    # (embedding future, texts, metadatas, bytes read) of the batch being embedded
+    Pending = Tuple[Future, List[str], List[Dict[str, Any]], int]
+
+    def flush(pending: Pending) -> None:
+        future, texts, metadatas, bytes_read = pending
+        vector_store.add_embeddings(
+            texts=texts, embeddings=future.result(), metadatas=metadatas
+        )
+        report["embedded"] += len(texts)
+        if on_progress:
+            on_progress(report["embedded"], report["reused"], bytes_read, total_bytes)
+
+    def dispatch(
+        pool: ThreadPoolExecutor, batch: List[Tuple[int, str]], bytes_read: int
+    ) -> Optional[Pending]:
+        """Link a batch to this source and start embedding its new chunks."""
+        hashes = [chunk_hash(chunk) for _, chunk in batch]
+        known = seen | existing_hashes(collection_name, user_id, hashes)
+        link_source(collection_name, user_id, source, hashes)
+
+        texts: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        for (idx, chunk), hash_ in zip(batch, hashes):
+            report["chunks"] += 1
+            if hash_ in known:
+                report["reused"] += 1
+                continue
+            known.add(hash_)
+            texts.append(chunk)
+            metadatas.append(
+                {
+                    "user_id": str(user_id),
+                    "chunk_index": idx,
+                    "chunk_hash": hash_,
+                    "source": source,
+                    "scope": "private",
+                }
+            )
+        seen.update(hashes)
+        if not texts:
+            if on_progress:
+                on_progress(report["embedded"], report["reused"], bytes_read, total_bytes)
+            return None
+        return pool.submit(embeddings.embed_documents, texts), texts, metadatas, bytes_read
+
+    batch: List[Tuple[int, str]] = []
+    in_flight: Optional[Pending] = None
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        for idx, (chunk, bytes_read) in enumerate(iter_chunks(iter_text_blocks(path))):
+            batch.append((idx, chunk))
+            if len(batch) >= INGEST_BATCH_SIZE:
+                pending = dispatch(pool, batch, bytes_read)
+                if in_flight:
+                    flush(in_flight)
+                in_flight = pending
+                batch = []
+
+        pending = dispatch(pool, batch, total_bytes) if batch else None
+        if in_flight:
+            flush(in_flight)
+        if pending:
+            flush(pending)
+
+    if replace:
+        report["removed"] = unlink_source(
+            collection_name, user_id, source, previous - seen
+        )
+        report["removed"] += delete_unhashed_chunks(collection_name, user_id, source)
+
+    logger.info("Ingested '%s' for user_id=%s: %s", source, user_id, report)
+    return report
@@ -1,123 +1,211 @@
 # scripts/embedding.py
 """
-Multi-tenant embeddings writer.
+Multi-tenant embeddings writer (incremental).
 Usage:
   python scripts/embedding.py --user_id 17 --collection product_embedding_hf
+
+Only products whose text changed since the last run are re-embedded; chunks of
+deleted products are removed. Progress is tracked in the `embedding_manifest` table.
 """
 
 import argparse
 import logging
 import os
-from typing import List, Dict
+import sys
+from typing import Dict, Iterable, List, Set, Tuple
 from dotenv import load_dotenv
 
-from langchain_community.embeddings import HuggingFaceEmbeddings
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores.pgvector import PGVector
 from langchain_core.documents import Document
 
-from data_loader import load_products  # Updated to fetch products per user
-from constants import CHUNK_SIZE, CHUNK_OVERLAP
+from scripts.data_loader import iter_products  # Streams products per user
+from scripts.constants import CHUNK_SIZE, CHUNK_OVERLAP, COLLECTION_NAME
+from scripts.vector_store import get_vector_store, delete_chunks
+from scripts.embedding_manifest import (
+    content_hash,
+    load_manifest,
+    upsert_entries,
+    delete_entries,
+)
 
 # ---------------- Setup ----------------
 load_dotenv()
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 
+# Chunks embedded and inserted per batch
+EMBED_BATCH_SIZE = 256
+
+
+def product_text(product: Dict) -> str:
+    """Text that is chunked and embedded for a product."""
+    return f"{product['name']}\n{product['description']}"
+
+
+def build_documents(
+    product: Dict, user_id: int, text_splitter: RecursiveCharacterTextSplitter
+) -> List[Document]:
+    """Split a product's text into chunks carrying tenant/product metadata."""
+    chunks = text_splitter.split_text(product_text(product))
+    return [
+        Document(
+            page_content=chunk,
+            metadata={
+                "product_id": str(product["product_id"]),
+                "chunk_index": idx,
+                "user_id": str(user_id),  # Multi-tenancy enforced
+            },
+        )
+        for idx, chunk in enumerate(chunks)
+    ]
+
 
 def embed_and_store(
-    products: List[Dict],
+    products: Iterable[Dict],
     collection_name: str,
     user_id: int,
-) -> PGVector:
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> Dict[str, int]:
     """
-    Embeds products for a specific user_id and stores them in a PGVector collection.
-    Skips already embedded products for that user.
-    """
-    db_url = os.getenv("DATABASE_URL_WEEK8")
-    if not db_url:
-        raise ValueError("DATABASE_URL_WEEK8 not found in environment")
+    Sync a user's product embeddings with their current products.
 
-    logger.info("Using database: %s", db_url)
+    New or changed products (by content hash) are re-embedded, chunks of products
+    that no longer exist are deleted, unchanged products are skipped. `products`
+    may be a generator (see data_loader.iter_products): they are consumed once and
+    written in batches of about `batch_size` chunks, so only the manifest is held
+    in memory.
 
-    # Initialize embeddings and vector store
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
-    vector_store = PGVector(
-        collection_name=collection_name,
-        connection_string=db_url,
-        embedding_function=embeddings,
+    Returns:
+        Dict[str, int]: Counts of new, changed, unchanged and removed products and
+        of chunks written.
+    """
+    vector_store = get_vector_store(collection_name)
+    manifest = load_manifest(collection_name, user_id)
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
     )
 
-    # Fetch existing embeddings for this user
-    try:
-        existing_docs = vector_store.similarity_search(
-            query="placeholder",
-            k=1000,
-            filter={"user_id": str(user_id)},  # Ensure string match
+    report = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0, "chunks": 0}
+    seen: Set[int] = set()
+    documents: List[Document] = []
+    manifest_entries: List[Tuple[int, str, int]] = []
+
+    def flush() -> None:
+        # Drop stale chunks (changed products, and any chunks of "new" products
+        # written before the manifest existed), then store and record the batch
+        stale_ids = [pid for pid, _, _ in manifest_entries]
+        deleted = delete_chunks(collection_name, user_id, product_ids=stale_ids)
+        try:
+            if documents:
+                vector_store.add_documents(documents)
+            upsert_entries(collection_name, user_id, manifest_entries)
+        except Exception as e:
+            logger.error("Failed to store documents: %s", e)
+            raise
+        logger.info(
+            "Stored %d chunks for %d products in '%s' (%d stale chunks deleted)",
+            len(documents),
+            len(manifest_entries),
+            collection_name,
+            deleted,
         )
-    except Exception as e:
-        logger.warning("Could not fetch existing docs for user_id=%s: %s", user_id, e)
-        existing_docs = []
-
-    existing_product_ids = {
-        str(d.metadata.get("product_id")) for d in existing_docs if d.metadata
-    }
-    logger.info(
-        "Found %d existing product_ids for user_id=%s",
-        len(existing_product_ids),
-        user_id,
-    )
+        report["chunks"] += len(documents)
+        documents.clear()
+        manifest_entries.clear()
+
+    for product in products:
+        pid = int(product["product_id"])
+        seen.add(pid)
+        hash_ = content_hash(product_text(product))
+        if pid not in manifest:
+            report["new"] += 1
+        elif manifest[pid] != hash_:
+            report["changed"] += 1
+        else:
+            report["unchanged"] += 1
+            continue
+
+        product_docs = build_documents(product, user_id, text_splitter)
+        documents.extend(product_docs)
+        manifest_entries.append((pid, hash_, len(product_docs)))
+        if len(documents) >= batch_size:
+            flush()
+
+    if manifest_entries:
+        flush()
+
+    # An empty product list usually means the load failed; never wipe on that
+    removed_ids = [pid for pid in manifest if pid not in seen] if seen else []
+    if removed_ids:
+        deleted = delete_chunks(collection_name, user_id, product_ids=removed_ids)
+        delete_entries(collection_name, user_id, removed_ids)
+        logger.info(
+            "Deleted %d chunks of %d removed products for user_id=%s",
+            deleted,
+            len(removed_ids),
+            user_id,
+        )
+    report["removed"] = len(removed_ids)
 
-    # Filter products not yet embedded
-    new_products = [
-        p for p in products if str(p["product_id"]) not in existing_product_ids
-    ]
-    if not new_products:
-        logger.info("No new products to embed for user_id=%s", user_id)
-        return vector_store
+    if not report["new"] and not report["changed"]:
+        logger.info("No new or changed products to embed for user_id=%s", user_id)
+    logger.info("Sync report for user_id=%s: %s", user_id, report)
+    return report
+
+
+def sync_products(
+    product_ids: List[int], collection_name: str, user_id: int
+) -> Dict[str, int]:
+    """
+    Re-embed or delete just the given products of a user (change-data capture).
 
-    logger.info("Found %d new products to embed", len(new_products))
+    Products that still exist under `user_id` are re-embedded when their text
+    changed; the others have their chunks and manifest entries removed.
 
-    # Split text into chunks and create Document objects
+    Returns:
+        Dict[str, int]: Counts of re-embedded, unchanged and removed products and
+        of chunks written.
+    """
+    ids = sorted({int(pid) for pid in product_ids})
+    vector_store = get_vector_store(collection_name)
+    manifest = load_manifest(collection_name, user_id, product_ids=ids)
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
     )
-    documents = []
-    for product in new_products:
-        content = f"{product['name']}\n{product['description']}"
-        chunks = text_splitter.split_text(content)
-        for idx, chunk in enumerate(chunks):
-            documents.append(
-                Document(
-                    page_content=chunk,
-                    metadata={
-                        "product_id": str(product["product_id"]),
-                        "chunk_index": idx,
-                        "user_id": str(user_id),  # Multi-tenancy enforced
-                    },
-                )
-            )
-
-    logger.info(
-        "Preparing %d document chunks for user_id=%s into collection '%s'",
-        len(documents),
-        user_id,
-        collection_name,
-    )
 
-    # Store embeddings
-    try:
+    report = {"embedded": 0, "unchanged": 0, "removed": 0, "chunks": 0}
+    found: Set[int] = set()
+    documents: List[Document] = []
+    manifest_entries: List[Tuple[int, str, int]] = []
+    for product in iter_products(user_id=user_id, product_ids=ids):
+        pid = int(product["product_id"])
+        found.add(pid)
+        hash_ = content_hash(product_text(product))
+        if manifest.get(pid) == hash_:
+            report["unchanged"] += 1
+            continue
+        product_docs = build_documents(product, user_id, text_splitter)
+        documents.extend(product_docs)
+        manifest_entries.append((pid, hash_, len(product_docs)))
+
+    changed_ids = [pid for pid, _, _ in manifest_entries]
+    removed_ids = [pid for pid in ids if pid not in found]
+    if changed_ids or removed_ids:
+        delete_chunks(collection_name, user_id, product_ids=changed_ids + removed_ids)
+    delete_entries(collection_name, user_id, removed_ids)
+    if documents:
         vector_store.add_documents(documents)
-        logger.info(
-            "Successfully stored %d chunks in '%s'", len(documents), collection_name
-        )
-    except Exception as e:
-        logger.error("Failed to store documents: %s", e)
-        raise
+    upsert_entries(collection_name, user_id, manifest_entries)
 
-    return vector_store
+    report["embedded"] = len(manifest_entries)
+    report["removed"] = len(removed_ids)
+    report["chunks"] = len(documents)
+    logger.info("Synced products for user_id=%s: %s", user_id, report)
+    return report
 
 
 if __name__ == "__main__":
@@ -126,16 +214,17 @@ if __name__ == "__main__":
         "--user_id", type=int, required=True, help="User ID for multi-tenant embeddings"
     )
     parser.add_argument(
-        "--collection", type=str, default="product_embedding_hf", help="Collection name"
+        "--collection", type=str, default=COLLECTION_NAME, help="Collection name"
     )
     args = parser.parse_args()
 
-    logger.info("Loading products for embedding...")
-    products = load_products(
-        user_id=args.user_id
-    )  # Pass user_id to fetch only user's products
-
-    if not products:
-        logger.warning("No products found to embed. Exiting.")
-    else:
-        embed_and_store(products, collection_name=args.collection, user_id=args.user_id)
+    logger.info("Streaming products for embedding...")
+    # Products are read from a server-side cursor and embedded batch by batch
+    report = embed_and_store(
+        iter_products(user_id=args.user_id),
+        collection_name=args.collection,
+        user_id=args.user_id,
+    )
+    if not any(report[key] for key in ("new", "changed", "unchanged")):
+        logger.warning("No products found to embed.")
+    print(report)
@@ -0,0 +1,106 @@
+# scripts/embedding_manifest.py
+"""
+Embedding manifest: content hash of every embedded product, keyed by
+(collection, user_id, product_id), stored in the `embedding_manifest` table.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from sqlalchemy import text
+
+from scripts.vector_store import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Rows per statement when writing or deleting manifest entries
+BATCH_SIZE = 1000
+
+
+def content_hash(text_: str) -> str:
+    """SHA-256 of the exact text that gets chunked and embedded."""
+    return hashlib.sha256(text_.encode("utf-8")).hexdigest()
+
+
+def load_manifest(
+    collection: str, user_id: int, product_ids: Optional[List[int]] = None
+) -> Dict[int, str]:
+    """Return {product_id: content_hash} for a user's (or just these) embedded products."""
+    query = (
+        "SELECT product_id, content_hash FROM embedding_manifest "
+        "WHERE collection = :collection AND user_id = :user_id"
+    )
+    params = {"collection": collection, "user_id": user_id}
+    if product_ids is not None:
+        query += " AND product_id = ANY(:product_ids)"
+        params["product_ids"] = list(product_ids)
+    with get_engine().connect() as conn:
+        rows = conn.execute(text(query), params)
+        return {row.product_id: row.content_hash for row in rows}
+
+
+def upsert_entries(
+    collection: str, user_id: int, entries: Iterable[Tuple[int, str, int]]
+) -> None:
+    """
+    Insert or update manifest rows.
+
+    Args:
+        entries: (product_id, content_hash, chunk_count) tuples.
+    """
+    params = [
+        {
+            "collection": collection,
+            "user_id": user_id,
+            "product_id": product_id,
+            "content_hash": hash_,
+            "chunk_count": chunk_count,
+        }
+        for product_id, hash_, chunk_count in entries
+    ]
+    if not params:
+        return
+    with get_engine().begin() as conn:
+        for start in range(0, len(params), BATCH_SIZE):
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO embedding_manifest
+                        (collection, user_id, product_id, content_hash, chunk_count, updated_at)
+                    VALUES
+                        (:collection, :user_id, :product_id, :content_hash, :chunk_count,
+                         (now() AT TIME ZONE 'utc'))
+                    ON CONFLICT (collection, user_id, product_id) DO UPDATE
+                    SET content_hash = EXCLUDED.content_hash,
+                        chunk_count = EXCLUDED.chunk_count,
+                        updated_at = EXCLUDED.updated_at
+                    """
+                ),
+                params[start : start + BATCH_SIZE],
+            )
+
+
+def delete_entries(collection: str, user_id: int, product_ids: List[int]) -> None:
+    """Remove manifest rows for products that no longer exist."""
+    if not product_ids:
+        return
+    with get_engine().begin() as conn:
+        for start in range(0, len(product_ids), BATCH_SIZE):
+            conn.execute(
+                text(
+                    "DELETE FROM embedding_manifest WHERE collection = :collection "
+                    "AND user_id = :user_id AND product_id = ANY(:product_ids)"
+                ),
+                {
+                    "collection": collection,
+                    "user_id": user_id,
+                    "product_ids": list(product_ids[start : start + BATCH_SIZE]),
+                },
+            )
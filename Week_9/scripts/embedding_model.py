@@ -0,0 +1,94 @@
+# scripts/embedding_model.py
+"""
+Lazy, process-wide sentence-transformers model (EMBEDDING_MODEL).
+
+Importing this module (or scripts.constants, api, migrations) does not load torch;
+the model is loaded on the first `get_embedding_model()` call and shared by every
+caller in the process. `warmup()` loads it eagerly, e.g. in a gunicorn master with
+`preload_app` so forked workers share the model's memory pages copy-on-write.
+"""
+
+import logging
+import os
+import resource
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from scripts.constants import EMBEDDING_DIM, EMBEDDING_MODEL
+
+logger = logging.getLogger(__name__)
+
+_model: Optional[Any] = None
+_report: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def _max_rss_mb() -> float:
+    """Peak resident memory of this process in MB (Linux reports KB)."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def get_embedding_model():
+    """
+    Return the shared HuggingFaceEmbeddings instance, loading it on first use.
+
+    Raises:
+        RuntimeError: If the model's output size differs from EMBEDDING_DIM.
+    """
+    global _model
+    if _model is not None:
+        return _model
+
+    with _lock:
+        if _model is None:
+            rss_before = _max_rss_mb()
+            start = time.perf_counter()
+            from langchain_community.embeddings import HuggingFaceEmbeddings
+
+            model = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+            elapsed = time.perf_counter() - start
+
+            # Read from the model config; running inference before a fork is unsafe
+            client = getattr(model, "client", None)
+            dimension = (
+                client.get_sentence_embedding_dimension() if client is not None else None
+            )
+            if dimension and dimension != EMBEDDING_DIM:
+                raise RuntimeError(
+                    f"{EMBEDDING_MODEL} produces {dimension}-dim vectors but "
+                    f"EMBEDDING_DIM={EMBEDDING_DIM}"
+                )
+
+            _report.update(
+                {
+                    "model": EMBEDDING_MODEL,
+                    "dimension": dimension or EMBEDDING_DIM,
+                    "load_seconds": round(elapsed, 2),
+                    "max_rss_mb_before": rss_before,
+                    "max_rss_mb_after": _max_rss_mb(),
+                    "pid": os.getpid(),
+                }
+            )
+            logger.info(
+                f"[MODEL LOAD] {EMBEDDING_MODEL} in {elapsed:.2f}s "
+                f"(peak RSS {rss_before} -> {_report['max_rss_mb_after']} MB, pid {os.getpid()})"
+            )
+            _model = model
+    return _model
+
+
+def is_loaded() -> bool:
+    """Whether this process (or the process it was forked from) loaded the model."""
+    return _model is not None
+
+
+def load_report() -> Dict[str, Any]:
+    """Model load time and memory, or {"loaded": False} if not loaded yet."""
+    return {"loaded": True, **_report} if _model is not None else {"loaded": False}
+
+
+def warmup() -> Dict[str, Any]:
+    """Load the model now instead of on the first request."""
+    get_embedding_model()
+    return load_report()
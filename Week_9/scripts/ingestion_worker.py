@@ -0,0 +1,123 @@
+# scripts/ingestion_worker.py
+"""
+Background worker for queued document uploads (`ingestion_jobs` table).
+
+Usage:
+  flask --app api.app ingestion worker             # run until stopped
+  flask --app api.app ingestion worker --once      # drain the queue and exit
+
+Several workers can run side by side: jobs are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED, so each job is processed by exactly one of them.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_, and_
+
+from api.db import db
+from api.models import IngestionJob
+from scripts.document_ingestion import ingest_file
+from scripts.llm_cache import SQLAlchemyCache
+
+logger = logging.getLogger(__name__)
+
+# A running job whose progress hasn't moved for this long is assumed orphaned
+# (its worker died) and is claimed again
+STALE_JOB_SECONDS = int(os.getenv("INGESTION_STALE_JOB_SECONDS", "900"))
+
+
+def claim_next_job() -> Optional[IngestionJob]:
+    """Lock the oldest queued (or orphaned) job, mark it running and return it."""
+    stale_before = datetime.utcnow() - timedelta(seconds=STALE_JOB_SECONDS)
+    job = (
+        IngestionJob.query.filter(
+            or_(
+                IngestionJob.status == "queued",
+                and_(
+                    IngestionJob.status == "running",
+                    IngestionJob.updated_at < stale_before,
+                ),
+            )
+        )
+        .order_by(IngestionJob.id)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if job is None:
+        db.session.rollback()
+        return None
+    now = datetime.utcnow()
+    job.status = "running"
+    job.started_at = now
+    job.updated_at = now
+    job.embedded_chunks = 0
+    job.reused_chunks = 0
+    job.processed_bytes = 0
+    job.error = None
+    db.session.commit()
+    return job
+
+
+def process_job(job: IngestionJob) -> None:
+    """Ingest a claimed job's file, recording progress and the outcome on the job."""
+
+    def on_progress(embedded: int, reused: int, bytes_read: int, total_bytes: int) -> None:
+        job.embedded_chunks = embedded
+        job.reused_chunks = reused
+        job.processed_bytes = bytes_read
+        job.total_bytes = total_bytes
+        job.updated_at = datetime.utcnow()
+        db.session.commit()
+
+    logger.info(f"[INGEST START] job={job.id} file={job.filename}")
+    try:
+        report = ingest_file(
+            job.file_path,
+            job.user_id,
+            job.filename,
+            replace=job.mode == "replace",
+            on_progress=on_progress,
+        )
+        # The chunk total is only known at the end of a streamed file
+        job.total_chunks = report["chunks"]
+        # New context can change answers to questions already cached
+        if report["embedded"] or report["removed"]:
+            SQLAlchemyCache.invalidate_user(job.user_id)
+        job.status = "done"
+        logger.info(f"[INGEST DONE] job={job.id} {report}")
+    except Exception as e:
+        db.session.rollback()
+        job.status = "failed"
+        job.error = str(e)
+        logger.error(f"[INGEST FAILED] job={job.id} error={e}")
+
+    job.finished_at = datetime.utcnow()
+    job.updated_at = job.finished_at
+    db.session.commit()
+    if job.status == "done" and os.path.exists(job.file_path):
+        os.remove(job.file_path)
+
+
+def run_worker(poll_interval: float = 2.0, once: bool = False) -> int:
+    """
+    Process jobs until stopped (or until the queue is empty with `once`).
+
+    Must run inside a Flask app context.
+
+    Returns:
+        int: Number of jobs processed.
+    """
+    processed = 0
+    while True:
+        job = claim_next_job()
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        process_job(job)
+        processed += 1
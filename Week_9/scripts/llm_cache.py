@@ -1,8 +1,20 @@
 # scripts/llm_cache.py
 
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from api.models import LLMCache
 from api.db import db
+from scripts.constants import (
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MEMORY_TTL_SECONDS,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+from scripts.lru_cache import LRUCache
 import logging
 
 # ---------------- Setup Logging ----------------
@@ -11,39 +23,187 @@ logging.basicConfig(level=logging.INFO)
 
 
 class SQLAlchemyCache:
-    """SQLAlchemy-based cache for LLM responses with TTL support."""
+    """
+    Two-level cache for LLM responses with TTL support.
 
-    ttl_seconds = 3600  # TTL in seconds
+    Level 1 is a bounded in-process LRU (per worker); level 2 is the `llm_cache`
+    table. Reads try memory first, writes go through to the database. Memory
+    entries live at most LLM_CACHE_MEMORY_TTL_SECONDS, which bounds how long a
+    worker can serve an answer another process has invalidated.
+    """
+
+    ttl_seconds = LLM_CACHE_TTL_SECONDS  # TTL in seconds
+    memory = LRUCache(
+        maxsize=LLM_CACHE_MAX_ENTRIES, ttl_seconds=LLM_CACHE_MEMORY_TTL_SECONDS
+    )
 
     @staticmethod
     def get(question: str):
-        """Return cached answer if exists and not expired, else None"""
-        cached = LLMCache.query.filter_by(question=question).first()
+        """Return cached answer if exists and not expired, else None (read-only)"""
+        answer = SQLAlchemyCache.memory.get(question)
+        if answer is not None:
+            logger.info(f"[CACHE HIT][memory] Returning cached answer for question: {question}")
+            return answer
+
+        now = datetime.utcnow()
+        cached = (
+            db.session.query(LLMCache.answer, LLMCache.expires_at)
+            .filter(LLMCache.question == question, LLMCache.expires_at > now)
+            .first()
+        )
         if cached:
-            if (
-                cached.created_at
-                and (datetime.utcnow() - cached.created_at).total_seconds()
-                < SQLAlchemyCache.ttl_seconds
-            ):
-                logger.info(
-                    f"[CACHE HIT] Returning cached answer for question: {question}"
-                )
-                return cached.answer
-            else:
-                # Expired, delete entry
-                logger.info(f"[CACHE EXPIRED] Question expired in cache: {question}")
-                db.session.delete(cached)
-                db.session.commit()
-        else:
-            logger.info(f"[CACHE MISS] No cached answer for question: {question}")
+            logger.info(f"[CACHE HIT] Returning cached answer for question: {question}")
+            SQLAlchemyCache.memory.set(
+                question,
+                cached.answer,
+                ttl_seconds=min(
+                    (cached.expires_at - now).total_seconds(), LLM_CACHE_MEMORY_TTL_SECONDS
+                ),
+            )
+            return cached.answer
+
+        # Expired rows are left for sweep_expired(); no writes on the read path
+        logger.info(f"[CACHE MISS] No cached answer for question: {question}")
+        return None
+
+    @staticmethod
+    def get_similar(user_id: int, embedding: List[float]) -> Optional[str]:
+        """
+        Semantic lookup: return the answer of this user's closest cached question
+        if its cosine similarity reaches SEMANTIC_CACHE_THRESHOLD, else None.
+        """
+        distance = LLMCache.question_embedding.cosine_distance(embedding)
+        row = (
+            db.session.query(LLMCache.question, LLMCache.answer, distance.label("distance"))
+            .filter(
+                LLMCache.user_id == user_id,
+                LLMCache.question_embedding.isnot(None),
+                LLMCache.expires_at > datetime.utcnow(),
+            )
+            .order_by(distance)
+            .first()
+        )
+        if row and 1 - row.distance >= SEMANTIC_CACHE_THRESHOLD:
+            logger.info(
+                f"[CACHE HIT][semantic] similarity={1 - row.distance:.3f} matched: {row.question}"
+            )
+            return row.answer
         return None
 
     @staticmethod
-    def set(question: str, answer: str):
-        """Store question-answer in the cache"""
+    def invalidate_user(user_id: int) -> int:
+        """
+        Drop every cached answer for a user (their products or documents changed).
+
+        Clears the database rows and this worker's memory tier; other workers'
+        memory entries age out within LLM_CACHE_MEMORY_TTL_SECONDS.
+        """
+        prefix = f"{user_id}::"
+        SQLAlchemyCache.memory.delete_where(
+            lambda key: isinstance(key, str) and key.startswith(prefix)
+        )
+        # Every row is written with its user_id; the indexed column avoids a LIKE scan
+        deleted = LLMCache.query.filter(LLMCache.user_id == user_id).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+        logger.info(f"[CACHE INVALIDATE] user_id={user_id} removed={deleted}")
+        return deleted
+
+    @staticmethod
+    def set(
+        question: str,
+        answer: str,
+        user_id: Optional[int] = None,
+        embedding: Optional[List[float]] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        """
+        Store question-answer in the cache (memory + database).
+
+        `ttl_seconds` overrides the default TTL for this entry only.
+        """
+        ttl = ttl_seconds or SQLAlchemyCache.ttl_seconds
         logger.info(f"[CACHE SET] Storing answer for question: {question}")
-        cache_entry = LLMCache(
-            question=question, answer=answer, created_at=datetime.utcnow()
+        now = datetime.utcnow()
+        values = dict(
+            answer=answer,
+            created_at=now,
+            expires_at=now + timedelta(seconds=ttl),
+            user_id=user_id,
+            question_embedding=embedding,
+        )
+        # Single-statement upsert: replaces an expired row still awaiting the sweeper
+        # and never races concurrent writers into the unique(question) constraint
+        insert = (
+            sqlite_insert
+            if db.session.get_bind().dialect.name == "sqlite"
+            else pg_insert
         )
-        db.session.add(cache_entry)
+        stmt = insert(LLMCache).values(question=question, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=["question"], set_=values)
+        db.session.execute(stmt)
         db.session.commit()
+        SQLAlchemyCache.memory.set(
+            question, answer, ttl_seconds=min(ttl, LLM_CACHE_MEMORY_TTL_SECONDS)
+        )
+
+    @staticmethod
+    def sweep_expired(batch_size: int = 1000) -> int:
+        """
+        Delete expired rows in batches of `batch_size`, committing after each.
+
+        Returns:
+            int: Number of rows removed.
+        """
+        total = 0
+        while True:
+            expired_ids = (
+                db.session.query(LLMCache.id)
+                .filter(LLMCache.expires_at <= datetime.utcnow())
+                .order_by(LLMCache.expires_at)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            deleted = LLMCache.query.filter(LLMCache.id.in_(expired_ids)).delete(
+                synchronize_session=False
+            )
+            db.session.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+        logger.info(f"[CACHE SWEEP] Removed {total} expired entries")
+        return total
+
+    @staticmethod
+    def stats() -> dict:
+        """Hit/miss/eviction counters of the in-memory tier."""
+        return SQLAlchemyCache.memory.stats()
+
+
+def start_cache_sweeper(app, interval_seconds: int, batch_size: int = 1000) -> threading.Thread:
+    """
+    Run SQLAlchemyCache.sweep_expired every `interval_seconds` in a daemon thread.
+
+    Args:
+        app: Flask app whose context (and database) the sweeper uses.
+        interval_seconds (int): Pause between sweeps.
+        batch_size (int): Rows deleted per transaction.
+
+    Returns:
+        threading.Thread: The started sweeper thread.
+    """
+
+    def run() -> None:
+        while True:
+            time.sleep(interval_seconds)
+            with app.app_context():
+                try:
+                    SQLAlchemyCache.sweep_expired(batch_size=batch_size)
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning(f"[CACHE SWEEP ERROR] {e}")
+
+    thread = threading.Thread(target=run, name="llm-cache-sweeper", daemon=True)
+    thread.start()
+    return thread
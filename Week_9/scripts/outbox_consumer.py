@@ -0,0 +1,114 @@
+# scripts/outbox_consumer.py
+"""
+Consumer for the `product_outbox` table: keeps product embeddings and cached
+answers in sync with product writes.
+
+Usage:
+  flask --app api.app outbox consume             # run until stopped
+  flask --app api.app outbox consume --once      # drain the outbox and exit
+
+Each pass claims a batch of pending rows (FOR UPDATE SKIP LOCKED, so consumers
+can run side by side), re-embeds or deletes just the affected products per owner,
+marks the rows processed and then invalidates those owners' llm_cache entries.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+from api.db import db
+from api.models import ProductOutbox
+from scripts.constants import COLLECTION_NAME
+from scripts.embedding import sync_products
+from scripts.llm_cache import SQLAlchemyCache
+
+logger = logging.getLogger(__name__)
+
+# Rows claimed per pass
+OUTBOX_BATCH_SIZE = 200
+# Rows that keep failing are left for inspection after this many attempts
+MAX_ATTEMPTS = 5
+
+
+def consume_batch(
+    batch_size: int = OUTBOX_BATCH_SIZE, collection_name: str = COLLECTION_NAME
+) -> int:
+    """
+    Process one batch of pending outbox rows. Must run inside a Flask app context.
+
+    Returns:
+        int: Number of rows claimed.
+    """
+    rows: List[ProductOutbox] = (
+        ProductOutbox.query.filter(
+            ProductOutbox.processed_at.is_(None),
+            ProductOutbox.attempts < MAX_ATTEMPTS,
+        )
+        .order_by(ProductOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not rows:
+        db.session.rollback()
+        return 0
+
+    # Several writes to one product collapse into a single sync of its current state
+    by_owner: Dict[int, List[ProductOutbox]] = defaultdict(list)
+    for row in rows:
+        by_owner[row.owner_id].append(row)
+
+    now = datetime.utcnow()
+    changed_owners: List[int] = []
+    for owner_id, owner_rows in by_owner.items():
+        try:
+            report = sync_products(
+                [row.product_id for row in owner_rows], collection_name, owner_id
+            )
+            if report["embedded"] or report["removed"]:
+                changed_owners.append(owner_id)
+            for row in owner_rows:
+                row.processed_at = now
+                row.error = None
+            logger.info(f"[OUTBOX] user_id={owner_id} {report}")
+        except Exception as e:
+            for row in owner_rows:
+                row.attempts += 1
+                row.error = str(e)
+            logger.error(f"[OUTBOX ERROR] user_id={owner_id} error={e}")
+
+    # Releases the row locks; nothing before this may commit the session
+    db.session.commit()
+
+    # invalidate_user commits on its own, so it runs once the batch is settled.
+    # A failure only leaves answers cached until their TTL; the rows stay processed.
+    for owner_id in changed_owners:
+        try:
+            SQLAlchemyCache.invalidate_user(owner_id)
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"[OUTBOX] cache invalidation failed for user_id={owner_id}: {e}")
+    return len(rows)
+
+
+def run_consumer(
+    poll_interval: float = 2.0,
+    once: bool = False,
+    batch_size: int = OUTBOX_BATCH_SIZE,
+) -> int:
+    """
+    Consume the outbox until stopped (or until it is empty with `once`).
+
+    Returns:
+        int: Number of outbox rows processed.
+    """
+    processed = 0
+    while True:
+        claimed = consume_batch(batch_size=batch_size)
+        processed += claimed
+        if not claimed:
+            if once:
+                return processed
+            time.sleep(poll_interval)
@@ -3,9 +3,9 @@
 LangChain GPT query service.
 
 Responsibilities:
-- Generate embeddings using OpenAI.
+- Generate embeddings with the configured HuggingFace model (cached).
 - Query GPT using LangChain (zero-shot and few-shot).
-- Log token usage and approximate cost.
+- Log token usage and approximate cost (read from the answer's own response).
 
 SOLID Principles:
 - SRP: Embedding generation and GPT query kept separate.
@@ -13,33 +13,35 @@ SOLID Principles:
 """
 
 import os
+import sys
 import logging
 from typing import List
 
 from dotenv import load_dotenv
 
 load_dotenv()
-from openai import OpenAI
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import StrOutputParser
 
-from constants import EMBEDDING_MODEL, CHAT_MODEL, CHAT_TEMPERATURE, TOKEN_COST_PER_1K
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from scripts.constants import CHAT_MODEL_OPENAI, CHAT_TEMPERATURE
+from scripts.cached_embeddings import get_embeddings
+from scripts.usage_ledger import record_usage
 
 # ------------------ Environment ------------------
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     raise RuntimeError("OPENAI_API_KEY is not set in environment or .env")
 
-# OpenAI client (raw usage + embeddings)
-client = OpenAI(api_key=OPENAI_API_KEY)
-
 # LangChain chat model
 chat_model = ChatOpenAI(
-    model=CHAT_MODEL,
+    model=CHAT_MODEL_OPENAI,
     temperature=CHAT_TEMPERATURE,
     api_key=OPENAI_API_KEY,
 )
@@ -64,30 +66,33 @@ few_shot_prompt = ChatPromptTemplate.from_messages(
 # ------------------ Core Functions ------------------
 def get_embedding(text: str) -> List[float]:
     """
-    Generate an embedding for a given text using OpenAI.
+    Generate an embedding for a given text with EMBEDDING_MODEL, the same model
+    (and dimension) used for the vector store.
 
     Args:
         text (str): Input text.
 
     Returns:
-        List[float]: Embedding vector.
+        List[float]: Embedding vector of EMBEDDING_DIM floats.
     """
     try:
-        resp = client.embeddings.create(model=EMBEDDING_MODEL, input=[text])
-        return resp.data[0].embedding
+        return get_embeddings().embed_query(text)
     except Exception as e:
         logging.error("Failed to generate embedding: %s", str(e))
         return []
 
 
-def ask_gpt(question: str, few_shot_example: bool = False) -> str:
+def ask_gpt(
+    question: str, few_shot_example: bool = False, user_id: int | None = None
+) -> str:
     """
     Ask GPT a question using LangChain and return the answer.
-    Also logs tokens used and approximate cost.
+    Also logs tokens used and approximate cost, and records them in the usage ledger.
 
     Args:
         question (str): The user question.
         few_shot_example (bool): Whether to use few-shot prompting.
+        user_id (int | None): User to attribute the usage to.
 
     Returns:
         str: GPT response text.
@@ -99,20 +104,12 @@ def ask_gpt(question: str, few_shot_example: bool = False) -> str:
     try:
         # Use LangChain for structured response
         prompt = few_shot_prompt if few_shot_example else default_prompt
-        chain = prompt | chat_model | parser
-        answer = chain.invoke({"question": question})
-
-        # Direct OpenAI call (for usage tracking)
-        usage_resp = client.chat.completions.create(
-            model=CHAT_MODEL,
-            messages=[{"role": "user", "content": question}],
-            max_tokens=200,
-        )
-        tokens_used = usage_resp.usage.total_tokens
-        approx_cost = (tokens_used / 1000) * TOKEN_COST_PER_1K
-
-        logging.info("Tokens used: %d", tokens_used)
-        logging.info("Approx cost (USD): $%.6f", approx_cost)
+        chain = prompt | chat_model
+        message = chain.invoke({"question": question})
+        answer = parser.invoke(message)
+
+        # Usage comes from the same response; no second completion needed
+        record_usage(user_id, CHAT_MODEL_OPENAI, message, source="cli")
 
         return answer
 
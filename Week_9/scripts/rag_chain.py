@@ -2,6 +2,9 @@ import logging
 import os
 import sys
 import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if BASE_DIR not in sys.path:
@@ -10,21 +13,28 @@ if BASE_DIR not in sys.path:
 from dotenv import load_dotenv
 from langchain_community.vectorstores.pgvector import PGVector
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
 from langchain.schema import StrOutputParser
 from langchain_openai import ChatOpenAI
 from langchain_ollama import ChatOllama
 
 from scripts.constants import (
-    HF_EMBEDDINGS,
-    DATABASE_URL_WEEK8,
+    COLLECTION_NAME,
     CHAT_MODEL_OPENAI,
     CHAT_MODEL_OLLAMA,
     CHAT_TEMPERATURE,
+    RETRIEVAL_K,
+    RETRIEVAL_SCORE_THRESHOLD,
+    SEMANTIC_CACHE_ENABLED,
+    VECTOR_COMPACT_MODE,
 )
 from prompts.system_prompt import SYSTEM_PROMPT
 from scripts.storage import store_chat_history
 from scripts.llm_cache import SQLAlchemyCache
+from scripts.vector_store import compact_search, get_vector_store, tenant_filter
+from scripts.single_flight import SingleFlight
+from scripts.usage_ledger import model_name, record_usage
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -56,13 +66,36 @@ EMOTION_RE = re.compile(
     re.IGNORECASE,
 )
 
+RAG_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", SYSTEM_PROMPT),
+        ("human", "Context:\n{context}\n\nQuestion: {question}"),
+    ]
+)
 
-def clean_answer(text: str) -> str:
+# Answer chains are built once per LLM instance: {id(llm): (llm, chain)}
+_answer_chains: Dict[int, Tuple[object, object]] = {}
+_answer_chains_lock = threading.Lock()
+
+# Streamed answers are held back until this many characters arrive, so leading
+# boilerplate ("Based on the context, ...") can be removed before the first token
+STREAM_CLEAN_PREFIX_CHARS = 60
+
+# Identical concurrent questions (same cache key) share one retrieval + LLM call
+_inflight = SingleFlight()
+
+
+def strip_boilerplate(text: str) -> str:
+    """Remove leading meta-commentary; keeps the rest of the text untouched."""
     t = text or ""
     for pat in BOILERPLATE_PATTERNS:
         t = re.sub(pat, "", t, flags=re.IGNORECASE)
     t = re.sub(r"^\s*(it (appears|seems) that[:,]?\s*)", "", t, flags=re.IGNORECASE)
-    return t.strip()
+    return t.lstrip()
+
+
+def clean_answer(text: str) -> str:
+    return strip_boilerplate(text).strip()
 
 
 def is_greeting(q: str) -> bool:
@@ -115,42 +148,156 @@ def emotion_response(q: str) -> str:
     return "Thanks for sharing how you feel. I'm here to support you—would you like to tell me more so I can help?"
 
 
-def load_vector_store(collection_name: str = "product_embedding_hf") -> PGVector:
-    if not DATABASE_URL_WEEK8:
-        raise ValueError("DATABASE_URL_WEEK8 not found in environment")
-    return PGVector(
-        collection_name=collection_name,
-        connection_string=DATABASE_URL_WEEK8,
-        embedding_function=HF_EMBEDDINGS,
-    )
+def load_vector_store(collection_name: str = COLLECTION_NAME) -> PGVector:
+    """Return the shared, pooled vector store for a collection."""
+    return get_vector_store(collection_name)
 
 
+@lru_cache(maxsize=None)
 def get_llm(use_ollama: bool = False):
+    """Return the chat model for the chosen backend (one instance per worker)."""
     if use_ollama:
         return ChatOllama(model=CHAT_MODEL_OLLAMA, temperature=CHAT_TEMPERATURE)
-    return ChatOpenAI(model=CHAT_MODEL_OPENAI, temperature=CHAT_TEMPERATURE)
+    # stream_usage: streamed responses also report token usage in their last chunk
+    return ChatOpenAI(
+        model=CHAT_MODEL_OPENAI, temperature=CHAT_TEMPERATURE, stream_usage=True
+    )
+
+
+def retrieve_context(
+    vector_store: PGVector,
+    question: str,
+    user_id: int,
+    embedding: Optional[List[float]] = None,
+) -> List[Document]:
+    """
+    Run the tenant-filtered similarity search once for a question.
+
+    Only documents whose relevance score passes RETRIEVAL_SCORE_THRESHOLD are returned.
+    Pass `embedding` when the question was already embedded (e.g. for the semantic cache).
+    """
+    if embedding is None:
+        embedding = vector_store.embeddings.embed_query(question)
+    if VECTOR_COMPACT_MODE:
+        # Candidates from the quantized index, re-ranked on full precision
+        docs_and_scores = compact_search(
+            vector_store.collection_name, user_id, embedding, k=RETRIEVAL_K
+        )
+    else:
+        docs_and_scores = vector_store.similarity_search_with_score_by_vector(
+            embedding, k=RETRIEVAL_K, filter=tenant_filter(user_id)
+        )
+    # Same distance -> relevance mapping similarity_search_with_relevance_scores uses
+    relevance = vector_store._select_relevance_score_fn()
+    return [
+        doc
+        for doc, distance in docs_and_scores
+        if relevance(distance) >= RETRIEVAL_SCORE_THRESHOLD
+    ]
+
+
+def format_docs(docs: List[Document]) -> str:
+    """Join retrieved documents into the prompt's context block."""
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
+def get_answer_chain(llm) -> object:
+    """
+    Return the prompt | llm chain for an LLM, building it only once.
+
+    The chain expects {"context": str, "question": str}; retrieval happens beforehand
+    so the documents found by the relevance probe are reused instead of searched again.
+    It returns the model's message (not a parsed string) so token usage can be read.
+    """
+    entry = _answer_chains.get(id(llm))
+    if entry is not None and entry[0] is llm:
+        return entry[1]
+
+    with _answer_chains_lock:
+        entry = _answer_chains.get(id(llm))
+        if entry is None or entry[0] is not llm:
+            entry = (llm, RAG_PROMPT | llm)
+            _answer_chains[id(llm)] = entry
+    return entry[1]
 
 
 def build_rag_chain(vector_store: PGVector, llm, user_id: int) -> object:
-    str_user_id = str(user_id)
-    jsonb_filter = {"user_id": str_user_id}
-    retriever = vector_store.as_retriever(
-        search_type="similarity_score_threshold",
-        search_kwargs={"k": 3, "filter": jsonb_filter, "score_threshold": 0.30},
+    """Full question -> answer chain (retrieval included) for callers that need one."""
+    retrieve = RunnableLambda(
+        lambda q: format_docs(retrieve_context(vector_store, q, user_id))
     )
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", SYSTEM_PROMPT),
-            ("human", "Context:\n{context}\n\nQuestion: {question}"),
-        ]
-    )
-    chain = (
-        {"context": retriever, "question": RunnablePassthrough()}
-        | prompt
-        | llm
+    return (
+        {"context": retrieve, "question": RunnablePassthrough()}
+        | get_answer_chain(llm)
         | StrOutputParser()
     )
-    return chain
+
+
+def small_talk_answer(question: str) -> Optional[str]:
+    """
+    Canned reply for greetings, thanks, farewells and feelings (None otherwise).
+
+    Replies are computed in memory on every hit and never cached.
+    """
+    if is_greeting(question):
+        resp = greeting_response(question)
+    elif is_thanks(question):
+        resp = thanks_response(question)
+    elif is_farewell(question):
+        resp = farewell_response(question)
+    elif is_emotion(question):
+        resp = emotion_response(question)
+    else:
+        return None
+    return resp
+
+
+def _generate_answer(
+    question: str, llm, user_id: int, cache_key: str
+) -> Tuple[str, bool]:
+    """
+    Cache-miss path: semantic lookup, retrieval, LLM call, cache write.
+
+    Returns:
+        Tuple[str, bool]: The answer and whether it was produced by the LLM.
+    """
+    vector_store = load_vector_store()
+
+    # Embed once: reused by the semantic cache lookup and the retrieval
+    embedding = vector_store.embeddings.embed_query(question)
+
+    if SEMANTIC_CACHE_ENABLED:
+        similar = SQLAlchemyCache.get_similar(user_id, embedding)
+        if similar:
+            return similar, False
+
+    # Single retrieval: the same documents decide relevance and feed the prompt
+    retrieved_docs = retrieve_context(vector_store, question, user_id, embedding)
+
+    if not retrieved_docs:
+        SQLAlchemyCache.set(cache_key, FALLBACK, user_id=user_id)
+        return FALLBACK, False
+
+    message = get_answer_chain(llm).invoke(
+        {"context": format_docs(retrieved_docs), "question": question}
+    )
+    record_usage(user_id, model_name(llm), message)
+
+    answer = clean_answer(message.content)
+    if not answer or not answer.strip():
+        answer = FALLBACK
+
+    try:
+        SQLAlchemyCache.set(
+            cache_key,
+            answer,
+            user_id=user_id,
+            embedding=embedding if SEMANTIC_CACHE_ENABLED else None,
+        )
+    except Exception as e:
+        logger.warning(f"[CACHE STORE ERROR] user_id={user_id} error={e}")
+
+    return answer, True
 
 
 def answer_question(question: str, llm, user_id: int) -> str:
@@ -159,72 +306,113 @@ def answer_question(question: str, llm, user_id: int) -> str:
         cache_key = f"{user_id}::{normalized_q}"
 
         # Handle small-talk intents without requiring context
-        if is_greeting(question):
-            resp = greeting_response(question)
-            try:
-                SQLAlchemyCache.set(cache_key, resp)
-            except Exception:
-                pass
-            return resp
-        if is_thanks(question):
-            resp = thanks_response(question)
-            try:
-                SQLAlchemyCache.set(cache_key, resp)
-            except Exception:
-                pass
-            return resp
-        if is_farewell(question):
-            resp = farewell_response(question)
-            try:
-                SQLAlchemyCache.set(cache_key, resp)
-            except Exception:
-                pass
-            return resp
-        if is_emotion(question):
-            resp = emotion_response(question)
-            try:
-                SQLAlchemyCache.set(cache_key, resp)
-            except Exception:
-                pass
+        resp = small_talk_answer(question)
+        if resp:
             return resp
 
         cached = SQLAlchemyCache.get(cache_key)
         if cached:
             return cached
 
-        str_user_id = str(user_id)
-        jsonb_filter = {"user_id": str_user_id}
+        answer, from_llm = _inflight.do(
+            cache_key, lambda: _generate_answer(question, llm, user_id, cache_key)
+        )
+
+        if from_llm:
+            try:
+                store_chat_history(user_id=user_id, question=question, answer=answer)
+            except Exception as e:
+                logger.warning(f"[STORE CHAT ERROR] user_id={user_id} error={e}")
+
+        return answer
+
+    except Exception as e:
+        logger.error(f"[RAG ERROR] {e}")
+        return FALLBACK
+
+
+def stream_answer(question: str, llm, user_id: int) -> Iterator[str]:
+    """
+    Stream the answer to a question as text chunks.
+
+    Small talk, cache hits and the fallback are yielded as a single chunk. LLM output
+    is streamed token by token once the leading boilerplate has been stripped; the
+    full cleaned answer is cached and stored in chat history when the stream ends.
+    """
+    normalized_q = (question or "").strip().lower()
+    cache_key = f"{user_id}::{normalized_q}"
+    parts: List[str] = []
+
+    try:
+        resp = small_talk_answer(question) or SQLAlchemyCache.get(cache_key)
+        if resp:
+            yield resp
+            return
+
         vector_store = load_vector_store()
+        embedding = vector_store.embeddings.embed_query(question)
 
-        # Probe with same threshold to detect irrelevance
-        probe_retriever = vector_store.as_retriever(
-            search_type="similarity_score_threshold",
-            search_kwargs={"k": 3, "filter": jsonb_filter, "score_threshold": 0.30},
-        )
-        retrieved_docs = probe_retriever.get_relevant_documents(question)
+        if SEMANTIC_CACHE_ENABLED:
+            similar = SQLAlchemyCache.get_similar(user_id, embedding)
+            if similar:
+                yield similar
+                return
 
+        retrieved_docs = retrieve_context(vector_store, question, user_id, embedding)
         if not retrieved_docs:
-            SQLAlchemyCache.set(cache_key, FALLBACK)
-            return FALLBACK
+            SQLAlchemyCache.set(cache_key, FALLBACK, user_id=user_id)
+            yield FALLBACK
+            return
 
-        rag_chain = build_rag_chain(vector_store, llm, user_id)
-        answer = rag_chain.invoke(question)
-        answer = clean_answer(answer)
-        if not answer or not answer.strip():
+        stream = get_answer_chain(llm).stream(
+            {"context": format_docs(retrieved_docs), "question": question}
+        )
+        head: Optional[str] = ""  # None once the prefix has been flushed
+        full_message = None
+        for message_chunk in stream:
+            full_message = (
+                message_chunk if full_message is None else full_message + message_chunk
+            )
+            chunk = message_chunk.content
+            if not chunk:
+                continue
+            parts.append(chunk)
+            if head is None:
+                yield chunk
+                continue
+            head += chunk
+            if len(head) >= STREAM_CLEAN_PREFIX_CHARS:
+                cleaned_head = strip_boilerplate(head)
+                if cleaned_head:
+                    yield cleaned_head
+                head = None
+
+        if full_message is not None:
+            record_usage(user_id, model_name(llm), full_message)
+
+        answer = clean_answer("".join(parts))
+        if head is not None and answer:
+            yield answer  # short answer: never reached the prefix threshold
+        if not answer:
             answer = FALLBACK
+            yield FALLBACK
+    except Exception as e:
+        logger.error(f"[RAG STREAM ERROR] {e}")
+        if not parts:
+            yield FALLBACK
+        return
 
-        try:
-            SQLAlchemyCache.set(cache_key, answer)
-        except Exception as e:
-            logger.warning(f"[CACHE STORE ERROR] user_id={user_id} error={e}")
-
-        try:
-            store_chat_history(user_id=user_id, question=question, answer=answer)
-        except Exception as e:
-            logger.warning(f"[STORE CHAT ERROR] user_id={user_id} error={e}")
-
-        return answer
+    try:
+        SQLAlchemyCache.set(
+            cache_key,
+            answer,
+            user_id=user_id,
+            embedding=embedding if SEMANTIC_CACHE_ENABLED else None,
+        )
+    except Exception as e:
+        logger.warning(f"[CACHE STORE ERROR] user_id={user_id} error={e}")
 
+    try:
+        store_chat_history(user_id=user_id, question=question, answer=answer)
     except Exception as e:
-        logger.error(f"[RAG ERROR] {e}")
-        return FALLBACK
+        logger.warning(f"[STORE CHAT ERROR] user_id={user_id} error={e}")
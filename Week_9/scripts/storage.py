@@ -5,7 +5,9 @@ Database storage utilities for queries, embeddings, and chat history (multi-tena
 import psycopg2
 from pgvector.psycopg2 import register_vector
 import logging
+from sqlalchemy import text
 from scripts.constants import DATABASE_URL_WEEK8 as DATABASE_URL
+from scripts.vector_store import get_engine
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -66,3 +68,50 @@ def store_chat_history(user_id: int, question: str, answer: str) -> None:
         )
     except Exception as e:
         logger.error("[store_chat_history] Failed for user_id=%s: %s", user_id, str(e))
+
+
+def store_llm_usage(
+    user_id: int | None,
+    model: str,
+    prompt_tokens: int,
+    completion_tokens: int,
+    total_tokens: int,
+    cost_usd: float,
+    source: str = "chat",
+) -> None:
+    """
+    Append one LLM call's token usage and estimated cost to the `llm_usage` ledger.
+
+    Runs on every answered chat request, so it writes through the shared pooled
+    engine instead of opening a new connection.
+    """
+    try:
+        with get_engine().begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO llm_usage (user_id, model, source, prompt_tokens,
+                                           completion_tokens, total_tokens, cost_usd, created_at)
+                    VALUES (:user_id, :model, :source, :prompt_tokens, :completion_tokens,
+                            :total_tokens, :cost_usd, (now() AT TIME ZONE 'utc'))
+                    """
+                ),
+                {
+                    "user_id": user_id,
+                    "model": model,
+                    "source": source,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": total_tokens,
+                    "cost_usd": cost_usd,
+                },
+            )
+        logger.info(
+            "[store_llm_usage] user_id=%s model=%s tokens=%s cost=$%.6f",
+            user_id,
+            model,
+            total_tokens,
+            cost_usd,
+        )
+    except Exception as e:
+        logger.error("[store_llm_usage] Failed for user_id=%s: %s", user_id, str(e))
@@ -0,0 +1,66 @@
+# scripts/usage_ledger.py
+"""
+Token usage accounting from LangChain responses.
+
+Usage is read from the response of the call that produced the answer
+(`AIMessage.usage_metadata`), so no extra completion is needed to count tokens.
+"""
+
+import logging
+from typing import Any, Dict
+
+from scripts.constants import MODEL_COST_PER_1K, TOKEN_COST_PER_1K
+from scripts.storage import store_llm_usage
+
+logger = logging.getLogger(__name__)
+
+
+def model_name(llm: Any) -> str:
+    """Model identifier of a LangChain chat model (ChatOpenAI or ChatOllama)."""
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or "unknown"
+
+
+def extract_usage(message: Any) -> Dict[str, int]:
+    """
+    Read token counts from an AIMessage / merged AIMessageChunk.
+
+    Falls back to the provider's raw `token_usage` block for older integrations.
+    Missing counts are reported as 0.
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    if usage:
+        prompt = usage.get("input_tokens", 0)
+        completion = usage.get("output_tokens", 0)
+        total = usage.get("total_tokens", prompt + completion)
+    else:
+        raw = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+        prompt = raw.get("prompt_tokens", 0)
+        completion = raw.get("completion_tokens", 0)
+        total = raw.get("total_tokens", prompt + completion)
+    return {
+        "prompt_tokens": prompt or 0,
+        "completion_tokens": completion or 0,
+        "total_tokens": total or 0,
+    }
+
+
+def estimate_cost(model: str, total_tokens: int) -> float:
+    """Approximate USD cost of `total_tokens` for a model."""
+    return (total_tokens / 1000) * MODEL_COST_PER_1K.get(model, TOKEN_COST_PER_1K)
+
+
+def record_usage(
+    user_id: int | None, model: str, message: Any, source: str = "chat"
+) -> Dict[str, Any]:
+    """
+    Log and store the usage of one LLM response in the `llm_usage` ledger.
+
+    Returns:
+        Dict[str, Any]: The token counts and cost that were recorded.
+    """
+    usage = extract_usage(message)
+    cost = estimate_cost(model, usage["total_tokens"])
+    logger.info("Tokens used: %d", usage["total_tokens"])
+    logger.info("Approx cost (USD): $%.6f", cost)
+    store_llm_usage(user_id=user_id, model=model, cost_usd=cost, source=source, **usage)
+    return {**usage, "cost_usd": cost}
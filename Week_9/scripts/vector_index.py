@@ -0,0 +1,450 @@
+# scripts/vector_index.py
+"""
+Manage approximate-nearest-neighbour (pgvector) indexes per collection.
+
+Usage:
+  python scripts/vector_index.py create --collection product_embedding_hf --method hnsw
+  python scripts/vector_index.py create --collection product_embedding_hf --method ivfflat --lists 200
+  python scripts/vector_index.py create --collection product_embedding_hf --compact halfvec
+  python scripts/vector_index.py rebuild --collection product_embedding_hf
+  python scripts/vector_index.py drop --collection product_embedding_hf
+  python scripts/vector_index.py list
+  python scripts/vector_index.py benchmark --collection product_embedding_hf --queries 50 --k 3
+  python scripts/vector_index.py metadata-indexes
+  python scripts/vector_index.py tenant-index --collection product_embedding_hf --min-rows 5000
+  python scripts/vector_index.py tenant-index --collection product_embedding_hf --user-id 17
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from typing import Dict, List
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from scripts.constants import (
+    COLLECTION_NAME,
+    EMBEDDING_DIM,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    IVFFLAT_LISTS,
+    IVFFLAT_PROBES,
+    VECTOR_COMPACT_MODE,
+)
+from scripts.vector_store import compact_index_expression, get_engine
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+EMBEDDING_TABLE = "langchain_pg_embedding"
+COLLECTION_TABLE = "langchain_pg_collection"
+INDEX_PREFIX = "ix_lpe_ann_"
+TENANT_INDEX_PREFIX = "ix_lpe_ann_tenant_"
+
+# Keep in sync with migrations 5b8e21c04f6a (first three) and 9e3b7c1d5a28 (chunk_hash)
+METADATA_INDEXES = {
+    "ix_lpe_collection_user_id": "(collection_id, (cmetadata->>'user_id'))",
+    "ix_lpe_user_id_product_id": "((cmetadata->>'user_id'), (cmetadata->>'product_id'))",
+    "ix_lpe_user_id_source": "((cmetadata->>'user_id'), (cmetadata->>'source'))",
+    "ix_lpe_user_id_chunk_hash": "((cmetadata->>'user_id'), (cmetadata->>'chunk_hash'))",
+}
+
+
+def index_name(collection_name: str) -> str:
+    """Postgres-safe index name for a collection's ANN index."""
+    slug = re.sub(r"[^a-z0-9_]", "_", collection_name.lower())
+    return f"{INDEX_PREFIX}{slug}"[:63]
+
+
+def tenant_index_name(collection_name: str, user_id: str) -> str:
+    """Index name for a tenant's partial ANN index within a collection."""
+    slug = re.sub(r"[^a-z0-9_]", "_", f"{collection_name.lower()}_{user_id}")
+    return f"{TENANT_INDEX_PREFIX}{slug}"[:63]
+
+
+def get_collection_id(conn: Connection, collection_name: str) -> str:
+    """Return the uuid of a PGVector collection, or raise if it does not exist."""
+    row = conn.execute(
+        text(f"SELECT uuid FROM {COLLECTION_TABLE} WHERE name = :name"),
+        {"name": collection_name},
+    ).first()
+    if not row:
+        raise ValueError(f"Collection '{collection_name}' not found")
+    return str(row[0])
+
+
+def ensure_typed_column(conn: Connection) -> None:
+    """ANN indexes need a fixed dimension; PGVector may have created `vector` untyped."""
+    column_type = conn.execute(
+        text(
+            "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+            f"WHERE attrelid = '{EMBEDDING_TABLE}'::regclass AND attname = 'embedding'"
+        )
+    ).scalar()
+    if column_type != f"vector({EMBEDDING_DIM})":
+        logger.info("Altering embedding column %s -> vector(%d)", column_type, EMBEDDING_DIM)
+        conn.execute(
+            text(
+                f"ALTER TABLE {EMBEDDING_TABLE} "
+                f"ALTER COLUMN embedding TYPE vector({EMBEDDING_DIM})"
+            )
+        )
+
+
+def _autocommit():
+    """CREATE/REINDEX ... CONCURRENTLY cannot run inside a transaction."""
+    return get_engine().connect().execution_options(isolation_level="AUTOCOMMIT")
+
+
+def index_column(compact: str = "") -> str:
+    """Indexed column/expression with its operator class."""
+    if not compact:
+        return "embedding vector_cosine_ops"
+    expression, opclass, _, _ = compact_index_expression(compact)
+    return f"{expression} {opclass}"
+
+
+def create_index(
+    collection_name: str,
+    method: str = "hnsw",
+    m: int = HNSW_M,
+    ef_construction: int = HNSW_EF_CONSTRUCTION,
+    lists: int = IVFFLAT_LISTS,
+    compact: str = VECTOR_COMPACT_MODE,
+) -> float:
+    """
+    Build a partial ANN index covering only one collection's rows.
+
+    With `compact` ("halfvec" or "binary") the index is built on a quantized
+    expression of the embedding; searches must then go through
+    vector_store.compact_search (VECTOR_COMPACT_MODE) to use it.
+
+    Returns:
+        float: Build time in seconds.
+    """
+    column = index_column(compact)
+    if method == "hnsw":
+        using = f"hnsw ({column}) WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+    elif method == "ivfflat":
+        using = f"ivfflat ({column}) WITH (lists = {int(lists)})"
+    else:
+        raise ValueError(f"Unsupported index method: {method}")
+
+    name = index_name(collection_name)
+    with _autocommit() as conn:
+        collection_id = get_collection_id(conn, collection_name)
+        ensure_typed_column(conn)
+        start = time.perf_counter()
+        conn.execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {EMBEDDING_TABLE} "
+                f"USING {using} WHERE collection_id = '{collection_id}'"
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    logger.info(
+        "Built %s index %s (%s) in %.2fs", method, name, compact or "vector", elapsed
+    )
+    return elapsed
+
+
+def rebuild_index(collection_name: str) -> float:
+    """Rebuild a collection's ANN index without blocking writes."""
+    name = index_name(collection_name)
+    with _autocommit() as conn:
+        start = time.perf_counter()
+        conn.execute(text(f"REINDEX INDEX CONCURRENTLY {name}"))
+        elapsed = time.perf_counter() - start
+
+    logger.info("Rebuilt index %s in %.2fs", name, elapsed)
+    return elapsed
+
+
+def drop_index(collection_name: str) -> None:
+    """Drop a collection's ANN index if it exists."""
+    name = index_name(collection_name)
+    with _autocommit() as conn:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    logger.info("Dropped index %s", name)
+
+
+def list_indexes() -> List[Dict[str, str]]:
+    """List ANN indexes on the embedding table with their on-disk size."""
+    with get_engine().connect() as conn:
+        rows = conn.execute(
+            text(
+                """
+                SELECT indexname, indexdef,
+                       pg_size_pretty(pg_relation_size(indexname::regclass)) AS size
+                FROM pg_indexes
+                WHERE tablename = :table
+                  AND (indexdef ILIKE '%USING hnsw%' OR indexdef ILIKE '%USING ivfflat%')
+                """
+            ),
+            {"table": EMBEDDING_TABLE},
+        ).mappings()
+        return [dict(r) for r in rows]
+
+
+def create_metadata_indexes() -> None:
+    """Create the btree expression indexes used by tenant / product / source filters."""
+    with _autocommit() as conn:
+        for name, columns in METADATA_INDEXES.items():
+            start = time.perf_counter()
+            conn.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                    f"ON {EMBEDDING_TABLE} {columns}"
+                )
+            )
+            logger.info("Index %s ready in %.2fs", name, time.perf_counter() - start)
+
+
+def large_tenants(collection_name: str, min_rows: int) -> List[str]:
+    """Return user_ids with at least `min_rows` chunks in a collection."""
+    with get_engine().connect() as conn:
+        collection_id = get_collection_id(conn, collection_name)
+        rows = conn.execute(
+            text(
+                f"""
+                SELECT cmetadata->>'user_id' AS user_id, count(*) AS n
+                FROM {EMBEDDING_TABLE}
+                WHERE collection_id = :cid AND cmetadata->>'user_id' IS NOT NULL
+                GROUP BY 1
+                HAVING count(*) >= :min_rows
+                """
+            ),
+            {"cid": collection_id, "min_rows": min_rows},
+        )
+        return [r.user_id for r in rows]
+
+
+def create_tenant_index(
+    collection_name: str,
+    user_id: str,
+    m: int = HNSW_M,
+    ef_construction: int = HNSW_EF_CONSTRUCTION,
+    compact: str = VECTOR_COMPACT_MODE,
+) -> float:
+    """
+    Build a partial HNSW index holding only one tenant's vectors.
+
+    Tenant-filtered searches (`cmetadata->>'user_id' = '<id>'`) then walk a graph that
+    contains nothing but that tenant's rows, instead of post-filtering a shared graph.
+    Small tenants do not need one: the expression index narrows them to a cheap exact scan.
+
+    Returns:
+        float: Build time in seconds.
+    """
+    user_id = str(int(user_id))  # user ids are numeric; also keeps the DDL literal safe
+    name = tenant_index_name(collection_name, user_id)
+    with _autocommit() as conn:
+        collection_id = get_collection_id(conn, collection_name)
+        ensure_typed_column(conn)
+        start = time.perf_counter()
+        conn.execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {EMBEDDING_TABLE} "
+                f"USING hnsw ({index_column(compact)}) "
+                f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)}) "
+                f"WHERE collection_id = '{collection_id}' "
+                f"AND (cmetadata->>'user_id') = '{user_id}'"
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    logger.info("Built tenant index %s in %.2fs", name, elapsed)
+    return elapsed
+
+
+def drop_tenant_index(collection_name: str, user_id: str) -> None:
+    """Drop a tenant's partial ANN index if it exists."""
+    name = tenant_index_name(collection_name, str(int(user_id)))
+    with _autocommit() as conn:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    logger.info("Dropped index %s", name)
+
+
+def _top_k(conn: Connection, collection_id: str, query: str, k: int) -> List[str]:
+    # ctid identifies rows regardless of the langchain schema version (uuid vs id key)
+    rows = conn.execute(
+        text(
+            f"""
+            SELECT ctid::text FROM {EMBEDDING_TABLE}
+            WHERE collection_id = :cid
+            ORDER BY embedding <=> CAST(:q AS vector)
+            LIMIT :k
+            """
+        ),
+        {"cid": collection_id, "q": query, "k": k},
+    )
+    return [r[0] for r in rows]
+
+
+def benchmark(
+    collection_name: str,
+    queries: int = 50,
+    k: int = 3,
+    ef_search: int = HNSW_EF_SEARCH,
+    probes: int = IVFFLAT_PROBES,
+) -> Dict[str, float]:
+    """
+    Compare ANN results against exact search for stored vectors used as queries.
+
+    Returns:
+        Dict[str, float]: recall@k and mean latency (ms) for ANN and exact search.
+    """
+    with get_engine().connect() as conn:
+        collection_id = get_collection_id(conn, collection_name)
+        samples = [
+            r[0]
+            for r in conn.execute(
+                text(
+                    f"SELECT embedding::text FROM {EMBEDDING_TABLE} "
+                    "WHERE collection_id = :cid ORDER BY random() LIMIT :n"
+                ),
+                {"cid": collection_id, "n": queries},
+            )
+        ]
+        if not samples:
+            raise ValueError(f"Collection '{collection_name}' has no embeddings")
+        conn.commit()  # end the autobegun transaction; each search sets its own
+
+        hits = expected = 0
+        ann_time = exact_time = 0.0
+        for q in samples:
+            with conn.begin():
+                conn.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+                conn.execute(text(f"SET LOCAL ivfflat.probes = {int(probes)}"))
+                start = time.perf_counter()
+                approx = _top_k(conn, collection_id, q, k)
+                ann_time += time.perf_counter() - start
+
+            with conn.begin():
+                conn.execute(text("SET LOCAL enable_indexscan = off"))
+                conn.execute(text("SET LOCAL enable_bitmapscan = off"))
+                start = time.perf_counter()
+                exact = _top_k(conn, collection_id, q, k)
+                exact_time += time.perf_counter() - start
+
+            hits += len(set(approx) & set(exact))
+            expected += len(exact)
+
+    n = len(samples)
+    report = {
+        "queries": float(n),
+        f"recall@{k}": hits / max(expected, 1),
+        "ann_ms": ann_time / n * 1000,
+        "exact_ms": exact_time / n * 1000,
+    }
+    logger.info(
+        "Recall@%d=%.3f  ANN=%.2fms  exact=%.2fms over %d queries",
+        k,
+        report[f"recall@{k}"],
+        report["ann_ms"],
+        report["exact_ms"],
+        n,
+    )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage pgvector ANN indexes")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_create = sub.add_parser("create", help="Create an ANN index for a collection")
+    p_create.add_argument("--collection", default=COLLECTION_NAME)
+    p_create.add_argument("--method", choices=["hnsw", "ivfflat"], default="hnsw")
+    p_create.add_argument("--m", type=int, default=HNSW_M)
+    p_create.add_argument("--ef-construction", type=int, default=HNSW_EF_CONSTRUCTION)
+    p_create.add_argument("--lists", type=int, default=IVFFLAT_LISTS)
+    p_create.add_argument(
+        "--compact",
+        choices=["", "halfvec", "binary"],
+        default=VECTOR_COMPACT_MODE,
+        help="Index a quantized copy of the embedding (default: VECTOR_COMPACT_MODE)",
+    )
+
+    p_rebuild = sub.add_parser("rebuild", help="Rebuild a collection's ANN index")
+    p_rebuild.add_argument("--collection", default=COLLECTION_NAME)
+
+    p_drop = sub.add_parser("drop", help="Drop a collection's ANN index")
+    p_drop.add_argument("--collection", default=COLLECTION_NAME)
+
+    sub.add_parser("list", help="List ANN indexes")
+
+    sub.add_parser(
+        "metadata-indexes", help="Create user_id/product_id/source expression indexes"
+    )
+
+    p_tenant = sub.add_parser(
+        "tenant-index", help="Create partial HNSW indexes for large tenants"
+    )
+    p_tenant.add_argument("--collection", default=COLLECTION_NAME)
+    group = p_tenant.add_mutually_exclusive_group(required=True)
+    group.add_argument("--user-id", type=int, help="Index a single tenant")
+    group.add_argument(
+        "--min-rows", type=int, help="Index every tenant with at least this many chunks"
+    )
+    p_tenant.add_argument("--drop", action="store_true", help="Drop instead of create")
+
+    p_bench = sub.add_parser("benchmark", help="Report recall versus exact search")
+    p_bench.add_argument("--collection", default=COLLECTION_NAME)
+    p_bench.add_argument("--queries", type=int, default=50)
+    p_bench.add_argument("--k", type=int, default=3)
+    p_bench.add_argument("--ef-search", type=int, default=HNSW_EF_SEARCH)
+    p_bench.add_argument("--probes", type=int, default=IVFFLAT_PROBES)
+
+    args = parser.parse_args()
+
+    if args.command == "create":
+        create_index(
+            args.collection,
+            method=args.method,
+            m=args.m,
+            ef_construction=args.ef_construction,
+            lists=args.lists,
+            compact=args.compact,
+        )
+    elif args.command == "rebuild":
+        rebuild_index(args.collection)
+    elif args.command == "drop":
+        drop_index(args.collection)
+    elif args.command == "list":
+        for idx in list_indexes():
+            print(f"{idx['indexname']} ({idx['size']}): {idx['indexdef']}")
+    elif args.command == "metadata-indexes":
+        create_metadata_indexes()
+    elif args.command == "tenant-index":
+        tenants: List[str] = (
+            [str(args.user_id)]
+            if args.user_id is not None
+            else large_tenants(args.collection, args.min_rows)
+        )
+        if not tenants:
+            logger.info("No tenants reach %s chunks", args.min_rows)
+        for tenant in tenants:
+            if args.drop:
+                drop_tenant_index(args.collection, tenant)
+            else:
+                create_tenant_index(args.collection, tenant)
+    elif args.command == "benchmark":
+        print(
+            benchmark(
+                args.collection,
+                queries=args.queries,
+                k=args.k,
+                ef_search=args.ef_search,
+                probes=args.probes,
+            )
+        )
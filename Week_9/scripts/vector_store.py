@@ -0,0 +1,280 @@
+# scripts/vector_store.py
+"""
+Process-wide registry of PGVector stores.
+
+Every store in a worker shares one SQLAlchemy engine (and therefore one
+connection pool), and each collection is opened only once. Use
+`get_vector_store()` instead of constructing `PGVector` directly.
+"""
+
+import logging
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from langchain_community.vectorstores.pgvector import PGVector
+from langchain_core.documents import Document
+
+from scripts.cached_embeddings import get_embeddings
+from scripts.constants import (
+    DATABASE_URL_WEEK8,
+    COLLECTION_NAME,
+    EMBEDDING_DIM,
+    HNSW_EF_SEARCH,
+    HNSW_ITERATIVE_SCAN,
+    IVFFLAT_PROBES,
+    VECTOR_POOL_SIZE,
+    VECTOR_MAX_OVERFLOW,
+    VECTOR_POOL_TIMEOUT,
+    VECTOR_POOL_RECYCLE,
+    VECTOR_COMPACT_MODE,
+    VECTOR_RERANK_FACTOR,
+)
+
+logger = logging.getLogger(__name__)
+
+_engine: Optional[Engine] = None
+_stores: Dict[str, PGVector] = {}
+_collection_ids: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def _session_options() -> str:
+    """libpq startup options carrying the ANN search knobs."""
+    options = f"-c hnsw.ef_search={HNSW_EF_SEARCH} -c ivfflat.probes={IVFFLAT_PROBES}"
+    if HNSW_ITERATIVE_SCAN:
+        options += f" -c hnsw.iterative_scan={HNSW_ITERATIVE_SCAN}"
+    return options
+
+
+def tenant_filter(user_id: int) -> dict:
+    """
+    Metadata filter for one tenant.
+
+    Renders as `cmetadata->>'user_id' = '<id>'`, which matches both the expression
+    index and the per-tenant partial HNSW indexes built by scripts/vector_index.py.
+    """
+    return {"user_id": str(user_id)}
+
+
+def get_engine() -> Engine:
+    """Return the shared, pooled engine used by all vector stores."""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                if not DATABASE_URL_WEEK8:
+                    raise ValueError("DATABASE_URL_WEEK8 not found in environment")
+                _engine = create_engine(
+                    DATABASE_URL_WEEK8,
+                    pool_size=VECTOR_POOL_SIZE,
+                    max_overflow=VECTOR_MAX_OVERFLOW,
+                    pool_timeout=VECTOR_POOL_TIMEOUT,
+                    pool_recycle=VECTOR_POOL_RECYCLE,
+                    pool_pre_ping=True,
+                    # ANN search knobs are applied to every pooled session
+                    connect_args={"options": _session_options()},
+                )
+                logger.info(
+                    "[VECTOR POOL] Created engine pool_size=%s max_overflow=%s",
+                    VECTOR_POOL_SIZE,
+                    VECTOR_MAX_OVERFLOW,
+                )
+    return _engine
+
+
+def get_vector_store(collection_name: str = COLLECTION_NAME) -> PGVector:
+    """
+    Return the PGVector store for a collection, creating it on first use.
+
+    Args:
+        collection_name (str): Name of the PGVector collection.
+
+    Returns:
+        PGVector: Store bound to the shared engine.
+    """
+    store = _stores.get(collection_name)
+    if store is not None:
+        return store
+
+    engine = get_engine()
+    with _lock:
+        store = _stores.get(collection_name)
+        if store is None:
+            store = PGVector(
+                collection_name=collection_name,
+                connection_string=DATABASE_URL_WEEK8,
+                embedding_function=get_embeddings(),
+                embedding_length=EMBEDDING_DIM,
+                connection=engine,
+            )
+            _stores[collection_name] = store
+            logger.info("[VECTOR STORE] Opened collection '%s'", collection_name)
+    return store
+
+
+def collection_uuid(conn, collection_name: str) -> Optional[str]:
+    """
+    uuid of a PGVector collection (None if it does not exist yet), cached per process.
+
+    Queries bind it as a literal so the planner can match the partial ANN indexes
+    (`WHERE collection_id = '<uuid>'`); a subquery never matches their predicate.
+    """
+    cid = _collection_ids.get(collection_name)
+    if cid is None:
+        row = conn.execute(
+            text("SELECT uuid FROM langchain_pg_collection WHERE name = :name"),
+            {"name": collection_name},
+        ).first()
+        if row is None:
+            return None
+        cid = _collection_ids[collection_name] = str(row[0])
+    return cid
+
+
+def compact_index_expression(mode: str) -> Tuple[str, str, str, str]:
+    """
+    SQL pieces for a compact ANN index and the matching query.
+
+    Returns:
+        Tuple[str, str, str, str]: (indexed expression, operator class, distance
+        operator, query expression for the `:q` parameter).
+    """
+    dim = int(EMBEDDING_DIM)
+    if mode == "halfvec":
+        return (
+            f"(embedding::halfvec({dim}))",
+            "halfvec_cosine_ops",
+            "<=>",
+            f"CAST(:q AS halfvec({dim}))",
+        )
+    if mode == "binary":
+        return (
+            f"(binary_quantize(embedding)::bit({dim}))",
+            "bit_hamming_ops",
+            "<~>",
+            f"binary_quantize(CAST(:q AS vector({dim})))::bit({dim})",
+        )
+    raise ValueError(f"Unsupported compact mode: {mode}")
+
+
+def compact_search(
+    collection_name: str,
+    user_id: int,
+    embedding: List[float],
+    k: int,
+    mode: str = VECTOR_COMPACT_MODE,
+    rerank_factor: int = VECTOR_RERANK_FACTOR,
+) -> List[Tuple[Document, float]]:
+    """
+    Tenant-filtered search on a compact (halfvec / binary) index, re-ranked on the
+    full-precision vectors.
+
+    The compact index yields `k * rerank_factor` candidates; exact cosine distance
+    over those picks the final k, recovering most of the recall lost to quantization.
+
+    Returns:
+        List[Tuple[Document, float]]: Documents with cosine distance, closest first
+        (same shape as PGVector.similarity_search_with_score_by_vector).
+    """
+    expression, _, operator, query = compact_index_expression(mode)
+    with get_engine().connect() as conn:
+        collection_id = collection_uuid(conn, collection_name)
+        if collection_id is None:
+            return []
+        rows = conn.execute(
+            text(
+                f"""
+                WITH candidates AS (
+                    SELECT document, cmetadata, embedding
+                    FROM langchain_pg_embedding
+                    WHERE collection_id = CAST(:collection_id AS uuid)
+                      AND cmetadata->>'user_id' = :user_id
+                    ORDER BY {expression} {operator} {query}
+                    LIMIT :candidates
+                )
+                SELECT document, cmetadata,
+                       embedding <=> CAST(:q AS vector({int(EMBEDDING_DIM)})) AS distance
+                FROM candidates
+                ORDER BY distance
+                LIMIT :k
+                """
+            ),
+            {
+                "collection_id": collection_id,
+                "user_id": str(user_id),
+                "q": str(list(embedding)),
+                "candidates": k * max(rerank_factor, 1),
+                "k": k,
+            },
+        )
+        return [
+            (Document(page_content=row.document, metadata=row.cmetadata or {}), row.distance)
+            for row in rows
+        ]
+
+
+def delete_chunks(
+    collection_name: str,
+    user_id: int,
+    product_ids: Optional[List[str]] = None,
+    sources: Optional[List[str]] = None,
+) -> int:
+    """
+    Delete a user's chunks for the given product ids and/or document sources.
+
+    Runs one DELETE per batch against the metadata expression indexes instead of
+    looking chunk ids up through a similarity search.
+
+    Returns:
+        int: Number of chunks removed.
+    """
+    clauses = []
+    params = {"collection": collection_name, "user_id": str(user_id)}
+    if product_ids is not None:
+        clauses.append("e.cmetadata->>'product_id' = ANY(:product_ids)")
+        params["product_ids"] = [str(p) for p in product_ids]
+    if sources is not None:
+        clauses.append("e.cmetadata->>'source' = ANY(:sources)")
+        params["sources"] = list(sources)
+    if not clauses:
+        raise ValueError("delete_chunks needs product_ids or sources")
+
+    with get_engine().begin() as conn:
+        result = conn.execute(
+            text(
+                f"""
+                DELETE FROM langchain_pg_embedding e
+                USING langchain_pg_collection c
+                WHERE e.collection_id = c.uuid
+                  AND c.name = :collection
+                  AND e.cmetadata->>'user_id' = :user_id
+                  AND ({" OR ".join(clauses)})
+                """
+            ),
+            params,
+        )
+        return result.rowcount
+
+
+def reset_vector_stores(close: bool = True) -> None:
+    """
+    Drop cached stores and dispose the pool.
+
+    After a fork pass `close=False`: the inherited connections are abandoned
+    without closing the sockets the parent (and sibling workers) still use.
+    """
+    global _engine
+    with _lock:
+        _stores.clear()
+        _collection_ids.clear()
+        if _engine is not None:
+            _engine.dispose(close=close)
+            _engine = None
@@ -0,0 +1,128 @@
+import os
+import sys
+
+import pytest
+
+# Week_9 modules import each other as `api.*` / `scripts.*`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# api.config refuses to import without a database URL; unit tests never connect to it
+os.environ.setdefault("DATABASE_URL_WEEK8", "sqlite:///:memory:")
+
+# Route tests need Postgres (pgvector columns, UPDATE ... FROM (VALUES ...), RETURNING)
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# Seeded users: (username, role); every password is "pass"
+USERS = (
+    ("viewer", "viewer"),
+    ("manager", "manager"),
+    ("other_manager", "manager"),
+    ("admin", "admin"),
+)
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    Create a Flask test app on the database in TEST_DATABASE_URL, with seeded users.
+
+    The tables are created before and dropped after each test, so point it at a
+    disposable database. Skipped when TEST_DATABASE_URL is not set.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from sqlalchemy import text
+
+    from api import create_app, db
+    from api.config import TestingConfig
+    from api.models import User
+
+    class PostgresTestingConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = TEST_DATABASE_URL
+        UPLOAD_DIR = str(tmp_path / "uploads")
+
+    app = create_app(PostgresTestingConfig)
+
+    with app.app_context():
+        db.session.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        db.session.commit()
+        db.create_all()
+
+        for username, role in USERS:
+            user = User(username=username, role=role)
+            user.set_password("pass")
+            db.session.add(user)
+        db.session.commit()
+
+        yield app
+
+        # Teardown
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Flask test client."""
+    return app.test_client()
+
+
+def login_helper(client, username: str, password: str) -> str:
+    """Login a user and return JWT access token."""
+    resp = client.post("/auth/login", json={"username": username, "password": password})
+    data = resp.get_json()
+    return data["access_token"] if resp.status_code == 200 else None
+
+
+@pytest.fixture
+def tokens(client):
+    """Return a dict of JWT tokens for the seeded users, keyed by username."""
+    return {username: login_helper(client, username, "pass") for username, _ in USERS}
+
+
+@pytest.fixture
+def user_ids(app):
+    """Return {username: id} for the seeded users."""
+    from api.models import User
+
+    return {user.username: user.id for user in User.query.all()}
+
+
+@pytest.fixture
+def make_product(app, user_ids):
+    """Insert a product through the ORM and return its ID."""
+    from api.models import db, FoodProduct, ElectronicProduct, BookProduct
+
+    models = {"food": FoodProduct, "electronic": ElectronicProduct, "book": BookProduct}
+
+    def make(owner="manager", type_="food", **fields):
+        defaults = {"name": "Widget", "price": 10.0, "quantity": 5}
+        product = models[type_](**{**defaults, **fields}, owner_id=user_ids[owner])
+        db.session.add(product)
+        db.session.commit()
+        return product.product_id
+
+    return make
+
+
+@pytest.fixture
+def outbox_mark(app):
+    """
+    Return mark(): remembers the newest product_outbox row and returns a function
+    listing the (product_id, owner_id, op) rows written since, sorted.
+    """
+    from api.models import db, ProductOutbox
+
+    def mark():
+        last_id = db.session.query(db.func.max(ProductOutbox.id)).scalar() or 0
+
+        def new_rows():
+            return sorted(
+                (row.product_id, row.owner_id, row.op)
+                for row in ProductOutbox.query.filter(ProductOutbox.id > last_id)
+            )
+
+        return new_rows
+
+    return mark
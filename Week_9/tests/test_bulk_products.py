@@ -0,0 +1,146 @@
+# tests/test_bulk_products.py
+from api.models import db, Product
+
+BOOK = {
+    "type": "book",
+    "name": "Dune",
+    "price": 9.5,
+    "quantity": 3,
+    "author": "Herbert",
+    "pages": 412,
+}
+
+
+def statuses(results):
+    """[(index, status)] of one operation's results."""
+    return [(r["index"], r["status"]) for r in results]
+
+
+def test_invalid_items_do_not_fail_the_rest(client, tokens, user_ids, make_product):
+    """Each create/update/delete gets its own result; valid items are applied."""
+    own = make_product(owner="manager", quantity=5)
+    own_unchanged = make_product(owner="manager", name="Keep")
+    others = make_product(owner="other_manager")
+
+    resp = client.post(
+        "/products/bulk",
+        json={
+            "create": [BOOK, {**BOOK, "price": -1}],
+            "update": [
+                {"product_id": own, "quantity": 9},
+                {"product_id": others, "quantity": 1},
+                {"product_id": 999999, "quantity": 1},
+                {"product_id": own_unchanged, "name": None},
+                {"quantity": 1},
+            ],
+            "delete": [own],
+        },
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["summary"] == {"created": 1, "updated": 1, "deleted": 0, "failed": 6}
+    assert statuses(data["results"]["create"]) == [(0, "created"), (1, "invalid")]
+    assert statuses(data["results"]["update"]) == [
+        (0, "updated"),
+        (1, "forbidden"),
+        (2, "not_found"),
+        (3, "invalid"),
+        (4, "invalid"),
+    ]
+    assert statuses(data["results"]["delete"]) == [(0, "forbidden")]
+
+    created = db.session.get(Product, data["results"]["create"][0]["product_id"])
+    assert created.owner_id == user_ids["manager"] and created.author == "Herbert"
+    db.session.expire_all()
+    assert db.session.get(Product, own).quantity == 9
+    assert db.session.get(Product, own).version == 2
+    assert db.session.get(Product, own_unchanged).name == "Keep"
+    assert db.session.get(Product, others).quantity == 5
+
+
+def test_applied_items_are_enqueued_in_the_outbox(
+    client, tokens, user_ids, make_product, outbox_mark
+):
+    """Core bulk statements write outbox rows for exactly the products they changed."""
+    own = make_product(owner="manager")
+    others = make_product(owner="other_manager")
+    new_outbox_rows = outbox_mark()
+
+    resp = client.post(
+        "/products/bulk",
+        json={
+            "create": [BOOK],
+            "update": [{"product_id": own, "price": 12}, {"product_id": others, "price": 1}],
+        },
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+
+    created = resp.get_json()["results"]["create"][0]["product_id"]
+    manager = user_ids["manager"]
+    assert new_outbox_rows() == sorted(
+        [(created, manager, "upsert"), (own, manager, "upsert")]
+    )
+
+
+def test_repeated_delete_is_reported_once(
+    client, tokens, user_ids, make_product, outbox_mark
+):
+    """A product listed twice is deleted by the first item; the second is not_found."""
+    product = make_product(owner="manager")
+    new_outbox_rows = outbox_mark()
+
+    resp = client.post(
+        "/products/bulk",
+        json={"delete": [product, product, 999999]},
+        headers={"Authorization": f"Bearer {tokens['admin']}"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["summary"]["deleted"] == 1
+    assert statuses(data["results"]["delete"]) == [
+        (0, "deleted"),
+        (1, "not_found"),
+        (2, "not_found"),
+    ]
+    assert db.session.get(Product, product) is None
+    assert new_outbox_rows() == [(product, user_ids["manager"], "delete")]
+
+
+def test_repeated_update_applies_the_last_item(client, tokens, make_product):
+    """Updates of the same product and fields run as if in order: the last one wins."""
+    product = make_product(owner="manager")
+
+    resp = client.post(
+        "/products/bulk",
+        json={
+            "update": [
+                {"product_id": product, "quantity": 1},
+                {"product_id": product, "quantity": 2},
+            ]
+        },
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+
+    assert resp.get_json()["summary"]["updated"] == 1
+    db.session.expire_all()
+    assert db.session.get(Product, product).quantity == 2
+
+
+def test_bulk_rejects_malformed_body_and_viewers(client, tokens):
+    """A body that isn't a bulk request is a 400; viewers get 403."""
+    resp = client.post(
+        "/products/bulk",
+        json={"delete": ["abc"]},
+        headers={"Authorization": f"Bearer {tokens['admin']}"},
+    )
+    assert resp.status_code == 400
+
+    resp = client.post(
+        "/products/bulk",
+        json={"create": [BOOK]},
+        headers={"Authorization": f"Bearer {tokens['viewer']}"},
+    )
+    assert resp.status_code == 403
@@ -0,0 +1,77 @@
+# tests/test_document_ingestion.py
+from scripts.document_ingestion import iter_chunks, iter_text_blocks
+
+WORDS = [f"w{i:03d}" for i in range(200)]
+TEXT = " ".join(WORDS)
+
+
+def as_blocks(text, block_size):
+    """(block, bytes read so far) pairs, as iter_text_blocks yields them for ASCII."""
+    return [
+        (text[start : start + block_size], min(start + block_size, len(text)))
+        for start in range(0, len(text), block_size)
+    ]
+
+
+def test_iter_text_blocks_keeps_multibyte_characters_across_blocks(tmp_path):
+    """A character split between two reads is decoded once, intact."""
+    text = "prix: 12€ / café " * 50
+    path = tmp_path / "doc.txt"
+    path.write_bytes(text.encode("utf-8"))
+
+    blocks = list(iter_text_blocks(str(path), block_size=5))
+
+    assert "".join(block for block, _ in blocks) == text
+    assert blocks[-1][1] == len(text.encode("utf-8"))
+
+
+def test_iter_chunks_respects_chunk_size_and_loses_no_text():
+    """Words cut by block boundaries are carried over and appear whole in a chunk."""
+    chunks = [
+        chunk
+        for chunk, _ in iter_chunks(as_blocks(TEXT, 37), chunk_size=50, chunk_overlap=10)
+    ]
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert all(chunk in TEXT for chunk in chunks)
+    for word in WORDS:
+        assert any(word in chunk.split() for chunk in chunks), word
+
+
+def test_iter_chunks_keeps_document_order():
+    """Chunks are emitted in order: their first words ascend through the text."""
+    chunks = [
+        chunk
+        for chunk, _ in iter_chunks(as_blocks(TEXT, 64), chunk_size=50, chunk_overlap=10)
+    ]
+    first_words = [WORDS.index(chunk.split()[0]) for chunk in chunks]
+
+    assert first_words == sorted(first_words)
+    assert chunks[0].startswith(WORDS[0])
+    assert chunks[-1].endswith(WORDS[-1])
+
+
+def test_iter_chunks_does_not_depend_on_block_size():
+    """Small and large blocks produce chunks covering the same words."""
+    small = [c for c, _ in iter_chunks(as_blocks(TEXT, 7), chunk_size=50, chunk_overlap=10)]
+    whole = [c for c, _ in iter_chunks(as_blocks(TEXT, len(TEXT)), 50, 10)]
+
+    def covered(chunks):
+        return {word for chunk in chunks for word in chunk.split()}
+
+    assert covered(small) == covered(whole) == set(WORDS)
+
+
+def test_iter_chunks_reports_byte_progress():
+    """Progress never goes backwards and ends at the total bytes read."""
+    progress = [n for _, n in iter_chunks(as_blocks(TEXT, 37), chunk_size=50, chunk_overlap=10)]
+
+    assert progress == sorted(progress)
+    assert progress[-1] == len(TEXT)
+
+
+def test_iter_chunks_short_text_is_one_chunk():
+    """Text shorter than a chunk is emitted once, after the last block."""
+    assert list(iter_chunks([("hello ", 6), ("world", 11)], chunk_size=50, chunk_overlap=10)) == [
+        ("hello world", 11)
+    ]
@@ -0,0 +1,75 @@
+# tests/test_document_jobs.py
+import io
+import os
+
+from api.models import db, IngestionJob
+
+
+def upload(client, token, content=b"Widgets are in aisle 4.", **form):
+    """POST a text file to /documents/upload."""
+    return client.post(
+        "/documents/upload",
+        data={"file": (io.BytesIO(content), "notes.txt"), **form},
+        content_type="multipart/form-data",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+
+def test_upload_is_queued_with_a_status_url(client, tokens, user_ids):
+    """An upload returns 202 and the job it queued, saved under UPLOAD_DIR."""
+    resp = upload(client, tokens["manager"], mode="replace")
+
+    assert resp.status_code == 202
+    data = resp.get_json()
+    assert data["status"] == "queued" and data["mode"] == "replace"
+    assert data["user_id"] == user_ids["manager"]
+    assert data["status_url"] == f"/documents/jobs/{data['job_id']}"
+
+    job = db.session.get(IngestionJob, data["job_id"])
+    assert os.path.getsize(job.file_path) == len(b"Widgets are in aisle 4.")
+
+
+def test_job_status_reports_progress(client, tokens):
+    """The status URL shows the queued job, then its byte progress and completion."""
+    status_url = upload(client, tokens["manager"]).get_json()["status_url"]
+    headers = {"Authorization": f"Bearer {tokens['manager']}"}
+
+    resp = client.get(status_url, headers=headers)
+    assert resp.status_code == 200
+    assert resp.get_json()["status"] == "queued"
+    assert resp.get_json()["progress"] == 0.0
+
+    job = db.session.get(IngestionJob, int(status_url.rsplit("/", 1)[1]))
+    job.status, job.total_bytes, job.processed_bytes = "running", 400, 100
+    db.session.commit()
+    assert client.get(status_url, headers=headers).get_json()["progress"] == 0.25
+
+    job.status = "done"
+    db.session.commit()
+    assert client.get(status_url, headers=headers).get_json()["progress"] == 1.0
+
+
+def test_job_is_visible_to_its_owner_and_admins_only(client, tokens):
+    """Another user's job is a 404; admins can read any job."""
+    status_url = upload(client, tokens["manager"]).get_json()["status_url"]
+
+    resp = client.get(
+        status_url, headers={"Authorization": f"Bearer {tokens['other_manager']}"}
+    )
+    assert resp.status_code == 404
+
+    resp = client.get(status_url, headers={"Authorization": f"Bearer {tokens['admin']}"})
+    assert resp.status_code == 200
+
+    resp = client.get(
+        "/documents/jobs/999999", headers={"Authorization": f"Bearer {tokens['admin']}"}
+    )
+    assert resp.status_code == 404
+
+
+def test_bad_uploads_are_rejected_without_a_job(client, tokens):
+    """Empty files and unknown modes are 400s; viewers may not upload."""
+    assert upload(client, tokens["manager"], content=b"").status_code == 400
+    assert upload(client, tokens["manager"], mode="merge").status_code == 400
+    assert upload(client, tokens["viewer"]).status_code == 403
+    assert IngestionJob.query.count() == 0
@@ -0,0 +1,74 @@
+# tests/test_lru_cache.py
+from scripts.lru_cache import LRUCache
+
+
+def test_get_returns_stored_value_and_counts_hits():
+    """A stored value is returned and counted as a hit; a missing key as a miss."""
+    cache = LRUCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    """When full, the entry read least recently is evicted first."""
+    cache = LRUCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entry_is_a_miss_and_removed():
+    """An entry past its TTL is dropped on read and counted as expired."""
+    cache = LRUCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1, ttl_seconds=0)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_per_entry_ttl_overrides_default():
+    """Only the entry stored with a zero TTL expires."""
+    cache = LRUCache(maxsize=4, ttl_seconds=0)
+    cache.set("short", 1)
+    cache.set("long", 2, ttl_seconds=60)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_peek_does_not_touch_recency_or_counters():
+    """peek returns live values without changing which entry is evicted next."""
+    cache = LRUCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.peek("a") == 1
+    cache.set("c", 3)  # "a" is still the least recently used
+
+    assert cache.peek("a") is None
+    assert cache.stats()["hits"] == 0
+
+
+def test_delete_where_removes_matching_keys():
+    """delete_where drops every key matching the predicate and reports the count."""
+    cache = LRUCache(maxsize=10, ttl_seconds=60)
+    cache.set("17::stock", 1)
+    cache.set("17::price", 2)
+    cache.set("18::stock", 3)
+
+    assert cache.delete_where(lambda key: key.startswith("17::")) == 2
+    assert cache.get("17::stock") is None
+    assert cache.get("18::stock") == 3
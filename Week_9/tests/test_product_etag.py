@@ -0,0 +1,83 @@
+# tests/test_product_etag.py
+from api.models import db, Product
+
+
+def test_get_returns_etag_and_304_when_unchanged(client, make_product):
+    """A product's ETag names its version; If-None-Match with it gives 304."""
+    product = make_product()
+
+    resp = client.get(f"/products/{product}")
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] == f'"{product}-1"'
+
+    resp = client.get(f"/products/{product}", headers={"If-None-Match": resp.headers["ETag"]})
+    assert resp.status_code == 304
+    assert resp.get_data() == b""
+
+
+def test_list_returns_304_until_a_product_changes(client, tokens, make_product):
+    """The page ETag matches until a listed product is updated."""
+    product = make_product()
+    etag = client.get("/products/").headers["ETag"]
+
+    assert client.get("/products/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(
+        f"/products/{product}",
+        json={"quantity": 6},
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+    assert client.get("/products/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_put_with_current_if_match_bumps_the_version(client, tokens, make_product):
+    """A matching If-Match is applied and the response carries the new ETag."""
+    product = make_product()
+
+    resp = client.put(
+        f"/products/{product}",
+        json={"price": 12.5},
+        headers={
+            "Authorization": f"Bearer {tokens['manager']}",
+            "If-Match": f'"{product}-1"',
+        },
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] == f'"{product}-2"'
+    assert resp.get_json()["price"] == 12.5
+
+
+def test_put_with_stale_if_match_is_412(client, tokens, make_product):
+    """A write based on an old version is refused with the current ETag."""
+    product = make_product()
+    headers = {"Authorization": f"Bearer {tokens['manager']}"}
+    client.put(f"/products/{product}", json={"quantity": 6}, headers=headers)
+
+    resp = client.put(
+        f"/products/{product}",
+        json={"quantity": 1},
+        headers={**headers, "If-Match": f'"{product}-1"'},
+    )
+
+    assert resp.status_code == 412
+    assert resp.headers["ETag"] == f'"{product}-2"'
+    db.session.expire_all()
+    assert db.session.get(Product, product).quantity == 6
+
+
+def test_delete_with_stale_if_match_is_412(client, tokens, make_product):
+    """Deletes check If-Match the same way and leave the product in place."""
+    product = make_product()
+
+    resp = client.delete(
+        f"/products/{product}",
+        headers={
+            "Authorization": f"Bearer {tokens['admin']}",
+            "If-Match": f'"{product}-7"',
+        },
+    )
+
+    assert resp.status_code == 412
+    db.session.expire_all()
+    assert db.session.get(Product, product) is not None
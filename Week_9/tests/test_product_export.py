@@ -0,0 +1,68 @@
+# tests/test_product_export.py
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+
+def test_ndjson_export_has_one_object_per_product(client, tokens, make_product):
+    """The default format is NDJSON with the Inventory.save_to_csv columns."""
+    book = make_product(type_="book", name="Dune", author="Herbert", pages=412)
+    food = make_product(type_="food", name="Milk", expiry_date=date(2099, 1, 1))
+
+    resp = client.get(
+        "/products/export", headers={"Authorization": f"Bearer {tokens['manager']}"}
+    )
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [row["product_id"] for row in rows] == [book, food]
+    assert rows[0]["product_name"] == "Dune" and rows[0]["pages"] == 412
+    assert rows[1]["expiry_date"] == "2099-01-01"
+
+
+def test_csv_export_is_filtered(client, tokens, make_product):
+    """format=csv writes a header row; list filters such as type apply."""
+    make_product(type_="book")
+    food = make_product(type_="food", name="Milk")
+
+    resp = client.get(
+        "/products/export?format=csv&type=food",
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/csv"
+    rows = list(csv.reader(io.StringIO(resp.get_data(as_text=True))))
+    assert rows[0][:3] == ["product_id", "product_name", "price"]
+    assert [row[:2] for row in rows[1:]] == [[str(food), "Milk"]]
+
+
+def test_gzip_export_decompresses_to_the_plain_body(client, tokens, make_product):
+    """gzip=true sets Content-Encoding and compresses the same body."""
+    for i in range(3):
+        make_product(name=f"Item {i}")
+    headers = {"Authorization": f"Bearer {tokens['manager']}"}
+
+    plain = client.get("/products/export?format=csv", headers=headers)
+    compressed = client.get("/products/export?format=csv&gzip=true", headers=headers)
+
+    assert compressed.status_code == 200
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+
+
+def test_export_rejects_unknown_format_and_viewers(client, tokens):
+    """An unknown format is a 400; viewers may not export."""
+    resp = client.get(
+        "/products/export?format=xml",
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+    assert resp.status_code == 400
+
+    resp = client.get(
+        "/products/export", headers={"Authorization": f"Bearer {tokens['viewer']}"}
+    )
+    assert resp.status_code == 403
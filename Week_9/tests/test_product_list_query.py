@@ -0,0 +1,69 @@
+# tests/test_product_list_query.py
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from api.schemas.request import PRODUCT_FIELDS, ProductListQuery
+
+
+def test_defaults_without_query_params():
+    """An empty query string gives the first page of 50 with every field."""
+    query = ProductListQuery()
+
+    assert query.limit == 50
+    assert query.after is None
+    assert query.fields is None
+
+
+def test_query_string_values_are_coerced():
+    """request.args values arrive as strings and are parsed to their types."""
+    query = ProductListQuery(
+        **{
+            "limit": "10",
+            "after": "120",
+            "type": "food",
+            "min_price": "2.5",
+            "low_stock": "5",
+            "expiring_before": "2025-12-31",
+        }
+    )
+
+    assert query.limit == 10
+    assert query.after == 120
+    assert query.type == "food"
+    assert query.min_price == 2.5
+    assert query.low_stock == 5
+    assert query.expiring_before == date(2025, 12, 31)
+
+
+def test_fields_are_split_and_trimmed():
+    """fields=name, price becomes a list of column names."""
+    query = ProductListQuery(fields="name, price,,quantity")
+
+    assert query.fields == ["name", "price", "quantity"]
+    assert set(query.fields) <= set(PRODUCT_FIELDS)
+
+
+def test_unknown_field_is_rejected():
+    """Selecting a column that is not a product field is a validation error."""
+    with pytest.raises(ValidationError, match="Unknown fields: owner_password"):
+        ProductListQuery(fields="name,owner_password")
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"limit": "0"},
+        {"limit": "501"},
+        {"limit": "ten"},
+        {"after": "-1"},
+        {"type": "furniture"},
+        {"min_price": "-1"},
+        {"expiring_before": "next week"},
+    ],
+)
+def test_invalid_params_are_rejected(params):
+    """Out-of-range or malformed parameters fail validation (400 in the route)."""
+    with pytest.raises(ValidationError):
+        ProductListQuery(**params)
@@ -0,0 +1,50 @@
+# tests/test_product_list_routes.py
+
+
+def test_pages_follow_the_cursor(client, tokens, make_product):
+    """next_cursor fetches the following page; the last page has none."""
+    ids = [make_product(name=f"Item {i}") for i in range(5)]
+    headers = {"Authorization": f"Bearer {tokens['viewer']}"}
+
+    first = client.get("/products/?limit=2", headers=headers).get_json()
+    assert [item["product_id"] for item in first["items"]] == ids[:2]
+    assert first["next_cursor"] == ids[1]
+
+    second = client.get(
+        f"/products/?limit=2&after={first['next_cursor']}", headers=headers
+    ).get_json()
+    assert [item["product_id"] for item in second["items"]] == ids[2:4]
+
+    last = client.get(
+        f"/products/?limit=2&after={second['next_cursor']}", headers=headers
+    ).get_json()
+    assert [item["product_id"] for item in last["items"]] == ids[4:]
+    assert last["next_cursor"] is None
+
+
+def test_filters_and_fields(client, tokens, make_product):
+    """Filters are combined and only the requested columns (plus product_id) return."""
+    make_product(type_="book", quantity=1)
+    low_food = make_product(type_="food", quantity=2)
+    make_product(type_="food", quantity=50)
+
+    resp = client.get(
+        "/products/?type=food&low_stock=5&fields=name,quantity",
+        headers={"Authorization": f"Bearer {tokens['viewer']}"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.get_json()["items"] == [
+        {"product_id": low_food, "name": "Widget", "quantity": 2}
+    ]
+
+
+def test_invalid_query_is_rejected(client, tokens):
+    """Malformed parameters return 400 with the validation errors."""
+    resp = client.get(
+        "/products/?limit=0&fields=owner_password",
+        headers={"Authorization": f"Bearer {tokens['viewer']}"},
+    )
+
+    assert resp.status_code == 400
+    assert "validation_error" in resp.get_json()
@@ -0,0 +1,104 @@
+# tests/test_single_flight.py
+import threading
+import time
+
+import pytest
+
+from scripts.single_flight import SingleFlight
+
+
+def start_leader(flight, key, fn, followers=4):
+    """
+    Create one leader and `followers` caller threads for `key`; only the leader
+    is started, the test starts the followers once `fn` is running.
+    """
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(followers + 1)]
+    threads[0].start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    """Callers arriving while the leader runs get its result without running fn."""
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "answer"
+
+    threads, results, errors = start_leader(flight, "q", fn)
+    assert started.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)  # let the followers join the in-flight call
+    assert flight.in_flight() == 1
+
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert results == ["answer"] * len(threads)
+    assert errors == []
+    assert flight.in_flight() == 0
+
+
+def test_followers_receive_the_leaders_exception():
+    """An exception raised by the leader is re-raised in every waiting caller."""
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(timeout=5)
+        raise ValueError("llm down")
+
+    threads, results, errors = start_leader(flight, "q", fn, followers=2)
+    assert started.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == []
+    assert len(errors) == 3
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_key_is_released_after_completion():
+    """Once a call finishes, the next call for the key executes again."""
+    flight = SingleFlight()
+    calls = []
+
+    assert flight.do("q", lambda: calls.append(1) or len(calls)) == 1
+    assert flight.do("q", lambda: calls.append(1) or len(calls)) == 2
+    assert flight.in_flight() == 0
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        flight.do("q", fail)
+    assert flight.in_flight() == 0
+
+
+def test_different_keys_do_not_coalesce():
+    """Calls for different keys each run their own function."""
+    flight = SingleFlight()
+
+    assert flight.do("a", lambda: "A") == "A"
+    assert flight.do("b", lambda: "B") == "B"
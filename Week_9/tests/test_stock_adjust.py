@@ -0,0 +1,88 @@
+# tests/test_stock_adjust.py
+from api.models import db, Product
+
+
+def test_adjust_applies_delta_and_enqueues_outbox_row(
+    client, tokens, user_ids, make_product, outbox_mark
+):
+    """A successful adjustment returns the new quantity and queues a re-embed."""
+    product = make_product(owner="manager", quantity=5)
+    new_outbox_rows = outbox_mark()
+
+    resp = client.post(
+        f"/products/{product}/adjust",
+        json={"delta": -3},
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.get_json() == {"product_id": product, "quantity": 2}
+    db.session.expire_all()
+    assert db.session.get(Product, product).version == 2
+    assert new_outbox_rows() == [(product, user_ids["manager"], "upsert")]
+
+
+def test_adjust_below_zero_is_a_conflict(client, tokens, make_product, outbox_mark):
+    """Taking more than is in stock returns 409 and changes nothing."""
+    product = make_product(owner="manager", quantity=2)
+    new_outbox_rows = outbox_mark()
+
+    resp = client.post(
+        f"/products/{product}/adjust",
+        json={"delta": -3},
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+
+    assert resp.status_code == 409
+    assert resp.get_json() == {"error": "Only 2 in stock"}
+    db.session.expire_all()
+    assert db.session.get(Product, product).quantity == 2
+    assert new_outbox_rows() == []
+
+
+def test_adjust_error_statuses(client, tokens, make_product):
+    """Other owners' products are 403, unknown ones 404 and a zero delta 400."""
+    product = make_product(owner="other_manager")
+    headers = {"Authorization": f"Bearer {tokens['manager']}"}
+
+    resp = client.post(f"/products/{product}/adjust", json={"delta": 1}, headers=headers)
+    assert resp.status_code == 403
+
+    resp = client.post("/products/999999/adjust", json={"delta": 1}, headers=headers)
+    assert resp.status_code == 404
+
+    resp = client.post(f"/products/{product}/adjust", json={"delta": 0}, headers=headers)
+    assert resp.status_code == 400
+
+
+def test_batch_adjust_sums_deltas_and_reports_each_product(
+    client, tokens, user_ids, make_product, outbox_mark
+):
+    """Deltas for one product are summed; failures don't block the others."""
+    stocked = make_product(owner="manager", quantity=5)
+    short = make_product(owner="manager", quantity=1)
+    new_outbox_rows = outbox_mark()
+
+    resp = client.post(
+        "/products/adjust",
+        json={
+            "adjustments": [
+                {"product_id": stocked, "delta": -2},
+                {"product_id": short, "delta": -2},
+                {"product_id": stocked, "delta": 4},
+                {"product_id": 999999, "delta": 1},
+            ]
+        },
+        headers={"Authorization": f"Bearer {tokens['manager']}"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["summary"] == {"applied": 1, "failed": 2}
+    assert [(r["product_id"], r["delta"], r["status"]) for r in data["results"]] == [
+        (stocked, 2, "applied"),
+        (short, -2, "insufficient_stock"),
+        (999999, 1, "not_found"),
+    ]
+    assert data["results"][0]["quantity"] == 7
+    assert new_outbox_rows() == [(stocked, user_ids["manager"], "upsert")]
@@ -0,0 +1,72 @@
+# tests/test_usage_ledger.py
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.constants import CHAT_MODEL_OLLAMA, TOKEN_COST_PER_1K
+from scripts.usage_ledger import estimate_cost, extract_usage, model_name
+
+
+def test_extract_usage_reads_usage_metadata():
+    """Counts come from AIMessage.usage_metadata when present."""
+    message = SimpleNamespace(
+        usage_metadata={"input_tokens": 120, "output_tokens": 30, "total_tokens": 150}
+    )
+
+    assert extract_usage(message) == {
+        "prompt_tokens": 120,
+        "completion_tokens": 30,
+        "total_tokens": 150,
+    }
+
+
+def test_extract_usage_computes_missing_total():
+    """A missing total is the sum of prompt and completion tokens."""
+    message = SimpleNamespace(usage_metadata={"input_tokens": 10, "output_tokens": 5})
+
+    assert extract_usage(message)["total_tokens"] == 15
+
+
+def test_extract_usage_falls_back_to_provider_token_usage():
+    """Older integrations report usage in response_metadata["token_usage"]."""
+    message = SimpleNamespace(
+        usage_metadata=None,
+        response_metadata={"token_usage": {"prompt_tokens": 7, "completion_tokens": 3}},
+    )
+
+    assert extract_usage(message) == {
+        "prompt_tokens": 7,
+        "completion_tokens": 3,
+        "total_tokens": 10,
+    }
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        SimpleNamespace(),
+        SimpleNamespace(usage_metadata={}, response_metadata={}),
+        SimpleNamespace(response_metadata={"token_usage": None}),
+        "plain string response",
+    ],
+)
+def test_extract_usage_defaults_to_zero(message):
+    """Responses without usage are recorded as zero tokens, not an error."""
+    assert extract_usage(message) == {
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+    }
+
+
+def test_estimate_cost_uses_model_rate_or_default():
+    """Known models use their own rate; unknown ones the default per-1K rate."""
+    assert estimate_cost("some-unknown-model", 2000) == pytest.approx(2 * TOKEN_COST_PER_1K)
+    assert estimate_cost(CHAT_MODEL_OLLAMA, 5000) == 0.0
+
+
+def test_model_name_handles_openai_and_ollama_attributes():
+    """ChatOpenAI exposes model_name, ChatOllama model."""
+    assert model_name(SimpleNamespace(model_name="gpt-4o-mini")) == "gpt-4o-mini"
+    assert model_name(SimpleNamespace(model="llama3")) == "llama3"
+    assert model_name(object()) == "unknown"